@@ -11,38 +11,111 @@ It supports two game modes:
 @version: v2023-01-10
 """
 
+import argparse
+import mmap
 import os
 import random
-from dataclasses import dataclass
-from time import sleep
+import shutil
+import struct
+import sys
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import product
+from time import perf_counter, sleep
 
 try:
-    from typing import List, Tuple, Dict, Set, Type, NewType, Optional, ClassVar, Self
+    from typing import List, Tuple, Dict, Set, Type, NewType, Optional, ClassVar, Self, Union, Sequence, Iterable
     from termcolor import colored
 except ImportError:
     os.system("pip install typing")
-    from typing import List, Tuple, Dict, Set, Type, NewType, Optional, ClassVar, Self
+    from typing import List, Tuple, Dict, Set, Type, NewType, Optional, ClassVar, Self, Union, Sequence, Iterable
 
     os.system("python3 -m pip install --upgrade termcolor")
     from termcolor import colored
 
+try:
+    # The terminal renderer shared by the games (pip install -e <repository root>)
+    from terminal import screen
+except ImportError:
+
+    class _PlainScreen:
+        """
+        Plain output, used when the terminal renderer is not installed.
+        """
+
+        print = staticmethod(print)
+        input = staticmethod(input)
+
+        @staticmethod
+        def clear(delay_sec: Optional[float] = None) -> None:
+            if delay_sec is not None:
+                print("Clearing the monitor...")
+                sleep(delay_sec)
+            os.system("cls" if os.name == "nt" else "clear")
+            return None
+
+        @staticmethod
+        def draw(lines: Iterable[str]) -> None:
+            print("\n".join(lines))
+            return None
+
+    screen = _PlainScreen()  # type: ignore
+
 # GameConfig = NewType("GameConfig", type)
 
+# Ship lengths of the fleet of each player
+CLASSIC_FLEET: Tuple[int, ...] = (1, 1, 1, 1, 1)
+STANDARD_FLEET: Tuple[int, ...] = (5, 4, 3, 3, 2)
+
+# Game seeds are stored as unsigned 64-bit integers in the replay logs
+MAX_SEED: int = 2**64 - 1
+
+
+def game_seed(seed: Optional[int] = None) -> int:
+    """
+    ARGS
+    ==========
+        seed: int or None; the seed of the random generator of a game
+
+    RETURNS
+    ==========
+        The seed itself, or a random one if None. A seed that does not
+        fit the replay logs (0 to MAX_SEED) raises a ValueError.
+    """
+    if seed is None:
+        return random.randrange(2**63)
+    if not 0 <= seed <= MAX_SEED:
+        raise ValueError(f"the seed must be between 0 and {MAX_SEED}, not {seed}")
+    return seed
+
+
+def seed_argument(text: str) -> int:
+    """
+    argparse type of a game seed (see game_seed).
+    """
+    try:
+        return game_seed(int(text))
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error))
+
 
 class Messages:
     @staticmethod
     def info(text: str) -> None:
-        print(colored(text, "green"))
+        screen.print(colored(text, "green"))
         return None
 
     @staticmethod
     def warning(text: str) -> None:
-        print(colored(f"Warning:\n{text}", "yellow"))
+        screen.print(colored(f"Warning:\n{text}", "yellow"))
         return None
 
     @staticmethod
     def error(text: str) -> None:
-        print(colored(f"Error:\n{text}", "red"))
+        screen.print(colored(f"Error:\n{text}", "red"))
         return None
     
     @staticmethod
@@ -50,23 +123,23 @@ class Messages:
         """
         It prints out a welcome message.
         """
-        print("\n")
-        print("\t\t\t" + "#" * 30)
-        print("\t\t\t#" + " " * 28 + "#")
-        print(
+        screen.print("\n")
+        screen.print("\t\t\t" + "#" * 30)
+        screen.print("\t\t\t#" + " " * 28 + "#")
+        screen.print(
             "\t\t\t#"
             + " " * 3
             + colored("WELCOME TO BATTLESHIP!", "cyan")
             + " " * 3
             + "#"
         )
-        print("\t\t\t#" + " " * 28 + "#")
-        print("\t\t\t" + "#" * 30)
-        print("\n")
-        print(
+        screen.print("\t\t\t#" + " " * 28 + "#")
+        screen.print("\t\t\t" + "#" * 30)
+        screen.print("\n")
+        screen.print(
             "The objective is to sink the ships of your opponent before they sink yours.".title()
         )
-        print("\t\t\t\t" + "-" * 5)
+        screen.print("\t\t\t\t" + "-" * 5)
         return None
 
     @staticmethod
@@ -74,12 +147,12 @@ class Messages:
         """
         It prints out a farewell mesage.
         """
-        print("\n")
-        print("\t\t\t" + "#" * 30)
-        print("\t\t\t#" + " " * 28 + "#")
-        print("\t\t\t#" + " " * 10 + colored("GOODBYE!", "cyan") + " " * 10 + "#")
-        print("\t\t\t#" + " " * 28 + "#")
-        print("\t\t\t" + "#" * 30)
+        screen.print("\n")
+        screen.print("\t\t\t" + "#" * 30)
+        screen.print("\t\t\t#" + " " * 28 + "#")
+        screen.print("\t\t\t#" + " " * 10 + colored("GOODBYE!", "cyan") + " " * 10 + "#")
+        screen.print("\t\t\t#" + " " * 28 + "#")
+        screen.print("\t\t\t" + "#" * 30)
         return None
 
 
@@ -97,65 +170,25 @@ class Display:
         ==========
             None.
         """
-        if delay_sec is None:
-            if os.name == "nt":  # For Windows
-                os.system("cls")
-            else:  # For Linux/MacOS (name == "posix")
-                os.system("clear")
-        else:
-            print("Clearing the monitor...")
-            if os.name == "nt":
-                sleep(delay_sec)
-                os.system("cls")
-            else:
-                sleep(delay_sec)
-                os.system("clear")
+        screen.clear(delay_sec)
         return None
 
     @staticmethod
     def board(
-        p1_positions: Dict[str, str],
-        p2_positions: Dict[str, str],
+        p1_board: "Board",
+        p2_board: "Board",
         player_names: Tuple[str, str],
     ) -> None:
-        """Displays the board"""
-        print("    1    2    3    4    5\t\t\t    1    2    3    4    5")
-        print("  " + "-" * 26 + "\t\t\t" + "  " + "-" * 26)
-        print(
-            "a | {p1a1}  | {p1a2}  | {p1a3}  | {p1a4}  | {p1a5}  |\t\t\ta | {p2a1}  | {p2a2}  | {p2a3}  | {p2a4}  | {p2a5}  |".format(
-                **p1_positions, **p2_positions
-            )
-        )
-        print("  " + "-" * 26 + "\t\t\t" + "  " + "-" * 26)
-        print(
-            "b | {p1b1}  | {p1b2}  | {p1b3}  | {p1b4}  | {p1b5}  |\t\t\tb | {p2b1}  | {p2b2}  | {p2b3}  | {p2b4}  | {p2b5}  |".format(
-                **p1_positions, **p2_positions
-            )
-        )
-        print("  " + "-" * 26 + "\t\t\t" + "  " + "-" * 26)
-        print(
-            "c | {p1c1}  | {p1c2}  | {p1c3}  | {p1c4}  | {p1c5}  |\t\t\tc | {p2c1}  | {p2c2}  | {p2c3}  | {p2c4}  | {p2c5}  |".format(
-                **p1_positions, **p2_positions
-            )
-        )
-        print("  " + "-" * 26 + "\t\t\t" + "  " + "-" * 26)
-        print(
-            "d | {p1d1}  | {p1d2}  | {p1d3}  | {p1d4}  | {p1d5}  |\t\t\td | {p2d1}  | {p2d2}  | {p2d3}  | {p2d4}  | {p2d5}  |".format(
-                **p1_positions, **p2_positions
-            )
-        )
-        print("  " + "-" * 26 + "\t\t\t" + "  " + "-" * 26)
-        print(
-            "e | {p1e1}  | {p1e2}  | {p1e3}  | {p1e4}  | {p1e5}  |\t\t\te | {p2e1}  | {p2e2}  | {p2e3}  | {p2e4}  | {p2e5}  |".format(
-                **p1_positions, **p2_positions
-            )
+        """
+        Displays the board at the top of the terminal window, from the
+        template of its grid (see BoardTemplate), with a single write.
+        """
+        template: BoardTemplate = BoardTemplate.of(p1_board.grid)
+        names: str = "  Player: {}\t\t\t  Player: {}".format(
+            player_names[0].ljust(max(GameSetup.MAX_NAME, template.width - 10)),
+            player_names[1],
         )
-        print("  " + "-" * 26 + "\t\t\t" + "  " + "-" * 26)
-        print(
-            "  Player: {}\t\t\t  Player: {}".format(
-                player_names[0].ljust(GameSetup.MAX_NAME), player_names[1]
-            )
-        )  # Fix spacing
+        screen.draw((template.render(p1_board, p2_board), names))
         return None
 
 
@@ -193,7 +226,7 @@ class GameSetup:
         """
         while True:
             Messages.info("Type 1 for one-player game or 2 for two-player game: ")
-            answer: str = input()
+            answer: str = screen.input()
             if answer.lower() == "1":
                 Display.clear_monitor()
                 return "single"
@@ -218,11 +251,11 @@ class GameSetup:
             If the game mode is "single" it returns a tuple that contains the
             name of the player and the word "Computer" as the opponent's name.
         """
-        print("-" * 40)
-        print("\t Game Mode: {}".format(mode.capitalize()))
-        print("-" * 40)
+        screen.print("-" * 40)
+        screen.print("\t Game Mode: {}".format(mode.capitalize()))
+        screen.print("-" * 40)
         while True:
-            player_1: str = input("Name of player: ").capitalize()
+            player_1: str = screen.input("Name of player: ").capitalize()
             if len(player_1) > GameSetup.MAX_NAME:
                 Messages.error(
                     "Player's name cannot exceed {} characters! Please try again.".format(
@@ -241,7 +274,7 @@ class GameSetup:
             return (player_1, player_2)
         elif mode == "double":
             while True:
-                player_2 = input("Name of player 2: ").capitalize()
+                player_2 = screen.input("Name of player 2: ").capitalize()
                 if len(player_2) > GameSetup.MAX_NAME:
                     Messages.error(
                         "Player's name cannot exceed {} characters! Please try again.".format(
@@ -260,79 +293,130 @@ class GameSetup:
             raise GameModeError("game mode error")
 
     @staticmethod
-    def _initialize_board(mode: str, names: Tuple[str, str]) -> Tuple[Set, Set]:
+    def _select_grid() -> "Grid":
+        """
+        ARGS
+        ==========
+            None.
+
+        RETURNS
+        ==========
+            The grid of the game: the classic 5x5 grid with five single-cell
+            ships, or a grid of any size with a fleet of multi-cell ships.
+        """
+        while True:
+            Messages.info(
+                "Enter the size of the grid (e.g. 10x10), or press Enter for the classic 5x5 game: "
+            )
+            answer: str = screen.input().strip().lower()
+            if not answer:
+                return CLASSIC_GRID
+            try:
+                rows, columns = (int(n) for n in answer.split("x"))
+                Messages.info(
+                    "Enter the lengths of the ships (e.g. 5 4 3 3 2), or press Enter for the standard fleet: "
+                )
+                lengths: str = screen.input().strip()
+                fleet: Tuple[int, ...] = (
+                    tuple(int(n) for n in lengths.split()) if lengths else STANDARD_FLEET
+                )
+                grid: Grid = Grid(rows, columns, fleet)
+                # The computer places its fleet at random: make sure it can
+                FleetSampler(grid).sample()
+            except ValueError as e:
+                Messages.error(
+                    str(e) if isinstance(e, GridError) else "This is an invalid grid!"
+                )
+            else:
+                Display.clear_monitor()
+                return grid
+
+    @staticmethod
+    def _place_ships(board: "Board") -> None:
+        """
+        ARGS
+        ==========
+            board: Board; the board of the player placing their ships
+
+        RETURNS
+        ==========
+            None.
+        """
+        grid: Grid = board.grid
+        for num, length in enumerate(grid.fleet, 1):
+            if length == 1:
+                prompt: str = f"Enter the position of your ship #{num}: "
+            else:
+                prompt = (
+                    f"Enter the position of your ship #{num} (length {length}) "
+                    "and h or v for horizontal or vertical (e.g. a3 h): "
+                )
+            while True:
+                answer: List[str] = screen.input(prompt).lower().split()
+                if not answer:
+                    Messages.error("Position cannot be empty!")
+                    continue
+                cell: Optional[int] = grid.cell_index(answer[0])
+                orientation: str = answer[1] if len(answer) > 1 else "h"
+                if cell is None or len(answer) > 2 or orientation not in ("h", "v"):
+                    Messages.error("This is an invalid position!")
+                    continue
+                ship: Optional[int] = grid.ship_mask(cell, length, orientation == "h")
+                if ship is None:
+                    Messages.error("The ship does not fit in the grid here!")
+                elif not board.place_ship(ship):
+                    Messages.error("There is already a ship in this position!")
+                else:
+                    break
+        return None
+
+    @staticmethod
+    def _initialize_board(
+        mode: str,
+        names: Tuple[str, str],
+        grid: "Grid",
+        rng: Optional[random.Random] = None,
+    ) -> Tuple["Board", "Board"]:
         """
         ARGS
         ==========
             mode: str; the mode of the game. Can be "single" or "double".
             names: tuple; the names of players
+            grid: Grid; the grid and fleet of the game
+            rng: Random or None; the random generator of the game
 
         RETURNS
         ==========
-            A tuple that contains the ship positions of each player.
+            A tuple that contains the board (with the ships) of each player.
         """
-        p1_positions: Set[str] = set()
-        p2_positions: Set[str] = set()
+        p1_board: Board = Board(grid)
+        p2_board: Board = Board(grid)
+        example: str = f"(e.g. a3, {grid.square_name(grid.size - 1)} etc)"
 
         # First player setup
-        Display.board(Positions.p1_grid, Positions.p2_grid, names)
+        Display.board(p1_board, p2_board, names)
         Messages.info(
-            f"{names[0].capitalize()}, please indicate the square you want to position your ship (e.g. a3, e5 etc)"
+            f"{names[0].capitalize()}, please indicate the square you want to position your ship {example}"
         )
         if mode == "double":
             Messages.warning(f"{names[1].capitalize()}, DON'T LOOK!")
-        for num in range(1, 6):
-            while True:
-                candidate_square = input(
-                    f"Enter the position of your ship #{num}: "
-                ).lower()
-                if "".join(["p1", candidate_square]) in p1_positions:
-                    Messages.error("There is already a ship in this position!")
-                elif candidate_square.isspace() or not candidate_square:
-                    Messages.error("Position cannot be empty!")
-                elif Positions.position_is_valid(candidate_square):
-                    p1_positions.add("p1" + candidate_square)
-                    break
-                else:
-                    Messages.error("This is an invalid position!")
+        GameSetup._place_ships(p1_board)
 
         # Second player setup
         if mode == "single":
-            for _ in range(5):
-                while True:
-                    candidate_square = random.choice(tuple(Positions.p2_grid.keys()))
-                    if candidate_square not in p2_positions:
-                        p2_positions.add(candidate_square)
-                        break
+            p2_board.place_fleet_randomly(rng)
             Display.clear_monitor()
-            print("Good luck {}!".format(names[0]))
-            print("=" * 80)
-            return (p1_positions, p2_positions)
+            return (p1_board, p2_board)
         elif mode == "double":
             Display.clear_monitor()
-            Display.board(Positions.p1_grid, Positions.p2_grid, names)
+            Display.board(p1_board, p2_board, names)
             Messages.info(
-                f"{names[1].capitalize()}, please indicate the square you want to position your ship (e.g. a3, e5 etc)"
+                f"{names[1].capitalize()}, please indicate the square you want to position your ship {example}"
             )
             Messages.warning(f"{names[0].capitalize()}, DON'T LOOK!")
-            for num in range(1, 6):
-                while True:
-                    candidate_square = input(
-                        f"Enter the position of your ship #{num}: "
-                    ).lower()
-                    if "".join(["p2", candidate_square]) in p2_positions:
-                        Messages.error("There is already a ship in this position!")
-                    elif candidate_square.isspace() or not candidate_square:
-                        Messages.error("Position cannot be empty!")
-                    elif Positions.position_is_valid(candidate_square):
-                        p2_positions.add("p2" + candidate_square)
-                        break
-                    else:
-                        Messages.error("This is an invalid position!")
+            GameSetup._place_ships(p2_board)
             Display.clear_monitor()
-            print("Good luck {}, {}!".format(names[0], names[1]))
-            print("=" * 80)
-            return (p1_positions, p2_positions)
+            return (p1_board, p2_board)
         else:
             raise GameModeError
 
@@ -340,65 +424,1122 @@ class GameSetup:
     class GameConfig:
         mode: str
         names: Tuple[str, str]
-        positions: Tuple[Set, Set]
+        boards: Tuple["Board", "Board"]
+        computer: Optional["Strategy"] = None  # the shooting strategy of the computer
+        seed: int = 0  # the seed of rng, to replay the game
+        rng: random.Random = field(default_factory=random.Random)
 
     @staticmethod
-    def config() -> GameConfig:
+    def config(seed: Optional[int] = None) -> GameConfig:
+        """
+        ARGS
+        ==========
+            seed: int or None; the seed of the random generator of the game
+                (a random one by default)
+
+        RETURNS
+        ==========
+            The configuration of a new game.
+        """
+        seed = game_seed(seed)
+        rng: random.Random = random.Random(seed)
         game_mode: str = GameSetup._select_game_mode()
         player_names: Tuple[str, str] = GameSetup._get_player_names(game_mode)
-        occupied_positions: Tuple[Set, Set] = GameSetup._initialize_board(
-            game_mode, player_names
+        grid: Grid = GameSetup._select_grid()
+        boards: Tuple[Board, Board] = GameSetup._initialize_board(
+            game_mode, player_names, grid, rng
         )
-        return GameSetup.GameConfig(game_mode, player_names, occupied_positions)
+        return GameSetup.GameConfig(game_mode, player_names, boards, seed=seed, rng=rng)
 
 
-class Positions:
-    # The displayd grid for player 1
-    p1_grid: Dict[str, str] = dict(
-    p1a1 = ' ', p1a2 = ' ', p1a3 = ' ', p1a4 = ' ', p1a5 = ' ',
-    p1b1 = ' ', p1b2 = ' ', p1b3 = ' ', p1b4 = ' ', p1b5 = ' ',
-    p1c1 = ' ', p1c2 = ' ', p1c3 = ' ', p1c4 = ' ', p1c5 = ' ',
-    p1d1 = ' ', p1d2 = ' ', p1d3 = ' ', p1d4 = ' ', p1d5 = ' ',
-    p1e1 = ' ', p1e2 = ' ', p1e3 = ' ', p1e4 = ' ', p1e5 = ' '
-    )
+class GridError(ValueError):
+    pass
+
+
+class Grid:
+    """
+    The definition of the boards of a game: rows x columns cells, numbered
+    row by row (cell = row * columns + column), and the lengths of the ships
+    of the fleet of each player. The names of the squares (rows a, b, c, ...
+    and columns 1, 2, 3, ...) are generated from it once.
+    """
 
-    # The displayed grid for player 2
-    p2_grid:Dict[str, str] = dict(
-    p2a1 = ' ', p2a2 = ' ', p2a3 = ' ', p2a4 = ' ', p2a5 = ' ',
-    p2b1 = ' ', p2b2 = ' ', p2b3 = ' ', p2b4 = ' ', p2b5 = ' ',
-    p2c1 = ' ', p2c2 = ' ', p2c3 = ' ', p2c4 = ' ', p2c5 = ' ',
-    p2d1 = ' ', p2d2 = ' ', p2d3 = ' ', p2d4 = ' ', p2d5 = ' ',
-    p2e1 = ' ', p2e2 = ' ', p2e3 = ' ', p2e4 = ' ', p2e5 = ' '
+    __slots__ = (
+        "rows",
+        "columns",
+        "size",
+        "fleet",
+        "full",
+        "squares",
+        "square_names",
+        "_placements",
+        "_placement_masks",
     )
 
-    p1_attacked_positions: Set[str] = set() # Positions player 1 attacked
-    p2_attacked_positions: Set[str] = set() # Positions player 2 attacked
+    def __init__(
+        self, rows: int = 5, columns: int = 5, fleet: Tuple[int, ...] = CLASSIC_FLEET
+    ) -> None:
+        if not 1 <= rows <= 26 or columns < 1:
+            raise GridError("A grid must have 1 to 26 rows and at least one column!")
+        if not fleet or min(fleet) < 1:
+            raise GridError("The fleet must have ships of length 1 or more!")
+        if max(fleet) > max(rows, columns):
+            raise GridError(
+                f"A ship of length {max(fleet)} does not fit in a {rows}x{columns} grid!"
+            )
+        if sum(fleet) > rows * columns:
+            raise GridError(f"The fleet does not fit in a {rows}x{columns} grid!")
+        self.rows: int = rows
+        self.columns: int = columns
+        self.size: int = rows * columns
+        self.fleet: Tuple[int, ...] = tuple(fleet)
+        self.full: int = (1 << self.size) - 1  # mask of all the cells
+        self.square_names: List[str] = [
+            self.row_label(row) + str(column + 1)
+            for row, column in product(range(rows), range(columns))
+        ]
+        # Square name (e.g. "c4") -> cell number
+        self.squares: Dict[str, int] = {
+            square: cell for cell, square in enumerate(self.square_names)
+        }
+        self._placements: Dict[int, Tuple[List[Tuple[int, Tuple[int, ...]]], List[List[int]]]] = {}
+        self._placement_masks: Dict[int, List[int]] = {}
+        return None
 
-    # Store original grids for resetting the game
-    ORIG_GRID_CONFIG: Tuple[Dict, Dict] = (dict(p1_grid), dict(p2_grid))
+    def __repr__(self) -> str:
+        return f"Grid({self.rows}, {self.columns}, {self.fleet})"
 
     @staticmethod
-    def reset_board(config=ORIG_GRID_CONFIG) -> None:
-        Positions.p1_grid.update(config[0])
-        Positions.p2_grid.update(config[1])
+    def row_label(row: int) -> str:
+        return chr(ord("a") + row)
+
+    def cell_index(self, square: str) -> Optional[int]:
+        """
+        Returns the cell number of a square (e.g. "c4"), or None if it is invalid.
+        """
+        return self.squares.get(square.lower())
+
+    def square_name(self, cell: int) -> str:
+        return self.square_names[cell]
+
+    def ship_mask(self, cell: int, length: int, horizontal: bool) -> Optional[int]:
+        """
+        Returns the mask of the cells of a ship of the given length, starting
+        at cell and going right (horizontal) or down, or None if it does not fit.
+        """
+        row, column = divmod(cell, self.columns)
+        if horizontal:
+            if column + length > self.columns:
+                return None
+            return ((1 << length) - 1) << cell
+        if row + length > self.rows:
+            return None
+        mask: int = 0
+        for i in range(length):
+            mask |= 1 << (cell + i * self.columns)
+        return mask
+
+    def placements(
+        self, length: int
+    ) -> Tuple[List[Tuple[int, Tuple[int, ...]]], List[List[int]]]:
+        """
+        Returns all the placements of a ship of the given length, as (mask, cells),
+        and for each cell the indices of the placements that cover it.
+        They are generated once per length.
+        """
+        if length not in self._placements:
+            placements: List[Tuple[int, Tuple[int, ...]]] = []
+            by_cell: List[List[int]] = [[] for _ in range(self.size)]
+            for cell in range(self.size):
+                for horizontal in (True, False) if length > 1 else (True,):
+                    mask: Optional[int] = self.ship_mask(cell, length, horizontal)
+                    if mask is None:
+                        continue
+                    step: int = 1 if horizontal else self.columns
+                    cells: Tuple[int, ...] = tuple(
+                        range(cell, cell + length * step, step)
+                    )
+                    for covered in cells:
+                        by_cell[covered].append(len(placements))
+                    placements.append((mask, cells))
+            self._placements[length] = (placements, by_cell)
+        return self._placements[length]
+
+    def placement_masks(self, length: int) -> List[int]:
+        """
+        Returns the masks of all the placements of a ship of the given length.
+        """
+        if length not in self._placement_masks:
+            self._placement_masks[length] = [
+                mask for mask, _ in self.placements(length)[0]
+            ]
+        return self._placement_masks[length]
+
+    def halo(self, mask: int) -> int:
+        """
+        Returns the mask of the cells of a ship and of all the cells around it
+        (diagonals included).
+        """
+        halo: int = 0
+        for cell in range(self.size):
+            if mask >> cell & 1:
+                row, column = divmod(cell, self.columns)
+                for r in range(max(row - 1, 0), min(row + 2, self.rows)):
+                    for c in range(max(column - 1, 0), min(column + 2, self.columns)):
+                        halo |= 1 << (r * self.columns + c)
+        return halo
+
+
+CLASSIC_GRID: Grid = Grid()
+
+
+@lru_cache(maxsize=None)
+def grid_of(rows: int, columns: int, fleet: Tuple[int, ...]) -> Grid:
+    """
+    Returns the grid of a definition, created once (with its placements).
+    """
+    return Grid(rows, columns, fleet)
+
 
-        Positions.p1_attacked_positions = set()
-        Positions.p2_attacked_positions = set()
+class Board:
+    """
+    The board of one player: where their ships are and which squares
+    the opponent attacked, kept as bitmasks indexed by cell number
+    (see Grid). Each game has its own pair of boards, so that any
+    number of games can be played at the same time.
+    """
+
+    __slots__ = ("grid", "ships", "shots", "fleet")
+
+    def __init__(self, grid: Grid = CLASSIC_GRID) -> None:
+        self.grid: Grid = grid
+        self.ships: int = 0  # bit n is set when there is a ship at cell n
+        self.shots: int = 0  # bit n is set when cell n was attacked
+        self.fleet: List[int] = []  # the mask of the cells of each ship
         return None
 
-    @staticmethod
-    def position_is_valid(square: str) -> bool:
-        valid_squares: List[str] = [
-            "a1", "a2", "a3", "a4", "a5",
-            "b1", "b2", "b3", "b4", "b5",
-            "c1", "c2", "c3", "c4", "c5",
-            "d1", "d2", "d3", "d4", "d5",
-            "e1", "e2", "e3", "e4", "e5"
+    def has_ship(self, cell: int) -> bool:
+        return bool(self.ships >> cell & 1)
+
+    def place_ship(self, ship: int) -> bool:
+        """
+        Places a ship (the mask of its cells, see Grid.ship_mask).
+        Returns False if it overlaps with another ship.
+        """
+        if self.ships & ship:
+            return False
+        self.ships |= ship
+        self.fleet.append(ship)
+        return True
+
+    def place_fleet(self, ships: Sequence[int]) -> None:
+        """
+        Places a whole fleet (the mask of the cells of each ship, e.g. from
+        FleetSampler), replacing the ships already placed.
+        """
+        self.ships, self.fleet = 0, []
+        for ship in ships:
+            if not self.place_ship(ship):
+                raise GridError("The ships of the fleet overlap!")
+        return None
+
+    def place_fleet_randomly(
+        self, rng: Optional[random.Random] = None, allow_adjacent: bool = True
+    ) -> None:
+        """
+        Places the ships of the fleet of the grid at random
+        (with the given random generator, or the random module).
+        """
+        self.place_fleet(FleetSampler(self.grid, allow_adjacent, rng).sample())
+        return None
+
+    def is_attacked(self, cell: int) -> bool:
+        return bool(self.shots >> cell & 1)
+
+    def attack(self, cell: int) -> bool:
+        """
+        Attacks a cell and returns True if a ship was hit.
+        """
+        self.shots |= 1 << cell
+        return bool(self.ships >> cell & 1)
+
+    def sunk_ship(self, cell: int) -> int:
+        """
+        Returns the mask of the ship at cell if all its cells were attacked, else 0.
+        """
+        for ship in self.fleet:
+            if ship >> cell & 1:
+                return ship if not ship & ~self.shots else 0
+        return 0
+
+    def ships_left(self) -> int:
+        return sum(1 for ship in self.fleet if ship & ~self.shots)
+
+    def is_defeated(self) -> bool:
+        return not self.ships & ~self.shots
+
+    def unattacked_cells(self) -> List[int]:
+        free: int = self.grid.full & ~self.shots
+        return [cell for cell in range(self.grid.size) if free >> cell & 1]
+
+
+class BoardTemplate:
+    """
+    The text of the two boards of Display.board for a grid, compiled once:
+    the frame with every square empty, and the offset in it of the first
+    square of each row of each board (the next squares are every 5 characters).
+    A board is rendered by copying the frame and writing the symbols of
+    each row with a single slice assignment, so the cost of a redraw
+    does not grow with the number of squares in Python code.
+    """
+
+    __slots__ = ("grid", "width", "frame", "rows")
+
+    # Hexadecimal digit of a cell (see render) -> symbol
+    SYMBOLS: ClassVar[bytes] = bytes.maketrans(b"012", b" xo")
+    _templates: ClassVar[Dict[Grid, "BoardTemplate"]] = {}
+
+    def __init__(self, grid: Grid) -> None:
+        self.grid: Grid = grid
+        self.width: int = 2 + 5 * grid.columns + 1
+        separator: str = "  " + "-" * (self.width - 2)
+        header: str = "    " + "".join(
+            str(column + 1).ljust(5) for column in range(grid.columns)
+        ).rstrip()
+        lines: List[str] = [
+            header.ljust(self.width) + "\t\t\t" + header,
+            separator + "\t\t\t" + separator,
         ]
-        if square.lower() in valid_squares:
-            return True
+        self.rows: Tuple[List[int], List[int]] = ([], [])
+        offset: int = len(lines[0]) + len(lines[1]) + 2
+        cells: str = ("   | " * grid.columns).rstrip()
+        for row in range(grid.rows):
+            half: str = f"{grid.row_label(row)} | {cells}"
+            # The symbol of a square is after "a | " on the left board
+            self.rows[0].append(offset + 4)
+            self.rows[1].append(offset + len(half) + 3 + 4)
+            lines.append(half + "\t\t\t" + half)
+            lines.append(lines[1])
+            offset += len(lines[-2]) + len(lines[-1]) + 2
+        self.frame: bytes = "\n".join(lines).encode("ascii")
+        return None
+
+    @classmethod
+    def of(cls: Type["BoardTemplate"], grid: Grid) -> "BoardTemplate":
+        """
+        Returns the template of a grid, compiled the first time.
+        """
+        template: Optional[BoardTemplate] = cls._templates.get(grid)
+        if template is None:
+            template = cls._templates[grid] = cls(grid)
+        return template
+
+    def _symbols(self, board: Board) -> bytes:
+        """
+        Returns the symbol of each cell of a board, in cell order.
+        Each bit of the masks of the shots and of the hits is turned into
+        a hexadecimal digit, so that adding them gives 0 (not attacked),
+        1 (missed) or 2 (hit) per cell, with integer operations only.
+        """
+        shots: int = int(format(board.shots, "b"), 16)
+        hits: int = int(format(board.shots & board.ships, "b"), 16)
+        digits: str = format(shots + hits, f"0{self.grid.size}x")[::-1]
+        return digits.encode("ascii").translate(self.SYMBOLS)
+
+    def render(self, p1_board: Board, p2_board: Board) -> str:
+        """
+        Returns the text of the two boards ("o" hit, "x" missed).
+        """
+        buffer: bytearray = bytearray(self.frame)
+        columns: int = self.grid.columns
+        stride: int = 5 * columns
+        for board, starts in zip((p1_board, p2_board), self.rows):
+            if not board.shots:
+                continue
+            symbols: bytes = self._symbols(board)
+            for row, start in enumerate(starts):
+                buffer[start : start + stride : 5] = symbols[row * columns : (row + 1) * columns]
+        return buffer.decode("ascii")
+
+
+class FleetSampler:
+    """
+    Samples random fleets for a grid from the precomputed placements
+    (bitmasks) of each ship length: the ships are placed from the longest
+    to the shortest, each one at a random placement that does not overlap
+    the ships already placed (nor touch them, even diagonally, unless
+    allow_adjacent is enabled).
+
+    A placement is first drawn at random and kept if it is free, which is
+    almost always the case; only when a few draws in a row fail are the
+    free placements listed, so that dense grids do not degrade into endless
+    rejection sampling.
+    """
+
+    __slots__ = ("grid", "allow_adjacent", "rng", "ships", "halos")
+
+    MAX_DRAWS: ClassVar[int] = 8  # random draws before listing the free placements
+
+    def __init__(
+        self,
+        grid: Grid,
+        allow_adjacent: bool = True,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.grid: Grid = grid
+        self.allow_adjacent: bool = allow_adjacent
+        self.rng: random.Random = rng or random.Random()
+        # For each ship of the fleet (longest first), the masks of its placements
+        # and the cells that the other ships cannot take once it is placed
+        self.ships: List[List[int]] = []
+        self.halos: List[List[int]] = []
+        halos_by_length: Dict[int, List[int]] = {}
+        for length in sorted(grid.fleet, reverse=True):
+            masks: List[int] = grid.placement_masks(length)
+            if length not in halos_by_length:
+                halos_by_length[length] = (
+                    masks if allow_adjacent else [grid.halo(mask) for mask in masks]
+                )
+            self.ships.append(masks)
+            self.halos.append(halos_by_length[length])
+        return None
+
+    def sample(self, rng: Optional[random.Random] = None) -> List[int]:
+        """
+        Returns a random fleet: the mask of the cells of each ship
+        (drawn with the given random generator, or the one of the sampler).
+        """
+        rng = rng or self.rng
+        uniform = rng.random  # faster than randrange in this hot loop
+        for _ in range(1000):
+            fleet: List[int] = []
+            blocked: int = 0
+            for masks, halos in zip(self.ships, self.halos):
+                for _ in range(self.MAX_DRAWS):
+                    idx: int = int(uniform() * len(masks))
+                    if not masks[idx] & blocked:
+                        break
+                else:
+                    free: List[int] = [
+                        i for i, mask in enumerate(masks) if not mask & blocked
+                    ]
+                    if not free:
+                        break  # try again from an empty grid
+                    idx = rng.choice(free)
+                fleet.append(masks[idx])
+                blocked |= halos[idx]
+            else:
+                return fleet
+        raise GridError(f"Cannot place the fleet {self.grid.fleet} in the grid!")
+
+    def sample_fleets(self, n: int) -> List[List[int]]:
+        """
+        Returns n random fleets (see sample).
+        """
+        sample = self.sample
+        return [sample() for _ in range(n)]
+
+
+def sample_fleets(
+    n: int,
+    grid: Optional[Grid] = None,
+    allow_adjacent: bool = True,
+    seed: Optional[int] = None,
+) -> List[List[int]]:
+    """
+    Returns n random fleets for a grid (by default, the standard fleet on a
+    10x10 grid), each one as the mask of the cells of each ship.
+    """
+    if grid is None:
+        grid = Grid(10, 10, STANDARD_FLEET)
+    return FleetSampler(grid, allow_adjacent, random.Random(seed)).sample_fleets(n)
+
+
+class Strategy:
+    """
+    The base of the shooting strategies of the computer. A strategy keeps
+    what it knows of the board of its opponent: choose() returns the cell
+    to attack next and observe() tells it the result of the attack.
+    """
+
+    name: ClassVar[str] = ""
+
+    def __init__(self, grid: Grid, rng: Optional[random.Random] = None) -> None:
+        self.grid: Grid = grid
+        self.rng: random.Random = rng or random.Random()
+        self.shots: int = 0
+        self.hits: int = 0
+        self.sunk: int = 0  # cells of the sunk ships
+        return None
+
+    def choose(self) -> int:
+        raise NotImplementedError
+
+    def observe(self, cell: int, hit: bool, sunk_ship: int = 0) -> None:
+        """
+        ARGS
+        ==========
+            cell: int; the attacked cell
+            hit: bool; True if a ship was hit
+            sunk_ship: int; the mask of the cells of the ship, if it was sunk
+
+        RETURNS
+        ==========
+            None.
+        """
+        self.shots |= 1 << cell
+        if hit:
+            self.hits |= 1 << cell
+        self.sunk |= sunk_ship
+        return None
+
+    def attack(self, board: Board) -> int:
+        """
+        Chooses a cell, attacks it on the board and observes the result.
+        """
+        cell: int = self.choose()
+        hit: bool = board.attack(cell)
+        self.observe(cell, hit, board.sunk_ship(cell) if hit else 0)
+        return cell
+
+    def _free_cells(self, mask: int = -1) -> List[int]:
+        free: int = self.grid.full & ~self.shots & mask
+        return [cell for cell in range(self.grid.size) if free >> cell & 1]
+
+
+class RandomStrategy(Strategy):
+    """
+    Attacks a random cell that was not attacked yet.
+    """
+
+    name = "random"
+
+    def choose(self) -> int:
+        return self.rng.choice(self._free_cells())
+
+
+class HuntTargetStrategy(Strategy):
+    """
+    The cheap "hunt/target" strategy: hunt at random on a checkerboard
+    (no ship fits between its cells), and after a hit target the cells
+    next to it until the ship is sunk.
+    """
+
+    name = "hunt_target"
+
+    def __init__(self, grid: Grid, rng: Optional[random.Random] = None) -> None:
+        super().__init__(grid, rng)
+        self.targets: List[int] = []
+        # Cells with an even row + column
+        self.checkerboard: int = sum(
+            1 << cell
+            for cell in range(grid.size)
+            if (cell // grid.columns + cell % grid.columns) % 2 == 0
+        )
+        return None
+
+    def choose(self) -> int:
+        while self.targets:
+            cell: int = self.targets.pop()
+            if not self.shots >> cell & 1:
+                return cell
+        if min(self.grid.fleet) > 1:
+            cells: List[int] = self._free_cells(self.checkerboard)
+            if cells:
+                return self.rng.choice(cells)
+        return self.rng.choice(self._free_cells())
+
+    def observe(self, cell: int, hit: bool, sunk_ship: int = 0) -> None:
+        super().observe(cell, hit, sunk_ship)
+        if sunk_ship and not self.hits & ~self.sunk:
+            self.targets.clear()
+        elif hit and not sunk_ship:
+            row, column = divmod(cell, self.grid.columns)
+            if row > 0:
+                self.targets.append(cell - self.grid.columns)
+            if row < self.grid.rows - 1:
+                self.targets.append(cell + self.grid.columns)
+            if column > 0:
+                self.targets.append(cell - 1)
+            if column < self.grid.columns - 1:
+                self.targets.append(cell + 1)
+        return None
+
+
+class ProbabilityStrategy(Strategy):
+    """
+    Attacks the cell covered by the most placements of the remaining ships
+    that are consistent with the shots so far (a heat map).
+
+    Each placement is dropped once, when one of its cells is a miss or a
+    cell of a sunk ship, and the heat of its cells is then decremented,
+    so the heat map is updated incrementally after each shot. While a ship
+    is hit but not sunk, only the placements through its hits are counted,
+    weighted by the number of hits they cover.
+    """
+
+    name = "probability"
+    HIT_WEIGHT: ClassVar[int] = 16
+
+    def __init__(self, grid: Grid, rng: Optional[random.Random] = None) -> None:
+        super().__init__(grid, rng)
+        self.remaining: Dict[int, int] = {}  # ship length -> ships not sunk
+        for length in grid.fleet:
+            self.remaining[length] = self.remaining.get(length, 0) + 1
+        self.alive: Dict[int, bytearray] = {}  # ship length -> placement still possible
+        self.heat_by_length: Dict[int, List[int]] = {}
+        self.heat: List[int] = [0] * grid.size
+        for length, count in self.remaining.items():
+            placements, by_cell = grid.placements(length)
+            self.alive[length] = bytearray(b"\x01") * len(placements)
+            self.heat_by_length[length] = [len(indices) for indices in by_cell]
+            for cell, indices in enumerate(by_cell):
+                self.heat[cell] += count * len(indices)
+        return None
+
+    def _block(self, cell: int) -> None:
+        """
+        Drops the placements through a cell that cannot have a ship.
+        """
+        for length, alive in self.alive.items():
+            placements, by_cell = self.grid.placements(length)
+            heat_by_length: List[int] = self.heat_by_length[length]
+            weight: int = self.remaining[length]
+            for idx in by_cell[cell]:
+                if alive[idx]:
+                    alive[idx] = 0
+                    for covered in placements[idx][1]:
+                        heat_by_length[covered] -= 1
+                        self.heat[covered] -= weight
+        return None
+
+    def observe(self, cell: int, hit: bool, sunk_ship: int = 0) -> None:
+        super().observe(cell, hit, sunk_ship)
+        if not hit:
+            self._block(cell)
+        if sunk_ship:
+            length: int = sunk_ship.bit_count()
+            if self.remaining.get(length):
+                self.remaining[length] -= 1
+                heat_by_length: List[int] = self.heat_by_length[length]
+                for covered in range(self.grid.size):
+                    self.heat[covered] -= heat_by_length[covered]
+            while sunk_ship:
+                bit: int = sunk_ship & -sunk_ship
+                sunk_ship ^= bit
+                self._block(bit.bit_length() - 1)
+        return None
+
+    def _target_heat(self, wounded: int) -> Dict[int, int]:
+        """
+        Returns the heat of the cells next to the hits of the ships not sunk yet,
+        from the placements through these hits only.
+        """
+        heat: Dict[int, int] = {}
+        for length, alive in self.alive.items():
+            weight: int = self.remaining[length]
+            if not weight:
+                continue
+            placements, by_cell = self.grid.placements(length)
+            seen: Set[int] = set()
+            hits: int = wounded
+            while hits:
+                bit: int = hits & -hits
+                hits ^= bit
+                for idx in by_cell[bit.bit_length() - 1]:
+                    if not alive[idx] or idx in seen:
+                        continue
+                    seen.add(idx)
+                    mask, cells = placements[idx]
+                    score: int = weight * self.HIT_WEIGHT ** (mask & wounded).bit_count()
+                    for covered in cells:
+                        if not self.shots >> covered & 1:
+                            heat[covered] = heat.get(covered, 0) + score
+        return heat
+
+    def choose(self) -> int:
+        wounded: int = self.hits & ~self.sunk
+        heat: Dict[int, int] = self._target_heat(wounded) if wounded else {}
+        if not heat:
+            heat = {
+                cell: self.heat[cell]
+                for cell in self._free_cells()
+            }
+        best: int = max(heat.values(), default=0)
+        if best <= 0:
+            return self.rng.choice(self._free_cells())
+        return self.rng.choice([cell for cell, value in heat.items() if value == best])
+
+
+STRATEGIES: Dict[str, Type[Strategy]] = {
+    strategy.name: strategy
+    for strategy in (RandomStrategy, HuntTargetStrategy, ProbabilityStrategy)
+}
+
+
+class Match:
+    """
+    A game between two strategies, without any terminal I/O: the fleets
+    are placed at random, a random player starts and the players take
+    turns until a fleet is sunk. All its randomness comes from its seed,
+    so that the same seed plays the same game again.
+    """
+
+    __slots__ = ("grid", "boards", "strategies", "shots", "seed", "rng", "first", "moves")
+
+    def __init__(
+        self,
+        grid: Grid,
+        strategy_a: Type[Strategy],
+        strategy_b: Type[Strategy],
+        seed: Optional[int] = None,
+        sampler: Optional[FleetSampler] = None,
+    ) -> None:
+        self.grid: Grid = grid
+        self.seed: int = game_seed(seed)
+        self.rng: random.Random = random.Random(self.seed)
+        if sampler is None:
+            sampler = FleetSampler(grid)
+        self.boards: Tuple[Board, Board] = (Board(grid), Board(grid))
+        for board in self.boards:
+            board.place_fleet(sampler.sample(self.rng))
+        # Strategy i attacks the board of the other player
+        self.strategies: Tuple[Strategy, Strategy] = (
+            strategy_a(grid, self.rng),
+            strategy_b(grid, self.rng),
+        )
+        self.first: int = self.rng.randrange(2)  # the player who fires first
+        self.shots: List[int] = [0, 0]
+        self.moves: List[int] = []  # the attacked cells, in order
+        return None
+
+    def play(self) -> int:
+        """
+        Plays the game to the end and returns the winner (0 or 1).
+        """
+        player: int = self.first
+        while True:
+            target: Board = self.boards[1 - player]
+            self.moves.append(self.strategies[player].attack(target))
+            self.shots[player] += 1
+            if target.is_defeated():
+                return player
+            player = 1 - player
+
+    def record(self) -> "GameRecord":
+        return GameRecord(
+            self.grid,
+            self.seed,
+            self.first,
+            (list(self.boards[0].fleet), list(self.boards[1].fleet)),
+            list(self.moves),
+        )
+
+
+# Replay logs: a header, then one record per game (see GameRecord.encode)
+REPLAY_MAGIC: bytes = b"BSRP"
+REPLAY_VERSION: int = 1
+_REPLAY_HEADER: struct.Struct = struct.Struct("<4sI")  # magic, version
+# Size of the record, rows, columns, ships per fleet, seed, first player
+_RECORD_HEADER: struct.Struct = struct.Struct("<IBHHQB")
+
+
+class ReplayError(ValueError):
+    pass
+
+
+def _cell_typecode(size: int) -> str:
+    """
+    Returns the array typecode of the values of a replay record of a grid
+    of the given size (ships are stored as 2 * cell + vertical).
+    """
+    if 2 * size <= 1 << 8:
+        return "B"
+    if 2 * size <= 1 << 16:
+        return "H"
+    return "I"
+
+
+@lru_cache(maxsize=None)
+def _ship_tables(grid: Grid, lengths: Tuple[int, ...]) -> List[List[Optional[int]]]:
+    """
+    Returns, for each ship length of a replay record, the mask of the ship
+    of each value (2 * first cell + vertical), or None if it does not fit.
+    """
+    tables: Dict[int, List[Optional[int]]] = {
+        length: [
+            grid.ship_mask(value >> 1, length, not value & 1)
+            for value in range(2 * grid.size)
+        ]
+        for length in set(lengths)
+    }
+    return [tables[length] for length in lengths]
+
+
+@dataclass
+class GameRecord:
+    """
+    A game as played: the seed of its random generator, the player who
+    fired first, the fleet of each player (the mask of each ship) and the
+    attacked cells in order, the players firing in turn.
+    """
+
+    grid: Grid
+    seed: int
+    first: int
+    fleets: Tuple[List[int], List[int]]
+    shots: List[int] = field(default_factory=list)
+
+    def shooter(self, shot: int) -> int:
+        """
+        Returns the player who fired the given shot (0 for the first shot).
+        """
+        return (self.first + shot) % 2
+
+    def boards(self, n_shots: Optional[int] = None) -> Tuple[Board, Board]:
+        """
+        Returns the boards of the players after the first n_shots shots
+        (all of them by default).
+        """
+        boards: Tuple[Board, Board] = (Board(self.grid), Board(self.grid))
+        for board, fleet in zip(boards, self.fleets):
+            board.place_fleet(fleet)
+        shots: List[int] = [0, 0]
+        target: int = 1 - self.first
+        for cell in self.shots[:n_shots]:
+            shots[target] |= 1 << cell
+            target = 1 - target
+        boards[0].shots, boards[1].shots = shots
+        return boards
+
+    @property
+    def winner(self) -> Optional[int]:
+        """
+        Returns the player who sank the fleet of the other, or None if
+        the game was not finished.
+        """
+        boards: Tuple[Board, Board] = self.boards()
+        for player in range(2):
+            if boards[1 - player].is_defeated():
+                return player
+        return None
+
+    def encode(self) -> bytes:
+        """
+        Returns the record as bytes: a header (see _RECORD_HEADER), then
+        the ship lengths of the fleet (longest first), the ships of each
+        player (as 2 * first cell + vertical, in the same order) and the
+        shots, all with the smallest integer type that fits the grid.
+        """
+        grid: Grid = self.grid
+        lengths: List[int] = sorted(grid.fleet, reverse=True)
+        values: array = array(_cell_typecode(grid.size), lengths)
+        for fleet in self.fleets:
+            for ship in sorted(fleet, key=int.bit_count, reverse=True):
+                cell: int = (ship & -ship).bit_length() - 1
+                vertical: bool = ship != grid.ship_mask(cell, ship.bit_count(), True)
+                values.append(2 * cell + vertical)
+        values.extend(self.shots)
+        if sys.byteorder == "big":
+            values.byteswap()
+        body: bytes = values.tobytes()
+        header: bytes = _RECORD_HEADER.pack(
+            _RECORD_HEADER.size + len(body),
+            grid.rows,
+            grid.columns,
+            len(lengths),
+            self.seed,
+            self.first,
+        )
+        return header + body
+
+    @classmethod
+    def decode(cls, data: Union[bytes, mmap.mmap], offset: int = 0) -> "GameRecord":
+        """
+        Returns the record encoded at offset in data (see encode).
+        """
+        size, rows, columns, n_ships, seed, first = _RECORD_HEADER.unpack_from(data, offset)
+        values: array = array(_cell_typecode(rows * columns))
+        values.frombytes(data[offset + _RECORD_HEADER.size : offset + size])
+        if sys.byteorder == "big":
+            values.byteswap()
+        lengths: Tuple[int, ...] = tuple(values[:n_ships])
+        try:
+            grid: Grid = grid_of(rows, columns, lengths)
+        except GridError as error:
+            raise ReplayError(f"Invalid replay record: {error}") from None
+        tables: List[List[Optional[int]]] = _ship_tables(grid, lengths)
+        try:
+            fleets: Tuple[List[int], List[int]] = tuple(
+                [table[value] for table, value in zip(tables, values[start : start + n_ships])]
+                for start in (n_ships, 2 * n_ships)
+            )
+        except IndexError:
+            fleets = ([None], [None])
+        if None in fleets[0] or None in fleets[1]:
+            raise ReplayError("Invalid replay record: a ship is out of the grid")
+        return cls(grid, seed, first, fleets, values[3 * n_ships :].tolist())
+
+
+class ReplayWriter:
+    """
+    Appends game records to a replay log, creating it if needed.
+    """
+
+    def __init__(self, file: str) -> None:
+        self.file = open(file, "ab")
+        if self.file.tell() == 0:
+            self.file.write(_REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION))
+        return None
+
+    def write(self, record: GameRecord) -> None:
+        self.file.write(record.encode())
+        return None
+
+    def append_log(self, file: str) -> int:
+        """
+        Appends the records of another replay log, and returns their size in bytes.
+        """
+        with open(file, "rb") as f:
+            if f.read(_REPLAY_HEADER.size) != _REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION):
+                raise ReplayError(f"{file} is not a replay log")
+            start: int = self.file.tell()
+            shutil.copyfileobj(f, self.file)
+        return self.file.tell() - start
+
+    def close(self) -> None:
+        self.file.close()
+        return None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+        return None
+
+
+class ReplayReader:
+    """
+    Reads the games of a replay log. The file is memory-mapped and the
+    offsets of its records are indexed once, so that any game (and any
+    board of it, see GameRecord.boards) is decoded on its own, without
+    playing it again.
+    """
+
+    def __init__(self, file: str) -> None:
+        with open(file, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _REPLAY_HEADER.size:
+                raise ReplayError(f"{file} is not a replay log")
+            self._mm: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if _REPLAY_HEADER.unpack_from(self._mm) != (REPLAY_MAGIC, REPLAY_VERSION):
+            self.close()
+            raise ReplayError(f"{file} is not a replay log")
+        self._offsets: array = array("Q")
+        record_size = struct.Struct("<I").unpack_from
+        offset: int = _REPLAY_HEADER.size
+        end: int = len(self._mm)
+        while offset + _RECORD_HEADER.size <= end:
+            size: int = record_size(self._mm, offset)[0]
+            if size < _RECORD_HEADER.size:
+                break
+            self._offsets.append(offset)
+            offset += size
+        if offset != end:
+            self.close()
+            raise ReplayError(f"The replay log {file} is truncated")
+        return None
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, game: int) -> GameRecord:
+        return GameRecord.decode(self._mm, self._offsets[game])
+
+    def __iter__(self):
+        mm: mmap.mmap = self._mm
+        decode = GameRecord.decode
+        for offset in self._offsets:
+            yield decode(mm, offset)
+
+    def boards(self, game: int, n_shots: Optional[int] = None) -> Tuple[Board, Board]:
+        """
+        Returns the boards of a game after its first n_shots shots (all by default).
+        """
+        return self[game].boards(n_shots)
+
+    def close(self) -> None:
+        self._mm.close()
+        return None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+        return None
+
+
+@dataclass
+class SimulationResult:
+    strategies: Tuple[str, str]
+    games: int = 0
+    wins: List[int] = field(default_factory=lambda: [0, 0])
+    # For each strategy, number of shots of its wins -> number of games
+    shots_to_win: Tuple[Counter, Counter] = field(
+        default_factory=lambda: (Counter(), Counter())
+    )
+    elapsed_sec: float = 0.0
+
+    def merge(self, other: "SimulationResult") -> None:
+        self.games += other.games
+        for i in range(2):
+            self.wins[i] += other.wins[i]
+            self.shots_to_win[i].update(other.shots_to_win[i])
+        return None
+
+    @property
+    def games_per_sec(self) -> float:
+        return self.games / self.elapsed_sec if self.elapsed_sec else 0.0
+
+    def win_rate(self, player: int) -> float:
+        return self.wins[player] / self.games if self.games else 0.0
+
+    def mean_shots_to_win(self, player: int) -> float:
+        counts: Counter = self.shots_to_win[player]
+        n: int = sum(counts.values())
+        return sum(shots * count for shots, count in counts.items()) / n if n else 0.0
+
+    def shots_percentile(self, player: int, q: float) -> int:
+        """
+        Returns the q-th percentile (0-100) of the shots of the wins of a strategy.
+        """
+        counts: Counter = self.shots_to_win[player]
+        n: int = sum(counts.values())
+        seen: int = 0
+        for shots in sorted(counts):
+            seen += counts[shots]
+            if seen >= q / 100 * n:
+                return shots
+        return 0
+
+
+def _strategy_class(strategy: Union[str, Type[Strategy]]) -> Type[Strategy]:
+    return STRATEGIES[strategy] if isinstance(strategy, str) else strategy
+
+
+def _simulate_shard(
+    n_games: int,
+    strategies: Tuple[Union[str, Type[Strategy]], Union[str, Type[Strategy]]],
+    grid_definition: Tuple[int, int, Tuple[int, ...]],
+    seed: str,
+    replay: Optional[str] = None,
+) -> SimulationResult:
+    grid: Grid = grid_of(*grid_definition)
+    strategy_a: Type[Strategy] = _strategy_class(strategies[0])
+    strategy_b: Type[Strategy] = _strategy_class(strategies[1])
+    # The seeds of the games of the shard
+    rng: random.Random = random.Random(seed)
+    sampler: FleetSampler = FleetSampler(grid)
+    writer: Optional[ReplayWriter] = ReplayWriter(replay) if replay else None
+    result: SimulationResult = SimulationResult((strategy_a.name, strategy_b.name))
+    for _ in range(n_games):
+        match: Match = Match(grid, strategy_a, strategy_b, rng.getrandbits(63), sampler)
+        winner: int = match.play()
+        result.games += 1
+        result.wins[winner] += 1
+        result.shots_to_win[winner][match.shots[winner]] += 1
+        if writer is not None:
+            writer.write(match.record())
+    if writer is not None:
+        writer.close()
+    return result
+
+
+def simulate(
+    n_games: int,
+    strategy_a: Union[str, Type[Strategy]] = "probability",
+    strategy_b: Union[str, Type[Strategy]] = "hunt_target",
+    workers: Optional[int] = None,
+    grid: Optional[Grid] = None,
+    seed: Optional[int] = None,
+    replay: Optional[str] = None,
+) -> SimulationResult:
+    """
+    Plays n_games between two strategies (names of STRATEGIES or Strategy
+    classes), without any sleep, subprocess or terminal output.
+
+    ARGS
+    ==========
+        n_games: int; the number of games
+        strategy_a, strategy_b: the strategies of the two players
+        workers: int or None; the number of worker processes (all the CPUs by
+            default); with 1 worker, the games are played in this process
+        grid: Grid or None; the grid and fleet (by default, the standard
+            fleet on a 10x10 grid)
+        seed: int or None; the seed of the games, for reproducible results
+        replay: str or None; a replay log where the games are appended
+            (see ReplayReader); each game is also reproduced by Match
+            from its seed
+
+    RETURNS
+    ==========
+        A SimulationResult with the wins and the shots-to-win distribution of
+        each strategy, and the games per second.
+    """
+    if grid is None:
+        grid = Grid(10, 10, STANDARD_FLEET)
+    if seed is None:
+        seed = random.randrange(2**63)
+    workers = workers or os.cpu_count() or 1
+    strategies = (strategy_a, strategy_b)
+    definition: Tuple[int, int, Tuple[int, ...]] = (grid.rows, grid.columns, grid.fleet)
+    # A few shards per worker, so that they finish at about the same time
+    n_shards: int = max(1, min(n_games, workers * 4)) if workers > 1 else 1
+    shard_games: List[int] = [
+        n_games // n_shards + (i < n_games % n_shards) for i in range(n_shards)
+    ]
+    shard_seeds: List[str] = [f"{seed}-{i}" for i in range(n_shards)]
+    # Each shard writes its own replay log, appended to the replay in order
+    shard_replays: List[Optional[str]] = [
+        f"{replay}.{os.getpid()}-{i}" if replay else None for i in range(n_shards)
+    ]
+
+    start: float = perf_counter()
+    try:
+        if workers == 1:
+            results: List[SimulationResult] = [
+                _simulate_shard(
+                    shard_games[0], strategies, definition, shard_seeds[0], shard_replays[0]
+                )
+            ]
         else:
-            return False
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(
+                    executor.map(
+                        _simulate_shard,
+                        shard_games,
+                        [strategies] * n_shards,
+                        [definition] * n_shards,
+                        shard_seeds,
+                        shard_replays,
+                    )
+                )
+        if replay:
+            with ReplayWriter(replay) as writer:
+                for shard_replay in shard_replays:
+                    writer.append_log(shard_replay)
+    finally:
+        for shard_replay in shard_replays:
+            if shard_replay and os.path.exists(shard_replay):
+                os.remove(shard_replay)
+    result: SimulationResult = SimulationResult(
+        (_strategy_class(strategy_a).name, _strategy_class(strategy_b).name)
+    )
+    for shard_result in results:
+        result.merge(shard_result)
+    result.elapsed_sec = perf_counter() - start
+    return result
 
 
 class Player:
@@ -408,7 +1549,7 @@ class Player:
 
     @staticmethod
     def plays_first(config: GameSetup.GameConfig) -> Self:
-        name: str = random.choice(config.names)
+        name: str = config.rng.choice(config.names)
         Messages.info(f"\n{name} plays first!")
         return Player(name)
 
@@ -421,154 +1562,140 @@ class Player:
             Messages.info(f"\n{config.names[0]} plays next!")
             return Player(config.names[0])
 
-    def attack(self, config: GameSetup.GameConfig) -> None:
-        # Seemingly unnecessary repetition of player_1 attack:
+    def attack(self, config: GameSetup.GameConfig) -> int:
+        """
+        Attacks a square of the opponent and returns its cell.
+        """
+        # Seemingly unnecessary check of the game mode:
         # try to avoid ambiguity in the unlike scenario of
         # player_2 entering "Computer" as their name
-        if config.mode == "single":
-            if self.name == "Computer":
-                while True:
-                    attack_position: str = random.choice(
-                        tuple(Positions.p1_grid.keys())
-                    )
-                    if attack_position not in Positions.p2_attacked_positions:
-                        Positions.p2_attacked_positions.add(attack_position)
-                        break
-                    else:
-                        attack_position = random.choice(tuple(Positions.p1_grid.keys()))
+        if config.mode == "single" and self.name == "Computer":
+            if config.computer is None:
+                config.computer = ProbabilityStrategy(config.boards[0].grid, config.rng)
+            return config.computer.attack(config.boards[0])
 
-                if attack_position in config.positions[0]:
-                    # print("Successful attack!")
-                    Positions.p1_grid.update({attack_position: "o"})
-                    config.positions[0].remove(attack_position)
-                else:
-                    # print("Target missed!")
-                    Positions.p1_grid.update({attack_position: "x"})
-            else:
-                while True:
-                    attack_position = input(
-                        "Which position do you want to attack? (e.g. a1, e5 etc): "
-                    ).lower()
-                    if Positions.position_is_valid(attack_position):
-                        break
-                    else:
-                        Messages.error("Invalid position! Try again:")
-
-                while True:
-                    attack_position = "".join(["p2", attack_position])
-                    if attack_position not in Positions.p1_attacked_positions:
-                        Positions.p1_attacked_positions.add(attack_position)
-                        break
-                    else:
-                        Messages.error(
-                            "You've already attacked this position! Try again:"
-                        )
-                        attack_position = input(
-                            "Which position do you want to attack? (e.g. a1, e5 etc): "
-                        ).lower()
-
-                if attack_position in config.positions[1]:
-                    # print("Successful attack!")
-                    Positions.p2_grid.update({attack_position: "o"})
-                    config.positions[1].remove(attack_position)
-                else:
-                    # print("Target missed!")
-                    Positions.p2_grid.update({attack_position: "x"})
+        if config.mode == "single" or self.name == config.names[0]:
+            board = config.boards[1]
         else:
-            while True:
-                attack_position = input(
-                    "Which position do you want to attack? (e.g. a1, e5 etc): "
-                ).lower()
-                if Positions.position_is_valid(attack_position):
-                    break
-                else:
-                    Messages.error("Invalid position! Try again:")
-
-            if self.name == config.names[0]:
-                while True:
-                    attack_position = "".join(["p2", attack_position])
-                    if attack_position not in Positions.p1_attacked_positions:
-                        Positions.p1_attacked_positions.add(attack_position)
-                        break
-                    else:
-                        Messages.error(
-                            "You've already attacked this position! Try again:"
-                        )
-                        attack_position = input(
-                            "Which position do you want to attack? (e.g. a1, e5 etc): "
-                        ).lower()
-
-                if attack_position in config.positions[1]:
-                    # print("Successful attack!")
-                    Positions.p2_grid.update({attack_position: "o"})
-                    config.positions[1].remove(attack_position)
-                else:
-                    # print("Target missed!")
-                    Positions.p2_grid.update({attack_position: "x"})
+            board = config.boards[0]
+        while True:
+            attack_position: str = screen.input(
+                "Which position do you want to attack? (e.g. a1, {} etc): ".format(
+                    board.grid.square_name(board.grid.size - 1)
+                )
+            ).lower()
+            cell: Optional[int] = board.grid.cell_index(attack_position)
+            if cell is None:
+                Messages.error("Invalid position! Try again:")
+            elif board.is_attacked(cell):
+                Messages.error("You've already attacked this position! Try again:")
             else:
-                while True:
-                    attack_position = "".join(["p1", attack_position])
-                    if attack_position not in Positions.p2_attacked_positions:
-                        Positions.p2_attacked_positions.add(attack_position)
-                        break
-                    else:
-                        Messages.error(
-                            "You've already attacked this position! Try again:"
-                        )
-                        attack_position = input(
-                            "Which position do you want to attack? (e.g. a1, e5 etc): "
-                        ).lower()
-
-                if attack_position in config.positions[0]:
-                    # print("Successful attack!")
-                    Positions.p1_grid.update({attack_position: "o"})
-                    config.positions[0].remove(attack_position)
-                else:
-                    # print("Target missed!")
-                    Positions.p1_grid.update({attack_position: "x"})
-        return None
+                break
+        board.attack(cell)
+        return cell
 
 
 class Game:
     @staticmethod
-    def play(config: GameSetup.GameConfig) -> None:
-        Display.board(Positions.p1_grid, Positions.p2_grid, config.names)
+    def play(config: GameSetup.GameConfig) -> GameRecord:
+        """
+        Plays a game and returns its record (see ReplayWriter).
+        """
+        Display.board(*config.boards, config.names)
+        if config.mode == "single":
+            screen.print("Good luck {}!".format(config.names[0]))
+        else:
+            screen.print("Good luck {}, {}!".format(*config.names))
+        screen.print("=" * 80)
         current_player: Player = Player.plays_first(config)
-        while (config.positions[0] != set()) and (config.positions[1] != set()):
+        record: GameRecord = GameRecord(
+            config.boards[0].grid,
+            config.seed,
+            config.names.index(current_player.name),
+            (list(config.boards[0].fleet), list(config.boards[1].fleet)),
+        )
+        while not config.boards[0].is_defeated() and not config.boards[1].is_defeated():
             if (current_player.name == "Computer") and (config.mode == "single"):
                 sleep(2)
-            current_player.attack(config)
-            Display.clear_monitor()
-            Display.board(Positions.p1_grid, Positions.p2_grid, config.names)
+            record.shots.append(current_player.attack(config))
+            Display.board(*config.boards, config.names)
             current_player = Player.next_player(config, current_player)
 
-        if config.positions[0] == set():
-            # Display.board(Positions.p1_grid, Positions.p2_grid, config.names)
+        if config.boards[0].is_defeated():
             Messages.info(f"{config.names[1]} wins!".upper())
-        elif config.positions[1] == set():
-            # Display.board(Positions.p1_grid, Positions.p2_grid, config.names)
+        elif config.boards[1].is_defeated():
             Messages.info(f"{config.names[0]} wins!".upper())
-        return None
+        return record
+
+
+def show_replay(file: str, game: int, n_shots: Optional[int] = None) -> None:
+    """
+    Displays the boards of a game of a replay log after its first n_shots
+    shots (all of them by default).
+    """
+    with ReplayReader(file) as reader:
+        record: GameRecord = reader[game]
+    Display.board(*record.boards(n_shots), ("Player 1", "Player 2"))
+    shots: int = len(record.shots[:n_shots])
+    screen.print(f"Game {game} (seed {record.seed}), after {shots} of {len(record.shots)} shots")
+    return None
 
 
-def main() -> None:
+def main(seed: Optional[int] = None, replay: Optional[str] = None) -> None:
+    """
+    ARGS
+    ==========
+        seed: int or None; the seed of the first game (the next games
+            get random seeds)
+        replay: str or None; a replay log where the games are appended
+
+    RETURNS
+    ==========
+        None.
+    """
     Messages.welcome()
     while True:
-        config: GameSetup.GameConfig = GameSetup.config()
-        Game.play(config)
-        answer = input("Do you want to play again? (y/n): ")
+        config: GameSetup.GameConfig = GameSetup.config(seed)
+        seed = None
+        record: GameRecord = Game.play(config)
+        if replay is not None:
+            with ReplayWriter(replay) as writer:
+                writer.write(record)
+        answer = screen.input("Do you want to play again? (y/n): ")
         if answer.lower() == "n" or answer.lower() == "no":
             Messages.goodbye()
             break
         elif answer.lower() == "y" or answer.lower() == "yes":
-            Positions.reset_board()
             Display.clear_monitor()
         else:
-            print("I didn't understand that! I'm exiting now...")
+            screen.print("I didn't understand that! I'm exiting now...")
             Messages.goodbye()
             break
     return None
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Play battleship.")
+    parser.add_argument(
+        "--seed", type=seed_argument, default=None, help="seed of the first game"
+    )
+    parser.add_argument(
+        "--replay", default=None, help="append the games to this replay log"
+    )
+    parser.add_argument(
+        "--show",
+        type=int,
+        default=None,
+        metavar="GAME",
+        help="display a game of the replay log (numbered from 0) and exit",
+    )
+    parser.add_argument(
+        "--shots", type=int, default=None, help="with --show, the number of shots played"
+    )
+    args = parser.parse_args()
+    if args.show is not None:
+        if args.replay is None:
+            parser.error("--show requires --replay")
+        show_replay(args.replay, args.show, args.shots)
+    else:
+        main(args.seed, args.replay)
@@ -0,0 +1,530 @@
+"""
+server.py
+Requires Python-version >= 3.11 (see asyncio.timeout)
+
+A network battleship server: players connect over TCP, are paired two by
+two and play against each other, each one on their own terminal (no more
+"DON'T LOOK!"). All the matches run in a single process on one asyncio
+event loop, without a thread per player, and each match has its own pair
+of boards.
+
+The protocol is made of short text lines (one command or message per line).
+
+Commands of the clients:
+    JOIN [name]             : waits for an opponent (again after a game)
+    PLACE <ship> <ship> ... : places the fleet, one ship per ship length of the
+                              fleet in order, as its first square and h or v
+                              for horizontal or vertical (e.g. a3h b1v c5h)
+    PLACE RANDOM            : places the fleet at random
+    FIRE <square>           : attacks a square of the opponent (e.g. c4)
+    QUIT                    : leaves the server
+
+Messages of the server:
+    WAIT                     : wait for the opponent
+    START <opponent> <rows> <columns> <fleet>
+                             : a match starts (e.g. START bob 10 10 5,4,3,3,2)
+    OK                       : the fleet was placed
+    TURN                     : it is your turn to fire
+    RESULT <square> <result> : the result of your shot
+    SHOT <square> <result>   : the result of the shot of your opponent
+    WIN [forfeit] / LOSE     : the match is over
+    ERR <message>            : the command was rejected
+    BYE                      : the connection is closed
+where <result> is MISS, HIT or SUNK followed by the ship and its length
+(e.g. RESULT c4 SUNK c2v 3).
+
+Every reply is flushed before the next command of the same client is read,
+so a client that does not read its replies stops being served (and is
+disconnected after WRITE_TIMEOUT_SEC) instead of filling the memory of the
+server. A client only ever gets a few lines from its opponent per turn.
+
+Usage:
+    python server.py serve [--host HOST] [--port PORT] [--rows N] [--columns N] [--fleet classic|standard]
+    python server.py play [--host HOST] [--port PORT] [--name NAME]
+    python server.py bots [--host HOST] [--port PORT] [--clients N] [--strategy NAME]
+
+@author: Savvas Chanlaridis
+@version: v2026-10-18
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+from collections import Counter
+from time import perf_counter
+from typing import List, Tuple, Dict, Optional, ClassVar
+
+import battleship
+from battleship import Board, FleetSampler, Grid, grid_of
+
+DEFAULT_HOST: str = "127.0.0.1"
+DEFAULT_PORT: int = 8642
+
+MAX_LINE_BYTES: int = 1024  # longer lines close the connection
+MAX_NAME: int = 16
+BACKLOG: int = 4096  # connections waiting to be accepted
+WRITE_TIMEOUT_SEC: float = 30.0  # time for a client to read its replies
+IDLE_TIMEOUT_SEC: float = 600.0  # time for a client to send its next command
+
+FLEETS: Dict[str, Tuple[int, ...]] = {
+    "classic": battleship.CLASSIC_FLEET,
+    "standard": battleship.STANDARD_FLEET,
+}
+
+
+def ship_token(grid: Grid, ship: int) -> str:
+    """
+    Returns the token of a ship (the mask of its cells), e.g. "a3h".
+    """
+    cell: int = (ship & -ship).bit_length() - 1
+    horizontal: bool = ship.bit_count() == 1 or bool(ship >> (cell + 1) & 1)
+    return grid.square_name(cell) + ("h" if horizontal else "v")
+
+
+def parse_ship(grid: Grid, token: str, length: int) -> Optional[int]:
+    """
+    Returns the mask of the cells of a ship of the given length from its token
+    (e.g. "a3h", or "a3" for horizontal), or None if it is invalid.
+    """
+    token = token.lower()
+    orientation: str = "h"
+    if token[-1:] in ("h", "v"):
+        token, orientation = token[:-1], token[-1]
+    cell: Optional[int] = grid.cell_index(token)
+    if cell is None:
+        return None
+    return grid.ship_mask(cell, length, orientation == "h")
+
+
+def shot_result(board: Board, cell: int, hit: bool) -> str:
+    """
+    Returns the result of a shot on a board, e.g. "MISS", "HIT" or "SUNK a3h 3".
+    """
+    if not hit:
+        return "MISS"
+    ship: int = board.sunk_ship(cell)
+    if not ship:
+        return "HIT"
+    return f"SUNK {ship_token(board.grid, ship)} {ship.bit_count()}"
+
+
+class Connection:
+    """
+    A client of the server, and the match it plays (if any).
+    """
+
+    __slots__ = ("reader", "writer", "name", "match", "player")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader: asyncio.StreamReader = reader
+        self.writer: asyncio.StreamWriter = writer
+        self.name: str = "anonymous"
+        self.match: Optional[OnlineMatch] = None
+        self.player: int = 0  # the index of the client in its match
+        return None
+
+    def notify(self, *lines: str) -> None:
+        """
+        Queues lines for the client, without waiting for them to be sent.
+        """
+        if not self.writer.is_closing():
+            self.writer.write("".join(line + "\n" for line in lines).encode())
+        return None
+
+    async def send(self, *lines: str) -> None:
+        """
+        Sends lines to the client, and waits until its buffer is flushed
+        (the client is disconnected if it does not read them in time).
+        """
+        self.notify(*lines)
+        try:
+            async with asyncio.timeout(WRITE_TIMEOUT_SEC):
+                await self.writer.drain()
+        except (TimeoutError, ConnectionError):
+            self.writer.close()
+        return None
+
+
+class OnlineMatch:
+    """
+    A match between two connections, with the board (ships and shots
+    received) of each player. The players place their fleets, then a
+    random player fires first and they take turns until a fleet is sunk.
+    """
+
+    __slots__ = ("grid", "players", "boards", "ready", "turn", "over")
+
+    def __init__(self, grid: Grid, players: Tuple[Connection, Connection]) -> None:
+        self.grid: Grid = grid
+        self.players: Tuple[Connection, Connection] = players
+        self.boards: Tuple[Board, Board] = (Board(grid), Board(grid))
+        self.ready: List[bool] = [False, False]
+        self.turn: Optional[int] = None  # the player firing next, once both are ready
+        self.over: bool = False
+        for player, connection in enumerate(players):
+            connection.match = self
+            connection.player = player
+        return None
+
+    def start_message(self, player: int) -> str:
+        fleet: str = ",".join(str(length) for length in self.grid.fleet)
+        opponent: str = self.players[1 - player].name
+        return f"START {opponent} {self.grid.rows} {self.grid.columns} {fleet}"
+
+    def place(self, player: int, ships: List[int]) -> Optional[str]:
+        """
+        Places the fleet of a player. Returns the error message, if any.
+        """
+        if self.ready[player]:
+            return "Your fleet is already placed"
+        try:
+            self.boards[player].place_fleet(ships)
+        except battleship.GridError:
+            return "The ships overlap"
+        self.ready[player] = True
+        return None
+
+    def fire(self, player: int, cell: int) -> Tuple[str, bool]:
+        """
+        Attacks a cell of the opponent of a player, and returns the result of
+        the shot and if the opponent is defeated.
+        """
+        board: Board = self.boards[1 - player]
+        hit: bool = board.attack(cell)
+        self.turn = 1 - player
+        return (shot_result(board, cell, hit), board.is_defeated())
+
+    def end(self) -> None:
+        self.over = True
+        for connection in self.players:
+            connection.match = None
+        return None
+
+
+class BattleshipServer:
+    """
+    Pairs the connections that JOIN in order of arrival, and relays the
+    commands of each client to its match.
+    """
+
+    RANDOM: ClassVar[str] = "RANDOM"
+
+    def __init__(self, grid: Optional[Grid] = None, seed: Optional[int] = None) -> None:
+        self.grid: Grid = grid or Grid(10, 10, battleship.STANDARD_FLEET)
+        self.rng: random.Random = random.Random(seed)
+        self.sampler: FleetSampler = FleetSampler(self.grid, rng=self.rng)
+        self.waiting: Optional[Connection] = None
+        self.connections: int = 0
+        self.matches: int = 0  # matches in progress
+        self.matches_played: int = 0
+        return None
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.Server:
+        return await asyncio.start_server(
+            self.handle_connection, host, port, limit=MAX_LINE_BYTES, backlog=BACKLOG
+        )
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        connection: Connection = Connection(reader, writer)
+        self.connections += 1
+        try:
+            while not writer.is_closing():
+                try:
+                    async with asyncio.timeout(IDLE_TIMEOUT_SEC):
+                        line: bytes = await reader.readline()
+                except (TimeoutError, ValueError):
+                    # Idle for too long, or a line longer than MAX_LINE_BYTES
+                    break
+                if not line:
+                    break
+                words: List[str] = line.decode(errors="replace").split()
+                if not words:
+                    continue
+                command: str = words[0].upper()
+                if command == "QUIT":
+                    await connection.send("BYE")
+                    break
+                await self.handle_command(connection, command, words[1:])
+        except ConnectionError:
+            pass
+        finally:
+            self.leave(connection)
+            self.connections -= 1
+            writer.close()
+        return None
+
+    async def handle_command(
+        self, connection: Connection, command: str, args: List[str]
+    ) -> None:
+        if command == "JOIN":
+            if connection.match is not None or self.waiting is connection:
+                await connection.send("ERR You have already joined")
+                return None
+            if args:
+                connection.name = args[0][:MAX_NAME]
+            self.join(connection)
+            return None
+
+        match: Optional[OnlineMatch] = connection.match
+        if match is None:
+            await connection.send("ERR You are not in a match, JOIN first")
+        elif command == "PLACE":
+            await self.place(connection, match, args)
+        elif command == "FIRE":
+            await self.fire(connection, match, args)
+        else:
+            await connection.send(f"ERR Unknown command {command}")
+        return None
+
+    def join(self, connection: Connection) -> None:
+        opponent: Optional[Connection] = self.waiting
+        if opponent is None or opponent.writer.is_closing():
+            self.waiting = connection
+            connection.notify("WAIT")
+            return None
+        self.waiting = None
+        match: OnlineMatch = OnlineMatch(self.grid, (opponent, connection))
+        self.matches += 1
+        for player, player_connection in enumerate(match.players):
+            player_connection.notify(match.start_message(player))
+        return None
+
+    def leave(self, connection: Connection) -> None:
+        """
+        Removes a connection that was closed; its opponent wins by forfeit.
+        """
+        if self.waiting is connection:
+            self.waiting = None
+        match: Optional[OnlineMatch] = connection.match
+        if match is not None and not match.over:
+            opponent: Connection = match.players[1 - connection.player]
+            match.end()
+            self.matches -= 1
+            opponent.notify("WIN forfeit")
+        return None
+
+    async def place(
+        self, connection: Connection, match: OnlineMatch, args: List[str]
+    ) -> None:
+        player: int = connection.player
+        if args and args[0].upper() == self.RANDOM:
+            ships: List[int] = self.sampler.sample()
+        elif len(args) != len(self.grid.fleet):
+            await connection.send(f"ERR Place exactly {len(self.grid.fleet)} ships")
+            return None
+        else:
+            ships = []
+            for token, length in zip(args, self.grid.fleet):
+                ship: Optional[int] = parse_ship(self.grid, token, length)
+                if ship is None:
+                    await connection.send(f"ERR Invalid position {token}")
+                    return None
+                ships.append(ship)
+        error: Optional[str] = match.place(player, ships)
+        if error is not None:
+            await connection.send(f"ERR {error}")
+            return None
+        if not all(match.ready):
+            await connection.send("OK", "WAIT")
+            return None
+        # Both fleets are placed: a random player fires first
+        match.turn = self.rng.randrange(2)
+        first: bool = match.turn == player
+        match.players[1 - player].notify("WAIT" if first else "TURN")
+        await connection.send("OK", "TURN" if first else "WAIT")
+        return None
+
+    async def fire(
+        self, connection: Connection, match: OnlineMatch, args: List[str]
+    ) -> None:
+        player: int = connection.player
+        if match.turn != player:
+            await connection.send("ERR It is not your turn")
+            return None
+        cell: Optional[int] = self.grid.cell_index(args[0]) if len(args) == 1 else None
+        if cell is None:
+            await connection.send("ERR Invalid position")
+            return None
+        if match.boards[1 - player].is_attacked(cell):
+            await connection.send("ERR You've already attacked this position")
+            return None
+        result, defeated = match.fire(player, cell)
+        square: str = self.grid.square_name(cell)
+        opponent: Connection = match.players[1 - player]
+        if defeated:
+            match.end()
+            self.matches -= 1
+            self.matches_played += 1
+            opponent.notify(f"SHOT {square} {result}", "LOSE")
+            await connection.send(f"RESULT {square} {result}", "WIN")
+        else:
+            opponent.notify(f"SHOT {square} {result}", "TURN")
+            await connection.send(f"RESULT {square} {result}")
+        return None
+
+
+async def serve(
+    host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, grid: Optional[Grid] = None
+) -> None:
+    server: BattleshipServer = BattleshipServer(grid)
+    tcp_server: asyncio.Server = await server.start(host, port)
+    print(f"Battleship server on {host}:{port}, grid {server.grid}")
+    async with tcp_server:
+        await tcp_server.serve_forever()
+    return None
+
+
+async def play_bot(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    name: str = "bot",
+    strategy: str = "probability",
+    games: int = 1,
+    seed: Optional[int] = None,
+) -> Counter:
+    """
+    A client that places its fleet at random and fires with one of the
+    strategies of the computer, to test the server.
+
+    RETURNS
+    ==========
+        A Counter of the results of its games ("WIN", "LOSE", "WIN forfeit").
+    """
+    rng: random.Random = random.Random(seed)
+    results: Counter = Counter()
+    reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE_BYTES)
+    grid: Grid = battleship.CLASSIC_GRID
+    shooter: Optional[battleship.Strategy] = None
+    writer.write(f"JOIN {name}\n".encode())
+    while games:
+        line: bytes = await reader.readline()
+        if not line:
+            break
+        words: List[str] = line.decode().split()
+        message: str = words[0]
+        reply: Optional[str] = None
+        if message == "START":
+            rows, columns = int(words[2]), int(words[3])
+            fleet: Tuple[int, ...] = tuple(int(length) for length in words[4].split(","))
+            grid = grid_of(rows, columns, fleet)
+            shooter = battleship.STRATEGIES[strategy](grid, rng)
+            ships: List[int] = FleetSampler(grid, rng=rng).sample()
+            reply = "PLACE " + " ".join(ship_token(grid, ship) for ship in ships)
+        elif message == "TURN":
+            reply = f"FIRE {grid.square_name(shooter.choose())}"
+        elif message == "RESULT":
+            cell: int = grid.cell_index(words[1])
+            sunk_ship: int = 0
+            if words[2] == "SUNK":
+                sunk_ship = parse_ship(grid, words[3], int(words[4])) or 0
+            shooter.observe(cell, words[2] != "MISS", sunk_ship)
+        elif message in ("WIN", "LOSE"):
+            results[" ".join(words)] += 1
+            games -= 1
+            if games:
+                reply = f"JOIN {name}"
+        elif message == "ERR":
+            raise RuntimeError(f"{name}: the server rejected a command: {line.decode()}")
+        if reply is not None:
+            writer.write((reply + "\n").encode())
+            await writer.drain()
+    writer.write(b"QUIT\n")
+    writer.close()
+    return results
+
+
+async def run_bots(
+    n_clients: int,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    strategy: str = "probability",
+    games: int = 1,
+    seed: Optional[int] = None,
+) -> Counter:
+    """
+    Runs n_clients bots at the same time (n_clients / 2 matches at a time)
+    and displays the throughput of the server.
+    """
+    start: float = perf_counter()
+    results: List[Counter] = await asyncio.gather(
+        *(
+            play_bot(host, port, f"bot{i}", strategy, games, None if seed is None else seed + i)
+            for i in range(n_clients)
+        )
+    )
+    elapsed_sec: float = perf_counter() - start
+    total: Counter = sum(results, Counter())
+    matches: int = total["WIN"] + total["WIN forfeit"]
+    print(f"{n_clients} clients played {matches} matches in {elapsed_sec:.2f} s", end=" ")
+    print(f"({matches / elapsed_sec:.0f} matches/s)")
+    return total
+
+
+async def play_interactive(
+    host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, name: str = "player"
+) -> None:
+    """
+    A bare client for humans: prints the messages of the server and sends
+    the commands typed on the keyboard.
+    """
+    reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE_BYTES)
+    writer.write(f"JOIN {name}\n".encode())
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+    async def keyboard() -> None:
+        while True:
+            command: str = await loop.run_in_executor(None, sys.stdin.readline)
+            if not command:
+                command = "QUIT\n"
+            writer.write(command.encode())
+            await writer.drain()
+            if command.strip().upper() == "QUIT":
+                return None
+
+    keyboard_task: asyncio.Task = asyncio.create_task(keyboard())
+    while line := await reader.readline():
+        print(line.decode(), end="")
+    keyboard_task.cancel()
+    writer.close()
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Battleship over the network.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="run the server")
+    serve_parser.add_argument("--rows", type=int, default=10)
+    serve_parser.add_argument("--columns", type=int, default=10)
+    serve_parser.add_argument("--fleet", choices=sorted(FLEETS), default="standard")
+    play_parser = commands.add_parser("play", help="play on a server")
+    play_parser.add_argument("--name", default="player")
+    bots_parser = commands.add_parser("bots", help="run computer clients against a server")
+    bots_parser.add_argument("--clients", type=int, default=2)
+    bots_parser.add_argument("--games", type=int, default=1, help="games of each client")
+    bots_parser.add_argument("--strategy", choices=sorted(battleship.STRATEGIES), default="probability")
+    bots_parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    try:
+        if args.command == "serve":
+            grid: Grid = Grid(args.rows, args.columns, FLEETS[args.fleet])
+            asyncio.run(serve(args.host, args.port, grid))
+        elif args.command == "play":
+            asyncio.run(play_interactive(args.host, args.port, args.name))
+        else:
+            results: Counter = asyncio.run(
+                run_bots(args.clients, args.host, args.port, args.strategy, args.games, args.seed)
+            )
+            print(dict(results))
+    except KeyboardInterrupt:
+        pass
+    return None
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+benchmark.py
+
+Plays the hangman solver against every word of the dictionary
+and reports its quality and speed:
+    - win rate and mean number of wrong guesses (overall and per word length);
+    - throughput in games per second;
+    - p50/p99 latency of a single guess, in wall-clock and CPU time
+      (the CPU time leaves out the time the worker was preempted).
+
+The dictionary is sharded across a pool of worker processes and the
+results are written to a JSON file, so that solver speed and quality
+can be compared between releases.
+
+Usage:
+    python benchmark.py [--workers N] [--limit N] [--output results.json]
+
+@author: Savvas Chanlaridis
+@version: v2026-10-18
+"""
+
+import argparse
+import gc
+import json
+import os
+import pathlib
+import platform
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter, strftime, thread_time
+from typing import *
+
+import hangman
+
+DEFAULT_WORDS: pathlib.Path = pathlib.Path(__file__).with_name("words.txt")
+
+# Per worker process state, set by _init_worker
+_solver: Optional[hangman.HangmanSolver] = None
+
+
+class ShardResult(NamedTuple):
+    # word length -> [games, wins, wrong guesses]
+    by_length: Dict[int, List[int]]
+    # latency of every guess in seconds (array of doubles, as bytes)
+    latencies: bytes
+    # CPU time of every guess in seconds (array of doubles, as bytes)
+    cpu_times: bytes
+    elapsed_sec: float
+
+
+def _init_worker(words_file: str) -> None:
+    global _solver
+    _solver = hangman.HangmanSolver(hangman.load_words(words_file))
+    _solver.prepare()
+    # The solver tables live as long as the worker: keep them out of the
+    # garbage collector, whose full collections would show up as latency
+    gc.collect()
+    gc.freeze()
+    return None
+
+
+def _play_shard(words: Sequence[str], max_tries: int) -> ShardResult:
+    """
+    Plays every word of the shard with the worker's solver.
+    """
+    assert _solver is not None, "worker was not initialized"
+    solver = _solver
+    latencies = array("d")
+    cpu_times = array("d")
+    by_length: Dict[int, List[int]] = {}
+
+    start = perf_counter()
+    for word in words:
+        engine = hangman.HangmanEngine(word, max_tries)
+        while not engine.is_over:
+            t0, c0 = perf_counter(), thread_time()
+            letter = solver(engine)
+            latencies.append(perf_counter() - t0)
+            cpu_times.append(thread_time() - c0)
+            if engine.guess(letter) > hangman.GUESS_MISS:
+                raise RuntimeError(
+                    "solver played an invalid letter {!r} on {}".format(letter, word)
+                )
+        counts = by_length.setdefault(len(word), [0, 0, 0])
+        counts[0] += 1
+        counts[1] += engine.is_won
+        counts[2] += engine.tries
+    elapsed_sec = perf_counter() - start
+    return ShardResult(
+        by_length, latencies.tobytes(), cpu_times.tobytes(), elapsed_sec
+    )
+
+
+def _percentile(sorted_values: Sequence[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(q / 100 * len(sorted_values)))
+    return sorted_values[idx]
+
+
+def run_benchmark(
+    words_file: Union[str, pathlib.Path] = DEFAULT_WORDS,
+    workers: Optional[int] = None,
+    shards_per_worker: int = 4,
+    limit: Optional[int] = None,
+    max_tries: int = hangman.MAX_TRIES,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Plays the solver against every word of the dictionary (or against
+    limit random words of it) and returns the report as a dictionary.
+    """
+    words: List[str] = list(hangman.load_words(words_file))
+    if limit is not None and limit < len(words):
+        words = random.Random(seed).sample(words, limit)
+    workers = workers or os.cpu_count() or 1
+    # Interleaved shards, so that every shard gets a similar mix of lengths
+    n_shards = min(len(words), workers * shards_per_worker) or 1
+    shards = [words[i::n_shards] for i in range(n_shards)]
+
+    start = perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(str(words_file),)
+    ) as executor:
+        results = list(executor.map(_play_shard, shards, [max_tries] * n_shards))
+    wall_sec = perf_counter() - start
+
+    by_length: Dict[int, List[int]] = {}
+    latencies = array("d")
+    cpu_times = array("d")
+    for result in results:
+        for length, counts in result.by_length.items():
+            total = by_length.setdefault(length, [0, 0, 0])
+            for i, count in enumerate(counts):
+                total[i] += count
+        latencies.frombytes(result.latencies)
+        cpu_times.frombytes(result.cpu_times)
+    sorted_latencies = sorted(latencies)
+    sorted_cpu_times = sorted(cpu_times)
+
+    games = sum(counts[0] for counts in by_length.values())
+    wins = sum(counts[1] for counts in by_length.values())
+    wrong_guesses = sum(counts[2] for counts in by_length.values())
+    return {
+        "timestamp": strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "words_file": str(words_file),
+        "workers": workers,
+        "max_tries": max_tries,
+        "games": games,
+        "wins": wins,
+        "win_rate": wins / games if games else 0.0,
+        "mean_wrong_guesses": wrong_guesses / games if games else 0.0,
+        "wall_sec": wall_sec,
+        "games_per_sec": games / wall_sec if wall_sec else 0.0,
+        "guesses": len(sorted_latencies),
+        "guess_latency_ms": {
+            "mean": 1e3 * sum(sorted_latencies) / len(sorted_latencies)
+            if sorted_latencies
+            else 0.0,
+            "p50": 1e3 * _percentile(sorted_latencies, 50),
+            "p99": 1e3 * _percentile(sorted_latencies, 99),
+            "max": 1e3 * sorted_latencies[-1] if sorted_latencies else 0.0,
+        },
+        "guess_cpu_ms": {
+            "mean": 1e3 * sum(sorted_cpu_times) / len(sorted_cpu_times)
+            if sorted_cpu_times
+            else 0.0,
+            "p50": 1e3 * _percentile(sorted_cpu_times, 50),
+            "p99": 1e3 * _percentile(sorted_cpu_times, 99),
+            "max": 1e3 * sorted_cpu_times[-1] if sorted_cpu_times else 0.0,
+        },
+        "by_length": {
+            str(length): {
+                "games": counts[0],
+                "wins": counts[1],
+                "win_rate": counts[1] / counts[0],
+                "mean_wrong_guesses": counts[2] / counts[0],
+            }
+            for length, counts in sorted(by_length.items())
+        },
+    }
+
+
+def display_report(report: Dict[str, Any]) -> None:
+
+    print("-" * 40)
+    print("Games played    : {}".format(report["games"]))
+    print("Win rate        : {:.2%}".format(report["win_rate"]))
+    print("Wrong guesses   : {:.3f} (mean)".format(report["mean_wrong_guesses"]))
+    print(
+        "Throughput      : {:.0f} games/s ({} workers)".format(
+            report["games_per_sec"], report["workers"]
+        )
+    )
+    print(
+        "Guess latency   : p50 {p50:.3f} ms, p99 {p99:.3f} ms, max {max:.3f} ms".format(
+            **report["guess_latency_ms"]
+        )
+    )
+    print(
+        "Guess CPU time  : p50 {p50:.3f} ms, p99 {p99:.3f} ms, max {max:.3f} ms".format(
+            **report["guess_cpu_ms"]
+        )
+    )
+    print("-" * 40)
+    print("Length\tGames\tWin rate\tWrong guesses")
+    for length, stats in report["by_length"].items():
+        print(
+            "{}\t{}\t{:.2%}\t\t{:.3f}".format(
+                length, stats["games"], stats["win_rate"], stats["mean_wrong_guesses"]
+            )
+        )
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the hangman solver.")
+    parser.add_argument("--words", default=str(DEFAULT_WORDS), help="dictionary file")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    parser.add_argument(
+        "--limit", type=int, default=None, help="play only this many random words"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed used with --limit")
+    parser.add_argument(
+        "--output", default="hangman_benchmark.json", help="JSON file of the results"
+    )
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        args.words, workers=args.workers, limit=args.limit, seed=args.seed
+    )
+    display_report(report)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print("Results written to {}".format(args.output))
+    return None
+
+
+if __name__ == "__main__":
+    main()
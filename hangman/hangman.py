@@ -14,16 +14,67 @@ import os
 import random
 from typing import *
 import pathlib
-from time import sleep
+import hashlib
+import math
+from bisect import bisect_left
+from collections import Counter
+from operator import itemgetter
+import mmap
+import struct
+import tempfile
+from time import sleep, perf_counter
+from dataclasses import dataclass, field
+
+try:
+    # The terminal renderer shared by the games (pip install -e <repository root>)
+    from terminal import screen
+except ImportError:
+
+    class _PlainScreen:
+        """
+        Plain output, used when the terminal renderer is not installed.
+        """
+
+        print = staticmethod(print)
+        input = staticmethod(input)
+
+        @staticmethod
+        def clear(delay_sec: Optional[float] = None) -> None:
+            if delay_sec is not None:
+                print("Clearing the monitor...")
+                sleep(delay_sec)
+            os.system("cls" if os.name == "nt" else "clear")
+            return None
+
+        @staticmethod
+        def draw(lines: Iterable[str]) -> None:
+            print("\n".join(lines))
+            return None
+
+    screen = _PlainScreen()  # type: ignore
+
+# Number of wrong guesses allowed before the word seeker loses
+MAX_TRIES: int = 6
+
+# Compiled dictionary format (see compile_words):
+#   header : magic, version, source mtime (ns), size and hash, number of buckets
+#   table  : one (word length, word count, offset, number of bytes) entry per bucket
+#   data   : sorted words of each bucket separated by newlines (ASCII)
+WORD_CACHE_SUFFIX: str = ".idx"
+_WORD_CACHE_MAGIC: bytes = b"HMWI"
+_WORD_CACHE_VERSION: int = 1
+_WORD_CACHE_HEADER = struct.Struct("<4sIQQ16sI")
+_WORD_CACHE_BUCKET = struct.Struct("<IIQQ")
 
 
 def main() -> None:
     # Step 0.0: Load dictionary of valid words
     words = load_words()
+    solver = HangmanSolver(words)
 
     while True:
 
-        # Step 0.1: Greetings and selection of game mode (single or double)
+        # Step 0.1: Greetings and selection of game mode (single, double or computer)
         welcome()
         game_mode = select_game_mode()
 
@@ -38,11 +89,16 @@ def main() -> None:
         # Step 2: Play the game
         if game_mode == "double":
             clear_monitor(delay_sec=2)
-        play_game(word, player_names=player_names(game_mode))
+        names = player_names(game_mode)
+        header = greeting(game_mode, names)
+        if game_mode == "computer":
+            play_game(word, player_names=names, guesser=solver, header=header)
+        else:
+            play_game(word, player_names=names, header=header)
 
         # Step 3: Ask if they want to play again
         while True:
-            play_again: str = input("Do you want to play again? (y/n) ")
+            play_again: str = screen.input("Do you want to play again? (y/n) ")
             if (play_again.lower() == "y") or (play_again.lower() == "yes"):
                 clear_monitor()
                 break
@@ -51,7 +107,7 @@ def main() -> None:
                 clear_monitor(delay_sec=2)
                 return None
             else:
-                print("I didn't understand that!")
+                screen.print("I didn't understand that!")
 
 
 class ModeError(Exception):
@@ -62,56 +118,438 @@ class LengthError(Exception):
     pass
 
 
+class DictionaryError(Exception):
+    pass
+
+
+def hanger_lines(body_parts: Dict[str, str]) -> List[str]:
+
+    return [
+        "\t\t+-----+",
+        "\t\t|     {head}".format(**body_parts),
+        "\t\t|   {left_arm}{torso}{right_arm}".format(**body_parts),
+        "\t\t|    {left_leg} {right_leg}".format(**body_parts),
+        "\t\t|",
+    ]
+
+
 def display_hanger(body_parts: Dict[str, str]) -> None:
 
-    print("\t\t+-----+")
-    print("\t\t|     {head}".format(**body_parts))
-    print("\t\t|   {left_arm}{torso}{right_arm}".format(**body_parts))
-    print("\t\t|    {left_leg} {right_leg}".format(**body_parts))
-    print("\t\t|")
+    screen.print("\n".join(hanger_lines(body_parts)))
     return None
 
 
+def hidden_word_line(hidden_word: str) -> str:
+    return "The word is: {} ({} letters)".format(hidden_word, len(hidden_word))
+
+
 def display_hidden_word(hidden_word: str) -> None:
-    print("The word is: {} ({} letters)".format(hidden_word, len(hidden_word)))
+    screen.print(hidden_word_line(hidden_word))
     return None
 
 
 def clear_monitor(delay_sec: Optional[int] = None) -> None:
     """
-    Clears the terminal window
+    Clears the terminal window (with escape sequences, see terminal.Screen)
     delay_sec : int or None, delay clearing the terminal window
                 by that amount of seconds.
     """
-    if delay_sec is None:
-        if os.name == "nt":  # For Windows
-            os.system("cls")
-        else:  # For Linux/MacOS (name == "posix")
-            os.system("clear")
-    else:
-        print("Clearing the monitor...")
-        if os.name == "nt":
-            sleep(delay_sec)
-            os.system("cls")
-        else:
-            sleep(delay_sec)
-            os.system("clear")
+    screen.clear(delay_sec)
     return None
 
 
-def load_words(file: Union[str, pathlib.Path] = "words.txt") -> List[str]:
+class _MappedBucket(Sequence[str]):
+    """
+    Read-only view of a bucket of the compiled dictionary (see compile_words).
+    Its words have the same length and are separated by '\n', so the i-th
+    word is read from the mmap at a fixed offset, without decoding the others.
+    """
+
+    __slots__ = ("_mm", "_offset", "_length", "_count")
+
+    def __init__(self, mm: mmap.mmap, offset: int, length: int, count: int) -> None:
+        self._mm = mm
+        self._offset = offset
+        self._length = length
+        self._count = count
+        return None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, idx: int) -> str:  # type: ignore[override]
+        if idx < 0:
+            idx += self._count
+        if not 0 <= idx < self._count:
+            raise IndexError("bucket index out of range")
+        start = self._offset + idx * (self._length + 1)
+        return self._mm[start : start + self._length].decode("ascii")
+
+    def decode(self) -> Tuple[str, ...]:
+        """
+        Returns all the words of the bucket.
+        """
+        end = self._offset + self._count * (self._length + 1) - 1
+        return tuple(self._mm[self._offset : end].decode("ascii").split("\n"))
+
+
+class WordIndex:
+    """
+    Indexed dictionary of valid words, built once at load time.
+
+    It keeps:
+        - the sorted (unique) words bucketed by their length, for constant
+          time random selection of a word with a given length and binary
+          search membership tests;
+        - the minimum and maximum word length of the dictionary.
+
+    The buckets of a compiled dictionary are views into its mmap, decoded
+    per length on first use (see load_compiled_words).
+
+    It behaves like a read-only sequence of unique words, so it can be
+    used wherever a plain list of words was used before.
+    """
+
+    def __init__(self, words: Iterable[str]) -> None:
+        buckets: Dict[int, Set[str]] = {}
+        for word in words:
+            buckets.setdefault(len(word), set()).add(word)
+        self._init_buckets(
+            {length: tuple(sorted(bucket)) for length, bucket in buckets.items()}
+        )
+        return None
+
+    @classmethod
+    def from_buckets(cls, buckets: Mapping[int, Sequence[str]]) -> "WordIndex":
+        """
+        Builds an index from words that are already sorted, deduplicated
+        and grouped by their length.
+        """
+        index = cls.__new__(cls)
+        index._init_buckets(buckets)
+        return index
+
+    def _init_buckets(self, buckets: Mapping[int, Sequence[str]]) -> None:
+        self.by_length: Dict[int, Sequence[str]] = {
+            length: buckets[length] for length in sorted(buckets) if buckets[length]
+        }
+        self._decoded: Dict[int, Tuple[str, ...]] = {}
+        self._words: Optional[Tuple[str, ...]] = None
+        self._size: int = sum(len(bucket) for bucket in self.by_length.values())
+        if self.by_length:
+            self.min_length: int = min(self.by_length)
+            self.max_length: int = max(self.by_length)
+        else:
+            self.min_length = 0
+            self.max_length = 0
+        self._stats: Optional["DictionaryStats"] = None
+        return None
+
+    @property
+    def stats(self) -> "DictionaryStats":
+        """
+        Statistics of the dictionary, computed on first access
+        and cached for the lifetime of the index.
+        """
+        if self._stats is None:
+            self._stats = DictionaryStats(self)
+        return self._stats
+
+    @property
+    def words(self) -> Tuple[str, ...]:
+        """
+        All the words, by length then in alphabetical order
+        (decoded on first access).
+        """
+        if self._words is None:
+            self._words = tuple(
+                word for length in self.by_length for word in self.words_of_length(length)
+            )
+        return self._words
+
+    def __contains__(self, word: object) -> bool:
+        if not isinstance(word, str):
+            return False
+        bucket = self.by_length.get(len(word))
+        if bucket is None:
+            return False
+        idx = bisect_left(bucket, word)
+        return idx < len(bucket) and bucket[idx] == word
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[str]:
+        for length in self.by_length:
+            yield from self.words_of_length(length)
+
+    def __getitem__(self, idx: int) -> str:
+        if idx < 0:
+            idx += self._size
+        if 0 <= idx:
+            for bucket in self.by_length.values():
+                if idx < len(bucket):
+                    return bucket[idx]
+                idx -= len(bucket)
+        raise IndexError("word index out of range")
+
+    def words_of_length(self, length: int) -> Tuple[str, ...]:
+        bucket = self.by_length.get(length, ())
+        if isinstance(bucket, tuple):
+            return bucket
+        words = self._decoded.get(length)
+        if words is None:
+            words = self._decoded[length] = cast(_MappedBucket, bucket).decode()
+        return words
+
+    def random_word(self, length: int = 0) -> str:
+        """
+        Returns a random word of the given length.
+        If length is 0, a word of random length is returned.
+        """
+        if length == 0:
+            return self[random.randrange(self._size)]
+        return random.choice(self.by_length[length])
+
+
+class DictionaryStats:
+    """
+    Statistics of a dictionary of valid words:
+        - min_length / max_length : the shortest and longest word length;
+        - length_counts           : the number of words of each length;
+        - letter_counts(length)   : the number of words of that length
+                                    containing each letter.
+
+    Word lengths and counts are computed once from the index;
+    letter counts are computed per length on first request.
+    """
+
+    def __init__(self, index: WordIndex) -> None:
+        self._index = index
+        self.min_length: int = index.min_length
+        self.max_length: int = index.max_length
+        self.length_counts: Dict[int, int] = {
+            length: len(bucket) for length, bucket in index.by_length.items()
+        }
+        self._letter_counts: Dict[int, Dict[str, int]] = {}
+        return None
+
+    def is_valid_length(self, length: int) -> bool:
+        """
+        A valid length is 0 (random length) or the length
+        of at least one word in the dictionary.
+        """
+        return length == 0 or length in self.length_counts
+
+    def letter_counts(self, length: int = 0) -> Dict[str, int]:
+        """
+        Returns the number of words containing each letter, for
+        words of the given length (or for all words if length is 0).
+        """
+        counts = self._letter_counts.get(length)
+        if counts is None:
+            if length == 0:
+                counts = {}
+                for word_length in self.length_counts:
+                    for letter, count in self.letter_counts(word_length).items():
+                        counts[letter] = counts.get(letter, 0) + count
+            else:
+                counter: Counter[str] = Counter()
+                for word in self._index.words_of_length(length):
+                    counter.update(set(word))
+                counts = dict(counter)
+            self._letter_counts[length] = counts
+        return counts
+
 
+def dictionary_stats(dict_: Union[Sequence[str], WordIndex]) -> DictionaryStats:
+    """
+    Returns the (cached) statistics of an indexed dictionary.
+    Plain sequences of words are indexed first, so their statistics
+    are recomputed on every call.
+    """
+    return as_word_index(dict_).stats
+
+
+def as_word_index(dict_: Union[Sequence[str], WordIndex]) -> WordIndex:
+    """
+    Returns dict_ itself if it is already indexed,
+    else builds a WordIndex out of the given words.
+    """
+    if isinstance(dict_, WordIndex):
+        return dict_
+    return WordIndex(dict_)
+
+
+def parse_words(file: Union[str, pathlib.Path] = "words.txt") -> List[str]:
+    """
+    Parses the text file of valid words.
+    Words are separated by '-', words shorter than 3 letters
+    are dropped and every word is upper-cased.
+    Raises DictionaryError on a non-ASCII word, as it could not be guessed.
+    """
     words: List[str] = []
     with open(file) as f:
-        for line in f:
+        for line_number, line in enumerate(f, start=1):
             line_words = line.strip().split("-")
             for word in line_words:
+                if not word.isascii():
+                    raise DictionaryError(
+                        '{}, line {}: "{}" is not an ASCII word'.format(
+                            file, line_number, word
+                        )
+                    )
                 if len(word) >= 3:
                     words.append(word.upper())
     return words
 
 
-def get_lengths(dict_: Sequence[str]) -> Tuple[int, int]:
+def _source_signature(file: Union[str, pathlib.Path]) -> Tuple[int, int, bytes]:
+    """
+    Returns the modification time (ns), size and hash of the source file.
+    """
+    stat = os.stat(file)
+    with open(file, "rb") as f:
+        digest = hashlib.blake2b(f.read(), digest_size=16).digest()
+    return (stat.st_mtime_ns, stat.st_size, digest)
+
+
+def compile_words(
+    file: Union[str, pathlib.Path] = "words.txt",
+    cache_file: Optional[Union[str, pathlib.Path]] = None,
+) -> WordIndex:
+    """
+    Parses the text file of valid words and stores the resulting
+    dictionary in a compiled (binary) file next to it.
+    The compiled dictionary is sorted, deduplicated and bucketed by
+    word length, with an offset table pointing at each bucket.
+    """
+    if cache_file is None:
+        cache_file = str(file) + WORD_CACHE_SUFFIX
+    mtime_ns, size, digest = _source_signature(file)
+    index = WordIndex(parse_words(file))
+
+    table: List[bytes] = []
+    data: List[bytes] = []
+    offset = _WORD_CACHE_HEADER.size + _WORD_CACHE_BUCKET.size * len(index.by_length)
+    for length, bucket in index.by_length.items():
+        blob = "\n".join(bucket).encode("ascii")
+        table.append(_WORD_CACHE_BUCKET.pack(length, len(bucket), offset, len(blob)))
+        data.append(blob)
+        offset += len(blob)
+    header = _WORD_CACHE_HEADER.pack(
+        _WORD_CACHE_MAGIC,
+        _WORD_CACHE_VERSION,
+        mtime_ns,
+        size,
+        digest,
+        len(index.by_length),
+    )
+
+    # Write to a temporary file first, so that concurrent
+    # readers never see a half-written dictionary
+    directory = os.path.dirname(os.path.abspath(cache_file))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=WORD_CACHE_SUFFIX)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(b"".join(table))
+            f.write(b"".join(data))
+        os.replace(tmp_path, cache_file)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return index
+
+
+def load_compiled_words(
+    file: Union[str, pathlib.Path] = "words.txt",
+    cache_file: Optional[Union[str, pathlib.Path]] = None,
+) -> Optional[WordIndex]:
+    """
+    Loads the compiled dictionary of the given text file using mmap:
+    its buckets stay in the mmap until they are used (see WordIndex).
+    It returns None if there is no compiled dictionary, or if it is
+    stale (the modification time or hash of the text file changed).
+    """
+    if cache_file is None:
+        cache_file = str(file) + WORD_CACHE_SUFFIX
+    try:
+        with open(cache_file, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):  # missing or empty file
+        return None
+    try:
+        buckets = _mapped_buckets(mm, file)
+    except BaseException:
+        mm.close()
+        raise
+    if buckets is None:
+        mm.close()
+        return None
+    # The buckets keep the mmap open for the lifetime of the index
+    return WordIndex.from_buckets(buckets)
+
+
+def _mapped_buckets(
+    mm: mmap.mmap, file: Union[str, pathlib.Path]
+) -> Optional[Dict[int, _MappedBucket]]:
+    """
+    Returns the views of the buckets of a compiled dictionary,
+    or None if it is invalid or stale.
+    """
+    if len(mm) < _WORD_CACHE_HEADER.size:
+        return None
+    (
+        magic,
+        version,
+        mtime_ns,
+        size,
+        digest,
+        n_buckets,
+    ) = _WORD_CACHE_HEADER.unpack_from(mm)
+    if magic != _WORD_CACHE_MAGIC or version != _WORD_CACHE_VERSION:
+        return None
+    if (mtime_ns, size, digest) != _source_signature(file):
+        return None
+
+    buckets: Dict[int, _MappedBucket] = {}
+    for i in range(n_buckets):
+        length, count, offset, n_bytes = _WORD_CACHE_BUCKET.unpack_from(
+            mm, _WORD_CACHE_HEADER.size + i * _WORD_CACHE_BUCKET.size
+        )
+        if n_bytes != count * (length + 1) - 1 or offset + n_bytes > len(mm):
+            return None
+        buckets[length] = _MappedBucket(mm, offset, length, count)
+    return buckets
+
+
+def load_words(
+    file: Union[str, pathlib.Path] = "words.txt", use_cache: bool = True
+) -> WordIndex:
+    """
+    Loads the dictionary of valid words.
+    If use_cache is enabled, the compiled dictionary is used when it
+    is up to date, else it is (re)built from the text file.
+    """
+    if not use_cache:
+        return WordIndex(parse_words(file))
+
+    index = load_compiled_words(file)
+    if index is None:
+        try:
+            index = compile_words(file)
+        except OSError:
+            # e.g. read-only directory; fall back to the text file
+            index = WordIndex(parse_words(file))
+    return index
+
+
+def get_lengths(dict_: Union[Sequence[str], WordIndex]) -> Tuple[int, int]:
+
+    if isinstance(dict_, WordIndex):
+        stats = dict_.stats
+        return (stats.min_length, stats.max_length)
 
     current_min: int = 10_000
     current_max: int = 0
@@ -126,68 +564,61 @@ def get_lengths(dict_: Sequence[str]) -> Tuple[int, int]:
 def select_game_mode() -> str:
 
     while True:
-        answer: str = input(
-            "Type 's/S' or 'd/D' for single or double mode respectively: "
+        answer: str = screen.input(
+            "Type 's/S', 'd/D' or 'c/C' for single, double or computer (guesses your word) mode respectively: "
         )
         if answer.lower() == "d":
             return "double"
         elif answer.lower() == "s":
             return "single"
+        elif answer.lower() == "c":
+            return "computer"
         else:
-            print("I didn't understand that...")
+            screen.print("I didn't understand that...")
 
 
-def get_word(mode: str, dict_: Sequence[str], length: int = 0, _tries: int = 1) -> str:
+def get_word(
+    mode: str,
+    dict_: Union[Sequence[str], WordIndex],
+    length: int = 0,
+    _tries: int = 1,
+) -> str:
 
-    if mode == "double":
+    if mode in ("double", "computer"):
         if _tries == 1:
-            return input("Provide the word: ").upper()
+            return screen.input("Provide the word: ").upper()
         else:
-            print("The world is not valid!")
-            return input("Provide a new word: ").upper()
+            screen.print("The world is not valid!")
+            return screen.input("Provide a new word: ").upper()
     elif mode == "single":
+        # The index deduplicates the words of the text file, so that
+        # duplicates do not bias the random selection
+        index: WordIndex = as_word_index(dict_)
+        stats: DictionaryStats = index.stats
         while True:
             try:
                 length = int(
-                    input(
+                    screen.input(
                         "Type '0' for word of random length, else give length of random word (between {} and {}): ".format(
-                            *get_lengths(dict_)
+                            stats.min_length, stats.max_length
                         )
                     )
                 )
-                # assert length in range(*get_lengths(dict_))
-                valid_lengths: List[int] = [
-                    i for i in range(get_lengths(dict_)[0], get_lengths(dict_)[1] + 1)
-                ]
-                valid_lengths.append(0)
-                if length not in valid_lengths:
+                if not stats.is_valid_length(length):
                     raise LengthError
 
-                if length == 0:
-                    return random.choice(dict_)
-                else:
-                    # Use a set to avoid duplicate words in text file
-                    # biasing the random selection
-                    candidate_words: Set[str] = set()
-                    for word in dict_:
-                        if len(word) == length:
-                            candidate_words.add(word)
-                    # as of v3.9, Python has officially deprecated random.choice() working on sets,
-                    # with the official guidance being to explicitly convert the set to a list or tuple before passing it in
-                    return random.choice(tuple(candidate_words))
+                return index.random_word(length)
             except LengthError:
-                print(
+                screen.print(
                     "length must be an integer between {} and {}".format(
-                        *get_lengths(dict_)
+                        stats.min_length, stats.max_length
                     )
                 )
-            # except AssertionError:
-            #     print("length must be between {} and {}".format(*get_lengths(dict_)))
     else:
         raise ModeError("game mode error")
 
 
-def check_word(word: str, dict_: Sequence[str]) -> bool:
+def check_word(word: str, dict_: Union[Sequence[str], WordIndex]) -> bool:
     """
     Checks if the given word is valid.
     A valid word is a word that exists in
@@ -201,36 +632,60 @@ def check_word(word: str, dict_: Sequence[str]) -> bool:
 
 def player_names(mode: str) -> Tuple[str, str]:
 
-    print("-" * 40)
-    print("\t Game Mode: {}".format(mode.capitalize()))
-    print("-" * 40)
+    screen.print("-" * 40)
+    screen.print("\t Game Mode: {}".format(mode.capitalize()))
+    screen.print("-" * 40)
     if mode == "single":
-        player_1: str = input("Name of player: ").capitalize()
+        player_1: str = screen.input("Name of player: ").capitalize()
         player_2: str = "Computer"
         clear_monitor()
-        print("Good luck {}!".format(player_1))
-        print("=" * 40)
         return (player_1, player_2)
     elif mode == "double":
-        player_1 = input("Name of player 1 (word seeker): ").capitalize()
-        player_2 = input("Name of player 2 (word provider): ").capitalize()
+        player_1 = screen.input("Name of player 1 (word seeker): ").capitalize()
+        player_2 = screen.input("Name of player 2 (word provider): ").capitalize()
         clear_monitor()
-        print("Good luck {}, {}!".format(player_1, player_2))
-        print("=" * 40)
         return (player_1, player_2)
+    elif mode == "computer":
+        player_1 = "Computer"
+        player_2 = screen.input("Name of player (word provider): ").capitalize()
+        clear_monitor()
+        return (player_1, player_2)
+    else:
+        raise ModeError("game mode error")
+
+
+def greeting(mode: str, names: Tuple[str, str]) -> List[str]:
+    """
+    Returns the lines greeting the human players, drawn above the hanger.
+    """
+    if mode == "single":
+        line = "Good luck {}!".format(names[0])
+    elif mode == "double":
+        line = "Good luck {}, {}!".format(*names)
+    elif mode == "computer":
+        line = "Good luck {}!".format(names[1])
     else:
         raise ModeError("game mode error")
+    return [line, "=" * 40]
 
 
-def display_tries_left(tries: int, max_tries: int = 6) -> None:
+def tries_left_line(tries: int, max_tries: int = MAX_TRIES) -> str:
+    return "{} tries left".format(max_tries - tries)
 
-    print("{} tries left".format(max_tries - tries))
+
+def display_tries_left(tries: int, max_tries: int = MAX_TRIES) -> None:
+
+    screen.print(tries_left_line(tries, max_tries))
     return None
 
 
+def used_letters_line(letters: List[str]) -> str:
+    return "Chosen letters: {}".format(letters)
+
+
 def display_used_letters(letters: List[str]) -> None:
 
-    print("Chosen letters:", letters)
+    screen.print(used_letters_line(letters))
     return None
 
 
@@ -238,93 +693,581 @@ def get_new_letter(chosen_letters: List[str]) -> str:
     # Check if letter has been used before
     letter_is_valid: bool = False
     while not letter_is_valid:
-        letter: str = input("Guess letter: ").upper()
+        letter: str = screen.input("Guess letter: ").upper()
         if not letter.isalpha():
-            print("All letters must be alphabets!")
+            screen.print("All letters must be alphabets!")
         elif len(letter) > 1:
-            print("Letter must be a single character!")
+            screen.print("Letter must be a single character!")
         elif letter in chosen_letters:
-            print("You've chosen this letter already!")
+            screen.print("You've chosen this letter already!")
         else:
             letter_is_valid = True
     return letter
 
 
-def play_game(word: str, player_names: Tuple[str, str], max_tries: int = 6) -> None:
+# Result codes of HangmanEngine.guess
+GUESS_HIT: int = 0  # letter is in the word
+GUESS_MISS: int = 1  # letter is not in the word
+GUESS_REPEATED: int = 2  # letter has been guessed before
+GUESS_INVALID: int = 3  # not a single letter A-Z
+GUESS_GAME_OVER: int = 4  # the game has already ended
+
+_ORD_A: int = ord("A")
+
+
+class HangmanEngine:
+    """
+    Headless state of a single hangman game (no terminal I/O).
+
+    The masked word is kept in a bytearray that is updated in place,
+    and the guessed letters in a bitmask (bit 0 for 'A', bit 25 for 'Z').
+    """
+
+    __slots__ = (
+        "word",
+        "max_tries",
+        "tries",
+        "guessed",
+        "hidden",
+        "_masked",
+        "_positions",
+    )
+
+    def __init__(self, word: str, max_tries: int = MAX_TRIES) -> None:
+        self.word: str = word
+        self.max_tries: int = max_tries
+        self.tries: int = 0  # number of wrong guesses
+        self.guessed: int = 0  # bitmask of guessed letters
+        self.hidden: int = len(word)  # number of letters still hidden
+        self._masked: bytearray = bytearray(b"-" * len(word))
+        # Positions of each letter of the word, indexed by letter bit
+        self._positions: Dict[int, List[int]] = {}
+        for idx, char in enumerate(word):
+            self._positions.setdefault(ord(char) - _ORD_A, []).append(idx)
+        return None
+
+    @property
+    def masked_word(self) -> str:
+        return self._masked.decode("ascii")
+
+    @property
+    def tries_left(self) -> int:
+        return self.max_tries - self.tries
+
+    @property
+    def is_won(self) -> bool:
+        return self.hidden == 0
+
+    @property
+    def is_lost(self) -> bool:
+        return self.tries >= self.max_tries
+
+    @property
+    def is_over(self) -> bool:
+        return self.hidden == 0 or self.tries >= self.max_tries
+
+    @property
+    def guessed_letters(self) -> List[str]:
+        return [chr(_ORD_A + i) for i in range(26) if self.guessed >> i & 1]
+
+    def guess(self, letter: str) -> int:
+        """
+        Plays a letter and returns one of the GUESS_* result codes.
+        Repeated and invalid guesses do not cost a try.
+        """
+        if self.hidden == 0 or self.tries >= self.max_tries:
+            return GUESS_GAME_OVER
+        if len(letter) != 1:
+            return GUESS_INVALID
+        bit = ord(letter) - _ORD_A
+        if not 0 <= bit < 26:
+            bit -= 32  # lower case letter
+            if not 0 <= bit < 26:
+                return GUESS_INVALID
+        if self.guessed >> bit & 1:
+            return GUESS_REPEATED
+        self.guessed |= 1 << bit
+
+        positions = self._positions.get(bit)
+        if positions is None:
+            self.tries += 1
+            return GUESS_MISS
+        code = _ORD_A + bit
+        for idx in positions:
+            self._masked[idx] = code
+        self.hidden -= len(positions)
+        return GUESS_HIT
+
+
+# A strategy returns the next letter to guess, given the current game.
+# Stateful strategies can detect the start of a new game by engine.guessed == 0.
+Strategy = Callable[[HangmanEngine], str]
+
+
+@dataclass
+class SimulationResult:
+    games: int = 0
+    wins: int = 0
+    wrong_guesses: int = 0  # total over all games
+    elapsed_sec: float = 0.0
+    # (word, won, number of wrong guesses) of every game
+    records: List[Tuple[str, bool, int]] = field(default_factory=list)
+
+    @property
+    def losses(self) -> int:
+        return self.games - self.wins
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def mean_wrong_guesses(self) -> float:
+        return self.wrong_guesses / self.games if self.games else 0.0
+
+    @property
+    def games_per_sec(self) -> float:
+        return self.games / self.elapsed_sec if self.elapsed_sec else 0.0
+
+
+def make_frequency_strategy(dict_: Union[Sequence[str], WordIndex]) -> Strategy:
+    """
+    Returns a simple strategy that guesses letters in decreasing order
+    of the number of dictionary words (of the secret word's length)
+    containing them.
+    """
+    stats = dictionary_stats(dict_)
+    orders: Dict[int, List[str]] = {}
+
+    def strategy(engine: HangmanEngine) -> str:
+        length = len(engine.word)
+        order = orders.get(length)
+        if order is None:
+            counts = stats.letter_counts(length) or stats.letter_counts()
+            order = sorted(counts, key=counts.__getitem__, reverse=True)
+            order += [
+                chr(_ORD_A + i) for i in range(26) if chr(_ORD_A + i) not in counts
+            ]
+            orders[length] = order
+        for letter in order:
+            if not engine.guessed >> (ord(letter) - _ORD_A) & 1:
+                return letter
+        raise RuntimeError("no letters left to guess")
+
+    return strategy
+
+
+def simulate(
+    words: Union[Sequence[str], WordIndex],
+    strategy: Strategy,
+    n_games: Optional[int] = None,
+    max_tries: int = MAX_TRIES,
+    seed: Optional[int] = None,
+) -> SimulationResult:
+    """
+    Plays games without any terminal I/O.
+    If n_games is None every word is played once (in order),
+    else n_games words are drawn at random from words.
+    Guesses that the engine rejects (invalid or repeated letters)
+    count as wrong guesses, so a faulty strategy cannot loop forever.
+    """
+    if n_games is None:
+        secret_words: Iterable[str] = words
+    else:
+        rng = random.Random(seed)
+        secret_words = (rng.choice(words) for _ in range(n_games))
+
+    result = SimulationResult()
+    start = perf_counter()
+    for word in secret_words:
+        engine = HangmanEngine(word, max_tries)
+        while engine.hidden and engine.tries < max_tries:
+            if engine.guess(strategy(engine)) > GUESS_MISS:
+                engine.tries += 1
+        won = engine.hidden == 0
+        result.games += 1
+        result.wins += won
+        result.wrong_guesses += engine.tries
+        result.records.append((word, won, engine.tries))
+    result.elapsed_sec = perf_counter() - start
+    return result
+
 
-    # Put characters of word into a list
-    word_characters: List[str] = [char for char in word]
-    hidden_word_characters: List[str] = ["-" for _ in word]
-    # Initialize hidden word
-    hidden_word: str = "-" * len(word)
+class _LengthTable:
+    """
+    Precomputed letter bitsets for the words of one length.
+    Bit i of a bitset refers to the i-th word of the length bucket.
+    The letters of each position are also kept as a column of bytes,
+    so that the table can be narrowed to a few of its words cheaply.
+    """
+
+    __slots__ = ("words", "all_words", "columns", "at_position", "contains")
+
+    def __init__(
+        self,
+        words: Tuple[str, ...],
+        length: int,
+        columns: Optional[List[Optional[bytes]]] = None,
+    ) -> None:
+        self.words: Tuple[str, ...] = words
+        self.all_words: int = (1 << len(words)) - 1
+        # columns[p]: the letter at position p of every word (None if not indexed)
+        if columns is None:
+            columns = [
+                "".join([word[p] for word in words]).encode("ascii")
+                for p in range(length)
+            ]
+        self.columns: List[Optional[bytes]] = columns
+        # at_position[p][c]: words with letter c at position p
+        self.at_position: List[List[int]] = [[0] * 26 for _ in range(length)]
+        # contains[c]: words containing letter c at any indexed position
+        self.contains: List[int] = [0] * 26
+
+        # All the indexed columns at once, reversed: bit k * n + i of the
+        # bitset of a letter is the i-th word at the k-th indexed position
+        n = len(words)
+        positions = [p for p in range(length) if columns[p] is not None]
+        joined = b"".join([columns[p] for p in positions])
+        reversed_joined = joined[::-1]
+        for c in range(26):
+            if _ORD_A + c not in joined:
+                continue
+            bits = int(reversed_joined.translate(_BIT_TABLES[c]), 2)
+            for k, p in enumerate(positions):
+                at_position = bits >> (k * n) & self.all_words
+                self.at_position[p][c] = at_position
+                self.contains[c] |= at_position
+        return None
+
+    def narrowed(self, indices: List[int], positions: List[int]) -> "_LengthTable":
+        """
+        Returns the table of the words at the given indices (at least two),
+        indexed at the given positions only.
+        """
+        pick = itemgetter(*indices)
+        columns: List[Optional[bytes]] = [None] * len(self.columns)
+        for p in positions:
+            column = self.columns[p]
+            assert column is not None, "position %i was not indexed" % p
+            columns[p] = bytes(pick(column))
+        return _LengthTable(pick(self.words), len(columns), columns)
+
+
+# _BIT_TABLES[c]: translation of bytes, mapping letter c to b"1" and the rest to b"0"
+_BIT_TABLES: List[bytes] = [
+    bytes(ord("1") if code == _ORD_A + c else ord("0") for code in range(256))
+    for c in range(26)
+]
+
+
+def _bit_indices(bits: int) -> List[int]:
+    """
+    Returns the indices of the set bits of bits, found by scanning its
+    binary digits (faster than clearing the bits one by one).
+    """
+    digits = bin(bits)[:1:-1]  # bit 0 first
+    indices: List[int] = []
+    i = digits.find("1")
+    while i >= 0:
+        indices.append(i)
+        i = digits.find("1", i + 1)
+    return indices
+
+
+class HangmanSolver:
+    """
+    Computer guesser for hangman.
+
+    It keeps the set of dictionary words consistent with the masked word
+    and the excluded letters as a bitset, narrowed after every guess with
+    precomputed per-position letter bitsets (no refiltering of words).
+    The next letter is the one that maximizes the expected information,
+    i.e. the entropy of the partition of the candidates by the positions
+    where the letter would be revealed.
+
+    While many candidates are left, only the hit/miss split of each
+    letter is scored; once at most COMPACT_LIMIT are left, they are
+    re-indexed into narrow bitsets and scored by the exact partition.
+    Decisions are memoized by (masked word, guessed letters), as that
+    state fully determines the candidates.
+
+    An instance can be used as a Strategy for simulate().
+    """
+
+    COMPACT_LIMIT: ClassVar[int] = 256
+    MEMO_SIZE: ClassVar[int] = 1 << 18
+
+    def __init__(self, dict_: Union[Sequence[str], WordIndex]) -> None:
+        self.index: WordIndex = as_word_index(dict_)
+        self._tables: Dict[int, _LengthTable] = {}
+        # Best letter per (masked word, guessed letters)
+        self._memo: Dict[Tuple[str, int], str] = {}
+        self._engine: Optional[HangmanEngine] = None
+        self._table: Optional[_LengthTable] = None
+        self.candidates: int = 0  # bitset of candidate words
+        self.guessed: int = 0  # bitmask of guessed letters
+        self.hidden: List[int] = []  # positions not revealed yet
+        self.masked: List[str] = []  # the masked word as seen by the solver
+        return None
+
+    def _length_table(self, length: int) -> _LengthTable:
+        table = self._tables.get(length)
+        if table is None:
+            table = _LengthTable(self.index.words_of_length(length), length)
+            self._tables[length] = table
+        return table
+
+    def prepare(self) -> None:
+        """
+        Builds the table and the opening guess of every word length up front,
+        so that the first game of each length does not pay for them.
+        """
+        for length in self.index.stats.length_counts:
+            self.new_game(length)
+            self.best_letter()
+        return None
+
+    def new_game(self, length: int) -> None:
+        self._table = self._length_table(length)
+        self.candidates = self._table.all_words
+        self.guessed = 0
+        self.hidden = list(range(length))
+        self.masked = ["-"] * length
+        return None
+
+    @property
+    def n_candidates(self) -> int:
+        return self.candidates.bit_count()
+
+    def candidate_words(self) -> List[str]:
+        assert self._table is not None, "new_game() must be called first"
+        words = self._table.words
+        return [words[i] for i in _bit_indices(self.candidates)]
+
+    def update(self, letter: str, positions: Sequence[int]) -> None:
+        """
+        Narrows the candidates after letter was revealed at the given
+        positions (no positions means that the guess missed).
+        """
+        assert self._table is not None, "new_game() must be called first"
+        c = ord(letter) - _ORD_A
+        self.guessed |= 1 << c
+        if not positions:
+            self.candidates &= ~self._table.contains[c]
+            self._compact()
+            return None
+        for p in positions:
+            self.masked[p] = letter
+        at_position = self._table.at_position
+        candidates = self.candidates
+        for p in self.hidden:
+            if p in positions:
+                candidates &= at_position[p][c]
+            else:
+                candidates &= ~at_position[p][c]
+        self.candidates = candidates
+        self.hidden = [p for p in self.hidden if p not in positions]
+        self._compact()
+        return None
+
+    def _compact(self) -> None:
+        """
+        Re-indexes the few remaining candidates into a table of their own,
+        so that the bitsets used from now on are as narrow as possible.
+        Only the hidden positions are indexed (the others are known), from
+        the letter columns of the current table.
+        """
+        assert self._table is not None
+        n = self.candidates.bit_count()
+        if 2 <= n <= self.COMPACT_LIMIT and len(self._table.words) > 2 * n:
+            self._table = self._table.narrowed(
+                _bit_indices(self.candidates), self.hidden
+            )
+            self.candidates = self._table.all_words
+        return None
+
+    def _information(self, c: int, exact: bool) -> Tuple[float, int]:
+        """
+        Returns the entropy of the partition of the candidates by the
+        revealed positions of letter c (only by hit/miss if not exact),
+        and the number of candidates that contain it.
+        """
+        assert self._table is not None
+        candidates = self.candidates
+        hits = candidates & self._table.contains[c]
+        if not hits:
+            return (0.0, 0)
+        groups = [hits]
+        if exact:
+            at_position = self._table.at_position
+            for p in self.hidden:
+                bits = hits & at_position[p][c]
+                if not bits or bits == hits:
+                    continue  # the position does not split the candidates
+                split: List[int] = []
+                for group in groups:
+                    inside = group & bits
+                    if inside and inside != group:
+                        split.append(inside)
+                        split.append(group ^ inside)
+                    else:
+                        split.append(group)
+                groups = split
+
+        n = candidates.bit_count()
+        n_hits = hits.bit_count()
+        sizes = [group.bit_count() for group in groups]
+        if n_hits < n:
+            sizes.append(n - n_hits)
+        entropy = -sum(size / n * math.log2(size / n) for size in sizes)
+        return (entropy, n_hits)
+
+    def best_letter(self) -> str:
+        """
+        Returns the unguessed letter with the maximum expected information
+        (ties are broken by the number of candidates containing it).
+        """
+        assert self._table is not None, "new_game() must be called first"
+        key = ("".join(self.masked), self.guessed)
+        letter = self._memo.get(key)
+        if letter is None:
+            letter = self._best_letter()
+            if len(self._memo) >= self.MEMO_SIZE:
+                self._memo.clear()
+            self._memo[key] = letter
+        return letter
+
+    def _best_letter(self) -> str:
+        assert self._table is not None
+        n = self.candidates.bit_count()
+        if n == 1:
+            word = self._table.words[self.candidates.bit_length() - 1]
+            return word[self.hidden[0]]
+
+        best: Tuple[float, int] = (-1.0, -1)
+        best_letter: Optional[str] = None
+        if n > 1:
+            exact = len(self._table.words) <= self.COMPACT_LIMIT
+            for c in range(26):
+                if self.guessed >> c & 1:
+                    continue
+                score = self._information(c, exact)
+                if score > best:
+                    best, best_letter = score, chr(_ORD_A + c)
+        if best_letter is None or best[1] == 0:
+            # No candidate left (word missing from the dictionary):
+            # fall back to the most frequent unguessed letter
+            counts = self.index.stats.letter_counts(len(self.masked))
+            unguessed = [
+                chr(_ORD_A + c) for c in range(26) if not self.guessed >> c & 1
+            ]
+            best_letter = max(unguessed, key=lambda letter: counts.get(letter, 0))
+        return best_letter
+
+    def __call__(self, engine: HangmanEngine) -> str:
+        """
+        Strategy interface: syncs the solver with the letters the engine
+        has seen since the last call and returns the next letter.
+        """
+        if engine is not self._engine or engine.guessed == 0:
+            self._engine = engine
+            self.new_game(len(engine.word))
+        new_letters = engine.guessed & ~self.guessed
+        if new_letters:
+            masked = engine.masked_word
+            for c in range(26):
+                if new_letters >> c & 1:
+                    letter = chr(_ORD_A + c)
+                    self.update(
+                        letter,
+                        [p for p in self.hidden if masked[p] == letter],
+                    )
+        return self.best_letter()
+
+
+# Body part drawn after each wrong guess
+_BODY_PARTS: Tuple[Tuple[str, str], ...] = (
+    ("head", "o"),
+    ("torso", "+"),
+    ("left_arm", "--"),
+    ("right_arm", "--"),
+    ("left_leg", "/"),
+    ("right_leg", "\\"),
+)
+
+
+def play_game(
+    word: str,
+    player_names: Tuple[str, str],
+    max_tries: int = MAX_TRIES,
+    guesser: Optional[Strategy] = None,
+    header: Sequence[str] = (),
+) -> None:
+    """
+    Plays a game of hangman in the terminal.
+    Letters are asked from the word seeker, unless a guesser
+    (e.g. a HangmanSolver) is given to play in their place.
+    The header lines (e.g. the greeting) are drawn on top of every frame.
+    """
+
+    engine = HangmanEngine(word, max_tries)
     # Used for updating hanger function
     body_parts: Dict[str, str] = dict(
         head="", torso="", left_arm="  ", right_arm="  ", left_leg="", right_leg=""
     )
     # Used for showing played letters
     chosen_letters: List[str] = []
-    # Number of tries
-    tries: int = 0
 
-    while (hidden_word.count("-") > 0) and (tries < max_tries):
-        display_hanger(body_parts)
-        display_tries_left(tries)
-        display_hidden_word(hidden_word)
-        display_used_letters(chosen_letters)
+    while not engine.is_over:
+        # One frame per guess: only its lines that changed are redrawn
+        screen.draw(
+            list(header)
+            + hanger_lines(body_parts)
+            + [
+                tries_left_line(engine.tries, max_tries),
+                hidden_word_line(engine.masked_word),
+                used_letters_line(chosen_letters),
+            ]
+        )
 
-        letter = get_new_letter(chosen_letters)
+        if guesser is None:
+            letter = get_new_letter(chosen_letters)
+        else:
+            letter = guesser(engine)
+            screen.print("{} guesses: {}".format(player_names[0], letter))
+            sleep(1)
         chosen_letters.append(letter)
-        clear_monitor()
 
-        if letter in word:
-            for idx, char in enumerate(word_characters):
-                if char == letter:
-                    hidden_word_characters[idx] = char
-            # Re-initialize hidden word
-            hidden_word = ""
-            for element in hidden_word_characters:
-                hidden_word = hidden_word + element
-        else:
-            tries += 1
-            if tries == 1:
-                body_parts.update({"head": "o"})
-            elif tries == 2:
-                body_parts.update({"torso": "+"})
-            elif tries == 3:
-                body_parts.update({"left_arm": "--"})
-            elif tries == 4:
-                body_parts.update({"right_arm": "--"})
-            elif tries == 5:
-                body_parts.update({"left_leg": "/"})
-            else:
-                body_parts.update({"right_leg": "\\"})
-
-    if tries >= max_tries:
-        display_hanger(body_parts)
-        print('{} wins! The word was "{}"'.format(player_names[1].capitalize(), word))
-    elif hidden_word.count("-") == 0:
-        display_hanger(body_parts)
-        print('{} wins! The word was "{}"'.format(player_names[0].capitalize(), word))
+        if engine.guess(letter) == GUESS_MISS:
+            body_parts.update(
+                [_BODY_PARTS[min(engine.tries, len(_BODY_PARTS)) - 1]]
+            )
+
+    screen.draw(list(header) + hanger_lines(body_parts))
+    if engine.is_lost:
+        screen.print('{} wins! The word was "{}"'.format(player_names[1].capitalize(), word))
+    elif engine.is_won:
+        screen.print('{} wins! The word was "{}"'.format(player_names[0].capitalize(), word))
     return None
 
 
 def goodbye() -> None:
 
-    print("\t" + "#" * 30)
-    print("\t#" + " " * 28 + "#")
-    print("\t#" + " " * 10 + "GOODBYE!" + " " * 10 + "#")
-    print("\t#" + " " * 28 + "#")
-    print("\t" + "#" * 30)
+    screen.print("\t" + "#" * 30)
+    screen.print("\t#" + " " * 28 + "#")
+    screen.print("\t#" + " " * 10 + "GOODBYE!" + " " * 10 + "#")
+    screen.print("\t#" + " " * 28 + "#")
+    screen.print("\t" + "#" * 30)
     return None
 
 
 def welcome() -> None:
 
-    print("\t" + "#" * 30)
-    print("\t#" + " " * 28 + "#")
-    print("\t#" + " " * 5 + "WELCOME TO HANGMAN" + " " * 5 + "#")
-    print("\t#" + " " * 28 + "#")
-    print("\t" + "#" * 30)
+    screen.print("\t" + "#" * 30)
+    screen.print("\t#" + " " * 28 + "#")
+    screen.print("\t#" + " " * 5 + "WELCOME TO HANGMAN" + " " * 5 + "#")
+    screen.print("\t#" + " " * 28 + "#")
+    screen.print("\t" + "#" * 30)
     return None
 
 
@@ -5,6 +5,19 @@ A simple Python approach to play the classic game peg solitaire
 @version: v2021-12-04
 """
 
+import argparse
+import bisect
+import functools
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
 
 def create_board():
     """
@@ -61,315 +74,715 @@ def create_board():
     return full_grid_coordinates, full_grid_values, forbidden_coordinates
 
 
-def display_board(board_values):
+# Bitboard representation of the board:
+# bit (width * row + column) is set when that hole has a peg, where row 0 is A
+# and column 0 is 1. For the English board this is the same index as in the
+# lists of create_board.
+
+# Direction -> (row step, column step, name)
+ORTHOGONAL_DIRECTIONS = {
+    "U": (-1, 0, "up"),
+    "D": (1, 0, "down"),
+    "R": (0, 1, "right"),
+    "L": (0, -1, "left"),
+}
+
+# Triangular boards are stored skewed (row r holds columns 1 to r + 1),
+# so that their six directions are also fixed steps on the grid
+TRIANGULAR_DIRECTIONS = {
+    "UL": (-1, -1, "up-left"),
+    "UR": (-1, 0, "up-right"),
+    "DL": (1, 0, "down-left"),
+    "DR": (1, 1, "down-right"),
+    "R": (0, 1, "right"),
+    "L": (0, -1, "left"),
+}
+
+DIRECTION_SETS = {
+    "orthogonal": ORTHOGONAL_DIRECTIONS,
+    "triangular": TRIANGULAR_DIRECTIONS,
+}
+
+# Value used as target when the game may end with a single peg anywhere
+ANY_HOLE = -1
+
+# Seed of the Zobrist keys, fixed so that position hashes are the same in every run
+ZOBRIST_SEED = 20211204
+
+# Board masks: "1" is a hole with a peg, "0" an empty hole,
+# any other character means that there is no hole
+ENGLISH_MASK = [
+    "  111  ",
+    "  111  ",
+    "1111111",
+    "1110111",
+    "1111111",
+    "  111  ",
+    "  111  ",
+]
+
+EUROPEAN_MASK = [
+    "  111  ",
+    " 11111 ",
+    "1101111",
+    "1111111",
+    "1111111",
+    " 11111 ",
+    "  111  ",
+]
+
+TRIANGULAR_MASK = [
+    "0",
+    "11",
+    "111",
+    "1111",
+    "11111",
+]
+
+WIEGLEB_MASK = [
+    "   111   ",
+    "   111   ",
+    "   111   ",
+    "111111111",
+    "111101111",
+    "111111111",
+    "   111   ",
+    "   111   ",
+    "   111   ",
+]
+
+
+class Geometry:
     """
-    The function displays the game board
-    with the current values
+    This class describes a board geometry. All its tables are generated
+    once, when the geometry is loaded:
+        - legal_holes: the mask of the holes of the board;
+        - start: the starting position;
+        - coordinates / coordinate_index: the name of each hole (e.g. D4) and back;
+        - jumps: for each direction and each starting hole, the (over, to) holes;
+        - from_masks: for each direction, the holes from which a jump is possible;
+        - jump_triples / jumps_by_hole: all the (start, over, to, direction) jumps
+          and, for each hole, the bitmask of the jumps it takes part in;
+        - template / template_holes: the display template of the board;
+        - symmetries: the permutations of the grid that map the board onto itself;
+        - zobrist_keys: a random 64-bit key for each hole (see zobrist_hash).
+
+    target is the hole of the single peg that ends the game: by default the
+    empty hole of the starting position, if there is exactly one.
     """
 
-    print("  1 2 3 4 5 6 7")
-    print(
-        "A     {} {} {}    ".format(board_values[2], board_values[3], board_values[4])
-    )
-    print(
-        "B     {} {} {}    ".format(board_values[9], board_values[10], board_values[11])
-    )
-    print(
-        "C {} {} {} {} {} {} {}".format(
-            board_values[14],
-            board_values[15],
-            board_values[16],
-            board_values[17],
-            board_values[18],
-            board_values[19],
-            board_values[20],
+    def __init__(self, name, mask, directions="orthogonal", target=None):
+        if len(mask) > 26:
+            raise ValueError("A board cannot have more than 26 rows")
+        self.name = name
+        self.mask = tuple(mask)
+        self.direction_set = directions
+        self.directions = DIRECTION_SETS[directions]
+        self.height = len(mask)
+        self.width = max(len(row) for row in mask)
+        self.size = self.width * self.height
+
+        self.legal_holes = 0
+        self.start = 0
+        for y, row in enumerate(mask):
+            for x, char in enumerate(row):
+                if char in "01":
+                    self.legal_holes |= 1 << (y * self.width + x)
+                if char == "1":
+                    self.start |= 1 << (y * self.width + x)
+        if not self.legal_holes:
+            raise ValueError("The board {} has no holes".format(name))
+
+        self.coordinates = [
+            chr(ord("A") + y) + str(x + 1)
+            for y in range(self.height)
+            for x in range(self.width)
+        ]
+        self.coordinate_index = {
+            coordinate: idx
+            for idx, coordinate in enumerate(self.coordinates)
+            if self.legal_holes >> idx & 1
+        }
+
+        if target is None:
+            empty = self.legal_holes & ~self.start
+            target = empty.bit_length() - 1 if empty.bit_count() == 1 else ANY_HOLE
+        elif isinstance(target, str):
+            target = self.coordinate_index[target.upper()]
+        self.target = target
+
+        self._build_jumps()
+        rng = random.Random(ZOBRIST_SEED)
+        self.zobrist_keys = [rng.getrandbits(64) for _ in range(self.size)]
+        self._build_template()
+        self._build_symmetries()
+        self._build_parity_masks()
+
+    def __repr__(self):
+        return "Geometry({!r}, {} holes)".format(
+            self.name, self.legal_holes.bit_count()
         )
-    )
-    print(
-        "D {} {} {} {} {} {} {}".format(
-            board_values[21],
-            board_values[22],
-            board_values[23],
-            board_values[24],
-            board_values[25],
-            board_values[26],
-            board_values[27],
-        )
-    )
-    print(
-        "E {} {} {} {} {} {} {}".format(
-            board_values[28],
-            board_values[29],
-            board_values[30],
-            board_values[31],
-            board_values[32],
-            board_values[33],
-            board_values[34],
-        )
-    )
-    print(
-        "F     {} {} {}    ".format(
-            board_values[37], board_values[38], board_values[39]
-        )
-    )
-    print(
-        "G     {} {} {}    ".format(
-            board_values[44], board_values[45], board_values[46]
+
+    def __reduce__(self):
+        # Rebuild from the definition (cached), instead of pickling all the tables
+        target = self.target if self.target != ANY_HOLE else None
+        return (
+            _cached_geometry,
+            (self.name, self.mask, self.direction_set, target),
         )
-    )
+
+    def _build_jumps(self):
+        self.jumps = {}
+        self.from_masks = {}
+        self.jump_triples = []
+        self.jumps_by_hole = [0] * self.size
+        for direction, (row_step, column_step, _) in self.directions.items():
+            self.jumps[direction] = {}
+            self.from_masks[direction] = 0
+            for idx in range(self.size):
+                to = self.step(idx, direction, 2)
+                if to is None:
+                    continue
+                over = self.step(idx, direction, 1)
+                if all(self.legal_holes >> hole & 1 for hole in (idx, over, to)):
+                    self.jumps[direction][idx] = (over, to)
+                    self.from_masks[direction] |= 1 << idx
+                    self.jump_triples.append((idx, over, to, direction))
+
+        for j, (start, over, to, _) in enumerate(self.jump_triples):
+            for hole in (start, over, to):
+                self.jumps_by_hole[hole] |= 1 << j
+
+    def step(self, idx, direction, distance):
+        """
+        This method returns the index of the hole at the given distance
+        from idx towards direction, or None if it is out of the grid.
+        """
+        row_step, column_step, _ = self.directions[direction]
+        row, column = divmod(idx, self.width)
+        y, x = row + distance * row_step, column + distance * column_step
+        if 0 <= y < self.height and 0 <= x < self.width:
+            return y * self.width + x
+        return None
+
+    def _build_template(self):
+        """
+        This method builds the display template: one line per row, with a
+        placeholder for each hole and blanks where there are no holes.
+        """
+        lines = []
+        self.template_holes = []
+        if self.direction_set == "orthogonal":
+            lines.append(" " + "".join(" " + str(x + 1) for x in range(self.width)))
+        for y in range(self.height):
+            if self.direction_set == "triangular":
+                line = chr(ord("A") + y) + " " * (self.height - y)
+            else:
+                line = chr(ord("A") + y)
+            for x in range(self.width):
+                idx = y * self.width + x
+                if self.legal_holes >> idx & 1:
+                    line += " {}"
+                    self.template_holes.append(idx)
+                elif self.direction_set != "triangular":
+                    line += "  "
+            lines.append(line)
+        self.template = "\n".join(lines)
+
+    def _build_symmetries(self):
+        """
+        This method keeps the symmetries of the square grid (rotations and
+        reflections) that map the board onto itself, as permutations of the
+        hole indices, with lookup tables that transform a bitboard 8 bits
+        at a time.
+        """
+        self.symmetries = []
+        self._symmetry_tables = []
+        if self.width != self.height or self.direction_set != "orthogonal":
+            coordinate_maps = [lambda y, x: (y, x)]
+        else:
+            last = self.width - 1
+            coordinate_maps = [
+                lambda y, x: (y, x),
+                lambda y, x: (x, last - y),
+                lambda y, x: (last - y, last - x),
+                lambda y, x: (last - x, y),
+                lambda y, x: (y, last - x),
+                lambda y, x: (last - y, x),
+                lambda y, x: (x, y),
+                lambda y, x: (last - x, last - y),
+            ]
+        n_chunks = (self.size + 7) // 8
+        for coordinate_map in coordinate_maps:
+            permutation = []
+            image = 0
+            for idx in range(self.size):
+                y, x = coordinate_map(*divmod(idx, self.width))
+                permutation.append(y * self.width + x)
+                if self.legal_holes >> idx & 1:
+                    image |= 1 << permutation[-1]
+            if image != self.legal_holes:
+                continue
+            self.symmetries.append(permutation)
+
+            tables = []
+            for chunk in range(n_chunks):
+                table = []
+                for chunk_bits in range(256):
+                    bits = 0
+                    for offset in range(8):
+                        idx = 8 * chunk + offset
+                        if chunk_bits >> offset & 1 and idx < self.size:
+                            bits |= 1 << permutation[idx]
+                    table.append(bits)
+                tables.append(table)
+            self._symmetry_tables.append(tables)
+
+    def _build_parity_masks(self):
+        """
+        This method splits the holes into 3 classes by (a * row + b * column) mod 3,
+        for every (a, b) such that the three holes of any jump fall into the three
+        different classes. Every jump then flips the parity of the number of pegs
+        of all three classes (see parity_signature).
+        """
+        self.parity_masks = []
+        for a, b in ((1, 1), (1, 2), (1, 0), (0, 1)):
+            if any(
+                (a * row_step + b * column_step) % 3 == 0
+                for row_step, column_step, _ in self.directions.values()
+            ):
+                continue
+            masks = [0, 0, 0]
+            for idx in range(self.size):
+                if self.legal_holes >> idx & 1:
+                    y, x = divmod(idx, self.width)
+                    masks[(a * y + b * x) % 3] |= 1 << idx
+            self.parity_masks.append(masks)
+
+    def transform(self, pegs, symmetry):
+        """
+        This method applies one of the symmetries of the board
+        (0 is the identity) to a bitboard.
+        """
+        bits = 0
+        for table in self._symmetry_tables[symmetry]:
+            bits |= table[pegs & 255]
+            pegs >>= 8
+        return bits
+
+    def parity_signature(self, pegs):
+        """
+        This method returns the parity class of a position. Every jump flips
+        the parity of all three classes of each family, so the parities of
+        the pairs of classes never change: a position can only reach a target
+        with the same signature.
+        """
+        signature = []
+        for masks in self.parity_masks:
+            a, b, c = [(pegs & mask).bit_count() & 1 for mask in masks]
+            signature.append((a ^ b, b ^ c))
+        return tuple(signature)
+
+
+_GEOMETRY_CACHE = {}
+
+
+def _cached_geometry(name, mask, directions="orthogonal", target=None):
+    key = (name, tuple(mask), directions, target)
+    geometry = _GEOMETRY_CACHE.get(key)
+    if geometry is None:
+        geometry = Geometry(name, mask, directions, target)
+        _GEOMETRY_CACHE[key] = geometry
+    return geometry
+
+
+def load_geometry(file, directions="orthogonal", target=None):
+    """
+    This function loads a custom board from a text file with one line per
+    row: "1" is a hole with a peg, "0" an empty hole, and any other
+    character (e.g. a space) means that there is no hole.
+    """
+    with open(file) as f:
+        mask = [line.rstrip("\n") for line in f]
+    while mask and not mask[-1].strip():
+        mask.pop()
+    name = os.path.splitext(os.path.basename(file))[0]
+    return _cached_geometry(name, mask, directions, target)
+
+
+ENGLISH = _cached_geometry("English", ENGLISH_MASK)
+EUROPEAN = _cached_geometry("European", EUROPEAN_MASK)
+TRIANGULAR = _cached_geometry("Triangular", TRIANGULAR_MASK, "triangular")
+WIEGLEB = _cached_geometry("Wiegleb", WIEGLEB_MASK)
+
+GEOMETRIES = {
+    "english": ENGLISH,
+    "european": EUROPEAN,
+    "triangular": TRIANGULAR,
+    "wiegleb": WIEGLEB,
+}
+
+# Tables of the English board, the board of create_board
+BOARD_WIDTH = ENGLISH.width
+DIRECTIONS = ENGLISH.directions
+LEGAL_HOLES = ENGLISH.legal_holes
+COORDINATE_INDEX = ENGLISH.coordinate_index
+JUMPS = ENGLISH.jumps
+FROM_MASKS = ENGLISH.from_masks
+JUMP_TRIPLES = ENGLISH.jump_triples
+JUMPS_BY_HOLE = ENGLISH.jumps_by_hole
+TARGET_HOLE = ENGLISH.target
+
+
+def create_bitboard(geometry=ENGLISH):
+    """
+    This function returns the starting position of a board as a bitboard.
+    """
+    return geometry.start
 
 
-def move_up(yx_start, board_coordinates, board_values):
+def values_to_bitboard(board_values):
     """
-    This function moves up the y-position by two (y -> y+2)
-    and returns the new values for the whole board.
-    It assumes a valid input for the starting yx point on the board.
+    This function converts a list of board values ("1", "0", None)
+    to a bitboard.
     """
-    y_start = yx_start[0]
-    x = yx_start[1]
+    pegs = 0
+    for idx, value in enumerate(board_values):
+        if value == "1":
+            pegs |= 1 << idx
+    return pegs
 
-    # Allowed y-positions from where you
-    # can move upwards
-    move_from_y = ["G", "F", "E", "D", "C"]
 
-    # Corresponding terminal y-positions
-    move_to_y = ["E", "D", "C", "B", "A"]
+def bitboard_to_values(pegs, geometry=ENGLISH):
+    """
+    This function converts a bitboard to a list of board values ("1", "0", None).
+    """
+    legal_holes = geometry.legal_holes
+    return [
+        None if not legal_holes >> idx & 1 else ("1" if pegs >> idx & 1 else "0")
+        for idx in range(geometry.size)
+    ]
 
-    # y-positions between initial and terminal y
-    in_between = ["F", "E", "D", "C", "B"]
 
-    for initial_y, terminal_y, in_between_y in zip(move_from_y, move_to_y, in_between):
-        if initial_y == y_start:
-            yx_end = terminal_y + x
-            yx_between = in_between_y + x
+def _shift(bits, step):
+    """
+    This function moves every bit of a bitboard by step holes
+    (bit i of the result is bit i + step of the input).
+    """
+    return bits >> step if step > 0 else bits << -step
 
-    for idx, val in enumerate(board_coordinates):
-        if val == yx_start:
-            board_values[idx] = "0"
-        if val == yx_between:
-            board_values[idx] = "0"
-        if val == yx_end:
-            board_values[idx] = "1"
 
-    return board_values
+def legal_moves(pegs, geometry=ENGLISH):
+    """
+    This function generates all the legal moves of a position at once.
+    It returns a dictionary with a bitboard of the starting holes
+    of the legal jumps for each direction.
+    """
+    empty = geometry.legal_holes & ~pegs
+    moves = {}
+    for direction, (row_step, column_step, _) in geometry.directions.items():
+        step = row_step * geometry.width + column_step
+        moves[direction] = (
+            pegs
+            & _shift(pegs, step)
+            & _shift(empty, 2 * step)
+            & geometry.from_masks[direction]
+        )
+    return moves
 
 
-def check_move_up(start_yx, board_coordinates, board_values, verbatim=True):
+def jump_error(pegs, start, direction, geometry=ENGLISH):
     """
-    This function checks if all the requirements for an upward movement are fulfilled.
+    This function checks in constant time if the peg at index start
+    can jump towards direction (e.g. "U", "D", "R", "L").
+    It returns None if the move can be executed, or the reason why it cannot.
+    """
+    jump = geometry.jumps[direction].get(start)
+    if jump is None:
+        if geometry.step(start, direction, 2) is not None:
+            return "Moving peg will fall out of bounds!"
+        return "You cannot move {} from here!".format(geometry.directions[direction][2])
+
+    over, to = jump
+    if not pegs >> start & 1:
+        return "Given peg position does not have a peg!"
+    if not pegs >> over & 1:
+        return "No peg at next position to jump over!"
+    if pegs >> to & 1:
+        return "Landing position is occupied!"
+    return None
+
+
+def check_jump(pegs, start, direction, verbatim=True, geometry=ENGLISH):
+    """
+    This function checks in constant time if the peg at index start
+    can jump towards direction (e.g. "U", "D", "R", "L").
     It returns True if the move can be executed, or False if there is an invalid move.
     """
+    error = jump_error(pegs, start, direction, geometry)
+    if error is not None and verbatim:
+        print(error)
+    return error is None
 
-    start_y = start_yx[0]
-    x = start_yx[1]  # The x-coordinate remains the same in up-movement
 
-    move_from_y = ["G", "F", "E", "D", "C"]
-    in_between = ["F", "E", "D", "C", "B"]
-    move_to_y = ["E", "D", "C", "B", "A"]
+def jump(pegs, start, direction, geometry=ENGLISH):
+    """
+    This function executes the jump of the peg at index start towards direction
+    and returns the new bitboard.
+    It assumes a valid move (see check_jump).
+    """
+    over, to = geometry.jumps[direction][start]
+    return pegs ^ ((1 << start) | (1 << over) | (1 << to))
 
-    # Flag variables
-    value_at_start_ok = False
-    value_at_end_ok = False
-    value_in_between_ok = False
-    can_move_upwards = False
 
-    # Check if starting y-coordinate is
-    # B or A -> cannot move upwards
-    if start_y not in move_from_y:
-        if verbatim:
-            print("You cannot move up from here!")
-        return can_move_upwards
-    else:
+def zobrist_hash(pegs, geometry=ENGLISH):
+    """
+    This function returns the Zobrist hash of a position: the XOR of the
+    keys of the holes with a peg. A jump changes it by the XOR of the keys
+    of its three holes, so it can be maintained incrementally (see MoveJournal).
+    """
+    keys = geometry.zobrist_keys
+    value = 0
+    while pegs:
+        bit = pegs & -pegs
+        pegs ^= bit
+        value ^= keys[bit.bit_length() - 1]
+    return value
 
-        # Move from position y to position y+2
-        for i, f, b in zip(move_from_y, move_to_y, in_between):
-            if i == start_y:
-                end_yx = f + x
-                between_yx = b + x
-                # print(end_yx, between_yx)
-
-        # Check if the ending position is out of board
-        # Check if the starting position has a peg
-        # Check if the ending position has a peg
-        # Check if the in-between position has a peg
-        for coordinate, value in zip(board_coordinates, board_values):
-
-            if (coordinate == start_yx) and (value == "1"):
-                # print('Value at start ok!')
-                value_at_start_ok = True
-
-            if (coordinate == end_yx) and (value is None):
-                if verbatim:
-                    print("Moving peg will fall out of bounds!")
-                return can_move_upwards
-
-            if (coordinate == end_yx) and (value == "0"):
-                # print('Value at end ok!')
-                value_at_end_ok = True
-
-            if (coordinate == between_yx) and (value == "1"):
-                # print('Value in between ok!')
-                value_in_between_ok = True
-
-        if (value_at_start_ok) and (value_in_between_ok) and (value_at_end_ok):
-            can_move_upwards = True
-            return can_move_upwards
-        elif not value_at_start_ok:
-            if verbatim:
-                print("Given peg position does not have a peg!")
-            return can_move_upwards
-        elif not value_in_between_ok:
-            if verbatim:
-                print("No peg at next position to jump over!")
-            return can_move_upwards
-        elif not value_at_end_ok:
-            if verbatim:
-                print("Landing position is occupied!")
-            return can_move_upwards
 
+class MoveCounts:
+    """
+    This class keeps the number of legal moves in each direction.
+    The counts are computed with one pass over the jump triples of the
+    board and then maintained incrementally: a move only changes the
+    jumps that involve one of its three holes.
+    """
 
-def move_down(yx_start, board_coordinates, board_values):
+    def __init__(self, pegs, geometry=ENGLISH):
+        self.geometry = geometry
+        self.counts = {direction: 0 for direction in geometry.directions}
+        self.legal = 0  # bit j is set when geometry.jump_triples[j] is a legal move
+        for j, (start, over, to, direction) in enumerate(geometry.jump_triples):
+            if pegs >> start & 1 and pegs >> over & 1 and not pegs >> to & 1:
+                self.legal |= 1 << j
+                self.counts[direction] += 1
+
+    def total(self):
+        return self.legal.bit_count()
+
+    def update(self, pegs, start, direction):
+        """
+        This method updates the counts after the peg at index start jumped
+        towards direction; pegs is the bitboard after the move.
+        """
+        geometry = self.geometry
+        over, to = geometry.jumps[direction][start]
+        affected = (
+            geometry.jumps_by_hole[start]
+            | geometry.jumps_by_hole[over]
+            | geometry.jumps_by_hole[to]
+        )
+        while affected:
+            bit = affected & -affected
+            affected ^= bit
+            j_start, j_over, j_to, j_direction = geometry.jump_triples[
+                bit.bit_length() - 1
+            ]
+            is_legal = (
+                pegs >> j_start & 1 and pegs >> j_over & 1 and not pegs >> j_to & 1
+            )
+            was_legal = self.legal & bit
+            if is_legal and not was_legal:
+                self.legal |= bit
+                self.counts[j_direction] += 1
+            elif was_legal and not is_legal:
+                self.legal ^= bit
+                self.counts[j_direction] -= 1
+
+
+class MoveJournal:
     """
-    This function moves down the y-position by two (y -> y-2)
-    and returns the new values for the whole board.
-    It assumes a valid input for the starting yx point on the board.
+    This class keeps the history of a game, so that moves can be taken back
+    and replayed. Each entry records only the move and the three holes it
+    changed, so that undo and redo are a single XOR of the bitboard and of
+    its Zobrist hash (and an update of the MoveCounts, if kept).
+    visits counts how many times each position (by hash) was reached.
     """
-    y_start = yx_start[0]
-    x = yx_start[1]
 
-    # Allowed y-positions from where you
-    # can move downwards
-    move_from_y = ["A", "B", "C", "D", "E"]
+    def __init__(self, pegs, geometry=ENGLISH, move_counts=None):
+        self.geometry = geometry
+        self.pegs = pegs
+        self.hash = zobrist_hash(pegs, geometry)
+        self.move_counts = move_counts
+        self.entries = []  # (start, direction, changed holes, hash change)
+        self.position = 0  # number of entries played; the others can be redone
+        self.visits = Counter([self.hash])
+
+    def __len__(self):
+        return self.position
+
+    def moves(self):
+        """
+        This method returns the (start, direction) moves played so far.
+        """
+        return [entry[:2] for entry in self.entries[: self.position]]
+
+    def can_undo(self):
+        return self.position > 0
+
+    def can_redo(self):
+        return self.position < len(self.entries)
+
+    def is_repeated(self):
+        return self.visits[self.hash] > 1
+
+    def _apply(self, entry):
+        start, direction, changed, hash_change = entry
+        self.pegs ^= changed
+        self.hash ^= hash_change
+        self.visits[self.hash] += 1
+        if self.move_counts is not None:
+            self.move_counts.update(self.pegs, start, direction)
+
+    def play(self, start, direction):
+        """
+        This method plays the jump of the peg at index start towards
+        direction and records it. It assumes a valid move (see check_jump).
+        Playing a move discards the moves that could be redone.
+        """
+        over, to = self.geometry.jumps[direction][start]
+        keys = self.geometry.zobrist_keys
+        entry = (
+            start,
+            direction,
+            (1 << start) | (1 << over) | (1 << to),
+            keys[start] ^ keys[over] ^ keys[to],
+        )
+        del self.entries[self.position :]
+        self.entries.append(entry)
+        self.position += 1
+        self._apply(entry)
+        return self.pegs
+
+    def undo(self):
+        """
+        This method takes back the last move; it returns False if there is none.
+        """
+        if not self.can_undo():
+            return False
+        self.position -= 1
+        self._apply(self.entries[self.position])
+        return True
 
-    # Corresponding terminal y-positions
-    move_to_y = ["C", "D", "E", "F", "G"]
+    def redo(self):
+        """
+        This method replays the last move taken back; it returns False if there is none.
+        """
+        if not self.can_redo():
+            return False
+        self.position += 1
+        self._apply(self.entries[self.position - 1])
+        return True
 
-    # y-positions between initial and terminal y
-    in_between = ["B", "C", "D", "E", "F"]
 
-    for initial_y, terminal_y, in_between_y in zip(move_from_y, move_to_y, in_between):
-        if initial_y == y_start:
-            yx_end = terminal_y + x
-            yx_between = in_between_y + x
+def display_board(board_values, geometry=ENGLISH):
+    """
+    The function displays the game board
+    with the current values (a list of values or a bitboard)
+    """
+    if isinstance(board_values, int):
+        pegs = board_values
+        cells = ["1" if pegs >> idx & 1 else "0" for idx in geometry.template_holes]
+    else:
+        cells = [board_values[idx] for idx in geometry.template_holes]
+    print(geometry.template.format(*cells))
 
-    for idx, val in enumerate(board_coordinates):
-        if val == yx_start:
-            board_values[idx] = "0"
-        if val == yx_between:
-            board_values[idx] = "0"
-        if val == yx_end:
-            board_values[idx] = "1"
 
-    return board_values
+def _jump_cells_values(start, direction, board_values):
+    """
+    This function returns a bitboard with the pegs of board_values that
+    lie on the (up to) three holes of a jump. It reads at most three values.
+    """
+    row_step, column_step, _ = DIRECTIONS[direction]
+    row, column = divmod(start, BOARD_WIDTH)
+    pegs = 0
+    for distance in range(3):
+        y, x = row + distance * row_step, column + distance * column_step
+        if 0 <= y < BOARD_WIDTH and 0 <= x < BOARD_WIDTH:
+            idx = y * BOARD_WIDTH + x
+            if board_values[idx] == "1":
+                pegs |= 1 << idx
+    return pegs
+
+
+def _check_move(start_yx, direction, board_values, verbatim):
+    """
+    This function checks a move given by a coordinate (e.g. "D2")
+    and a direction on a list of board values, in constant time.
+    """
+    start = COORDINATE_INDEX.get(start_yx)
+    if start is None:
+        if verbatim:
+            print("Something wrong with your input!")
+        return False
+    pegs = _jump_cells_values(start, direction, board_values)
+    return check_jump(pegs, start, direction, verbatim)
 
 
-def check_move_down(start_yx, board_coordinates, board_values, verbatim=True):
+def _move(yx_start, direction, board_values):
     """
-    This function checks if all the requirements for an downward movement are fulfilled.
-    It returns True if the move can be executed, or False if there is an invalid move.
+    This function executes a move given by a coordinate and a direction
+    on a list of board values, in constant time.
     """
+    start = COORDINATE_INDEX[yx_start]
+    over, to = JUMPS[direction][start]
+    board_values[start] = "0"
+    board_values[over] = "0"
+    board_values[to] = "1"
+    return board_values
 
-    start_y = start_yx[0]
-    x = start_yx[1]  # The x-coordinate remains the same in down-movement
-
-    move_from_y = ["A", "B", "C", "D", "E"]
-    in_between = ["B", "C", "D", "E", "F"]
-    move_to_y = ["C", "D", "E", "F", "G"]
 
-    # Flag variables
-    value_at_start_ok = False
-    value_at_end_ok = False
-    value_in_between_ok = False
-    can_move_downwards = False
+def move_up(yx_start, board_coordinates, board_values):
+    """
+    This function moves up the y-position by two (y -> y+2)
+    and returns the new values for the whole board.
+    It assumes a valid input for the starting yx point on the board.
+    """
+    return _move(yx_start, "U", board_values)
 
-    # Check if starting y-coordinate is
-    # F or G -> cannot move upwards
-    if start_y not in move_from_y:
-        if verbatim:
-            print("You cannot move down from here!")
-        return can_move_downwards
-    else:
 
-        # Move from position y to position y-2
-        for i, f, b in zip(move_from_y, move_to_y, in_between):
-            if i == start_y:
-                end_yx = f + x
-                between_yx = b + x
-                # print(end_yx, between_yx)
-
-        # Check if the ending position is out of board
-        # Check if the starting position has a peg
-        # Check if the ending position has a peg
-        # Check if the in-between position has a peg
-        for coordinate, value in zip(board_coordinates, board_values):
-
-            if (coordinate == start_yx) and (value == "1"):
-                # print('Value at start ok!')
-                value_at_start_ok = True
-
-            if (coordinate == end_yx) and (value is None):
-                if verbatim:
-                    print("Moving peg will fall out of bounds!")
-                return can_move_downwards
-
-            if (coordinate == end_yx) and (value == "0"):
-                # print('Value at end ok!')
-                value_at_end_ok = True
-
-            if (coordinate == between_yx) and (value == "1"):
-                # print('Value in between ok!')
-                value_in_between_ok = True
-
-        if (value_at_start_ok) and (value_in_between_ok) and (value_at_end_ok):
-            can_move_downwards = True
-            return can_move_downwards
-        elif not value_at_start_ok:
-            if verbatim:
-                print("Given peg position does not have a peg!")
-            return can_move_downwards
-        elif not value_in_between_ok:
-            if verbatim:
-                print("No peg at next position to jump over!")
-            return can_move_downwards
-        elif not value_at_end_ok:
-            if verbatim:
-                print("Landing position is occupied!")
-            return can_move_downwards
+def check_move_up(start_yx, board_coordinates, board_values, verbatim=True):
+    """
+    This function checks if all the requirements for an upward movement are fulfilled.
+    It returns True if the move can be executed, or False if there is an invalid move.
+    """
+    return _check_move(start_yx, "U", board_values, verbatim)
 
 
-def move_right(yx_start, board_coordinates, board_values):
+def move_down(yx_start, board_coordinates, board_values):
     """
-    This function moves right the x-position by two (x -> x+2)
+    This function moves down the y-position by two (y -> y-2)
     and returns the new values for the whole board.
     It assumes a valid input for the starting yx point on the board.
     """
-    y = yx_start[0]
-    x_start = yx_start[1]
-
-    # Allowed x-positions from where you
-    # can move right
-    move_from_x = ["1", "2", "3", "4", "5"]
+    return _move(yx_start, "D", board_values)
 
-    # Corresponding terminal x-positions
-    move_to_x = ["3", "4", "5", "6", "7"]
 
-    # x-positions between initial and terminal x
-    in_between = ["2", "3", "4", "5", "6"]
-
-    for initial_x, terminal_x, in_between_x in zip(move_from_x, move_to_x, in_between):
-        if initial_x == x_start:
-            yx_end = y + terminal_x
-            yx_between = y + in_between_x
+def check_move_down(start_yx, board_coordinates, board_values, verbatim=True):
+    """
+    This function checks if all the requirements for an downward movement are fulfilled.
+    It returns True if the move can be executed, or False if there is an invalid move.
+    """
+    return _check_move(start_yx, "D", board_values, verbatim)
 
-    for idx, val in enumerate(board_coordinates):
-        if val == yx_start:
-            board_values[idx] = "0"
-        if val == yx_between:
-            board_values[idx] = "0"
-        if val == yx_end:
-            board_values[idx] = "1"
 
-    return board_values
+def move_right(yx_start, board_coordinates, board_values):
+    """
+    This function moves right the x-position by two (x -> x+2)
+    and returns the new values for the whole board.
+    It assumes a valid input for the starting yx point on the board.
+    """
+    return _move(yx_start, "R", board_values)
 
 
 def check_move_right(start_yx, board_coordinates, board_values, verbatim=True):
@@ -377,73 +790,7 @@ def check_move_right(start_yx, board_coordinates, board_values, verbatim=True):
     This function checks if all the requirements for a right movement are fulfilled.
     It returns True if the move can be executed, or False if there is an invalid move.
     """
-
-    y = start_yx[0]  # The y-coordinate remains the same in right-movement
-    start_x = start_yx[1]
-
-    move_from_x = ["1", "2", "3", "4", "5"]
-    in_between = ["2", "3", "4", "5", "6"]
-    move_to_x = ["3", "4", "5", "6", "7"]
-
-    # Flag variables
-    value_at_start_ok = False
-    value_at_end_ok = False
-    value_in_between_ok = False
-    can_move_right = False
-
-    # Check if starting x-coordinate is
-    # 6 or 7 -> cannot move right
-    if start_x not in move_from_x:
-        if verbatim:
-            print("You cannot move right from here!")
-        return can_move_right
-    else:
-
-        # Move from position x to position x+2
-        for i, f, b in zip(move_from_x, move_to_x, in_between):
-            if i == start_x:
-                end_yx = y + f
-                between_yx = y + b
-                # print(end_yx, between_yx)
-
-        # Check if the ending position is out of board
-        # Check if the starting position has a peg
-        # Check if the ending position has a peg
-        # Check if the in-between position has a peg
-        for coordinate, value in zip(board_coordinates, board_values):
-
-            if (coordinate == start_yx) and (value == "1"):
-                # print('Value at start ok!')
-                value_at_start_ok = True
-
-            if (coordinate == end_yx) and (value is None):
-                if verbatim:
-                    print("Moving peg will fall out of bounds!")
-                return can_move_right
-
-            if (coordinate == end_yx) and (value == "0"):
-                # print('Value at end ok!')
-                value_at_end_ok = True
-
-            if (coordinate == between_yx) and (value == "1"):
-                # print('Value in between ok!')
-                value_in_between_ok = True
-
-        if (value_at_start_ok) and (value_in_between_ok) and (value_at_end_ok):
-            can_move_right = True
-            return can_move_right
-        elif not value_at_start_ok:
-            if verbatim:
-                print("Given peg position does not have a peg!")
-            return can_move_right
-        elif not value_in_between_ok:
-            if verbatim:
-                print("No peg at next position to jump over!")
-            return can_move_right
-        elif not value_at_end_ok:
-            if verbatim:
-                print("Landing position is occupied!")
-            return can_move_right
+    return _check_move(start_yx, "R", board_values, verbatim)
 
 
 def move_left(yx_start, board_coordinates, board_values):
@@ -452,33 +799,7 @@ def move_left(yx_start, board_coordinates, board_values):
     and returns the new values for the whole board.
     It assumes a valid input for the starting yx point on the board.
     """
-    y = yx_start[0]
-    x_start = yx_start[1]
-
-    # Allowed x-positions from where you
-    # can move left
-    move_from_x = ["7", "6", "5", "4", "3"]
-
-    # Corresponding terminal x-positions
-    move_to_x = ["5", "4", "3", "2", "1"]
-
-    # x-positions between initial and terminal x
-    in_between = ["6", "5", "4", "3", "2"]
-
-    for initial_x, terminal_x, in_between_x in zip(move_from_x, move_to_x, in_between):
-        if initial_x == x_start:
-            yx_end = y + terminal_x
-            yx_between = y + in_between_x
-
-    for idx, val in enumerate(board_coordinates):
-        if val == yx_start:
-            board_values[idx] = "0"
-        if val == yx_between:
-            board_values[idx] = "0"
-        if val == yx_end:
-            board_values[idx] = "1"
-
-    return board_values
+    return _move(yx_start, "L", board_values)
 
 
 def check_move_left(start_yx, board_coordinates, board_values, verbatim=True):
@@ -486,134 +807,32 @@ def check_move_left(start_yx, board_coordinates, board_values, verbatim=True):
     This function checks if all the requirements for a left movement are fulfilled.
     It returns True if the move can be executed, or False if there is an invalid move.
     """
+    return _check_move(start_yx, "L", board_values, verbatim)
 
-    y = start_yx[0]  # The y-coordinate remains the same in right-movement
-    start_x = start_yx[1]
-
-    move_from_x = ["7", "6", "5", "4", "3"]
-    in_between = ["6", "5", "4", "3", "2"]
-    move_to_x = ["5", "4", "3", "2", "1"]
-
-    # Flag variables
-    value_at_start_ok = False
-    value_at_end_ok = False
-    value_in_between_ok = False
-    can_move_left = False
-
-    # Check if starting x-coordinate is
-    # 1 or 2 -> cannot move right
-    if start_x not in move_from_x:
-        if verbatim:
-            print("You cannot move left from here!")
-        return can_move_left
-    else:
 
-        # Move from position x to position x+2
-        for i, f, b in zip(move_from_x, move_to_x, in_between):
-            if i == start_x:
-                end_yx = y + f
-                between_yx = y + b
-                # print(end_yx, between_yx)
-
-        # Check if the ending position is out of board
-        # Check if the starting position has a peg
-        # Check if the ending position has a peg
-        # Check if the in-between position has a peg
-        for coordinate, value in zip(board_coordinates, board_values):
-
-            if (coordinate == start_yx) and (value == "1"):
-                # print('Value at start ok!')
-                value_at_start_ok = True
-
-            if (coordinate == end_yx) and (value is None):
-                if verbatim:
-                    print("Moving peg will fall out of bounds!")
-                return can_move_left
-
-            if (coordinate == end_yx) and (value == "0"):
-                # print('Value at end ok!')
-                value_at_end_ok = True
-
-            if (coordinate == between_yx) and (value == "1"):
-                # print('Value in between ok!')
-                value_in_between_ok = True
-
-        if (value_at_start_ok) and (value_in_between_ok) and (value_at_end_ok):
-            can_move_left = True
-            return can_move_left
-        elif not value_at_start_ok:
-            if verbatim:
-                print("Given peg position does not have a peg!")
-            return can_move_left
-        elif not value_in_between_ok:
-            if verbatim:
-                print("No peg at next position to jump over!")
-            return can_move_left
-        elif not value_at_end_ok:
-            if verbatim:
-                print("Landing position is occupied!")
-            return can_move_left
-
-
-def remaining_moves(board_coordinates, board_values, show_help=True):
+def remaining_moves(board_coordinates, board_values, show_help=True, move_counts=None):
     """
     This function checks if there are any remaining moves left.
     It gives the option to show how many moves are available in
     each direction if show_help is enabled.
+    board_values can be a list of values or a bitboard; if the
+    MoveCounts of the board are given, they are used as they are.
     """
+    if move_counts is None:
+        if not isinstance(board_values, int):
+            board_values = values_to_bitboard(board_values)
+        move_counts = MoveCounts(board_values)
 
-    can_move_up = False
-    can_move_down = False
-    can_move_right = False
-    can_move_left = False
-
-    up_counter, down_counter, right_counter, left_counter = 0, 0, 0, 0
-
-    for coordinate in board_coordinates:
-        if check_move_up(
-            coordinate,
-            board_coordinates=board_coordinates,
-            board_values=board_values,
-            verbatim=False,
-        ):
-            can_move_up = True
-            up_counter += 1
-
-        if check_move_down(
-            coordinate,
-            board_coordinates=board_coordinates,
-            board_values=board_values,
-            verbatim=False,
-        ):
-            can_move_down = True
-            down_counter += 1
-
-        if check_move_right(
-            coordinate,
-            board_coordinates=board_coordinates,
-            board_values=board_values,
-            verbatim=False,
-        ):
-            can_move_right = True
-            right_counter += 1
-
-        if check_move_left(
-            coordinate,
-            board_coordinates=board_coordinates,
-            board_values=board_values,
-            verbatim=False,
-        ):
-            can_move_left = True
-            left_counter += 1
-
-    if can_move_up or can_move_down or can_move_right or can_move_left:
+    if move_counts.legal:
         if show_help:
             print("\n" + "Available moves:")
             print("--" * 10)
-            print("UP MOVEMENTS: {}".format(up_counter))
-            print("DOWN MOVEMENTS: {}".format(down_counter))
-            print("RIGHT MOVEMENTS: {}".format(right_counter))
-            print("LEFT MOVEMENTS: {}".format(left_counter))
+            for direction, (_, _, name) in move_counts.geometry.directions.items():
+                print(
+                    "{} MOVEMENTS: {}".format(
+                        name.upper(), move_counts.counts[direction]
+                    )
+                )
             print("--" * 10)
         return True
     else:
@@ -623,8 +842,10 @@ def remaining_moves(board_coordinates, board_values, show_help=True):
 def peg_counter(board_values):
     """
     This function counts the number of existing pegs
-    on the board.
+    on the board (a list of values or a bitboard).
     """
+    if isinstance(board_values, int):
+        return board_values.bit_count()
     total_pegs = 0
     for peg in board_values:
         if peg == "1":
@@ -633,159 +854,869 @@ def peg_counter(board_values):
     return total_pegs
 
 
-def main():
+def transform(pegs, symmetry, geometry=ENGLISH):
+    """
+    This function applies one of the symmetries of the board
+    (0 is the identity) to a bitboard.
+    """
+    return geometry.transform(pegs, symmetry)
 
-    direction_options = ["U", "D", "R", "L"]
 
-    yx_coordinates, yx_values, yx_forbidden_coordinates = create_board()
-    display_board(yx_values)
+def canonical(pegs, symmetries=None, geometry=ENGLISH):
+    """
+    This function returns the canonical form of a position, i.e. the smallest
+    bitboard among its images under the given symmetries (all the symmetries
+    of the board by default). Symmetric positions share the same canonical form.
+    """
+    if symmetries is None:
+        symmetries = range(len(geometry.symmetries))
+    return min(geometry.transform(pegs, symmetry) for symmetry in symmetries)
 
-    while remaining_moves(board_coordinates=yx_coordinates, board_values=yx_values):
-        user_move = input(
-            "Enter peg position followed by move (L, R, U, or D): "
-        ).upper()
 
-        # Check if the length of the alpharithmetic is at least 3
-        # so it can be parsed to coordinate + direction
-        if len(user_move) != 3:
-            # In this case ignore the rest of code and
-            # continue with the next iteration
-            print("Something wrong with your input!")
-            continue
+def _target_mask(target, geometry):
+    """
+    This function returns the mask of the holes on which
+    the last peg may stand.
+    """
+    if target is None:
+        target = geometry.target
+    if target == ANY_HOLE:
+        return geometry.legal_holes
+    return 1 << target
 
-        start_from_coordinate = user_move[0] + user_move[1]
-        direction = user_move[2].upper()
 
-        # Check if input is out of board, invalid, or has a wrong direction
-        input_is_valid = False
-        direction_is_valid = False
-        while True:
-            if start_from_coordinate in yx_forbidden_coordinates:
-                print("Given peg position is out of board!")
-                user_move = input(
-                    "Enter peg position followed by move (L, R, U, or D): "
-                ).upper()
-                start_from_coordinate = user_move[0] + user_move[1]
-                direction = user_move[2].upper()
-            elif start_from_coordinate not in yx_coordinates:
-                print("Something wrong with your input!")
-                user_move = input(
-                    "Enter peg position followed by move (L, R, U, or D): "
-                ).upper()
-                start_from_coordinate = user_move[0] + user_move[1]
-                direction = user_move[2].upper()
-            else:
-                input_is_valid = True
+def _target_symmetries(target_mask, geometry):
+    """
+    This function returns the symmetries of the board that map the target
+    onto itself; only those preserve the outcome of a position.
+    """
+    symmetries = []
+    for symmetry, permutation in enumerate(geometry.symmetries):
+        image = 0
+        for idx in range(geometry.size):
+            if target_mask >> idx & 1:
+                image |= 1 << permutation[idx]
+        if image == target_mask:
+            symmetries.append(symmetry)
+    return symmetries
+
+
+class SolverStats:
+    """
+    This class keeps the statistics of a search.
+    """
 
-            if direction in direction_options:
-                direction_is_valid = True
-            else:
-                print("Direction is not L or R or U or D!")
-                user_move = input(
-                    "Enter peg position followed by move (L, R, U, or D): "
-                ).upper()
-                start_from_coordinate = user_move[0] + user_move[1]
-                direction = user_move[2].upper()
-
-            if input_is_valid and direction_is_valid:
-                break
+    def __init__(self):
+        self.nodes = 0
+        self.transpositions = 0  # positions skipped thanks to the table
 
-        # Check if the move is valid
-        ok_to_move = False
-        while not ok_to_move:
 
-            if user_move.endswith("U"):  # This can also be written as direction == 'U'
-                ok_to_move = check_move_up(
-                    start_from_coordinate,
-                    board_coordinates=yx_coordinates,
-                    board_values=yx_values,
-                )
-                if ok_to_move:
-                    # Update the board values after the movement
-                    yx_values = move_up(
-                        start_from_coordinate,
-                        board_coordinates=yx_coordinates,
-                        board_values=yx_values,
-                    )
-                    display_board(yx_values)
-                else:
-                    user_move = input(
-                        "Enter peg position followed by move (L, R, U, or D): "
-                    ).upper()
-                    start_from_coordinate = user_move[0] + user_move[1]
-                    direction = user_move[2].upper()
-
-            elif user_move.endswith(
-                "D"
-            ):  # This can also be written as direction == 'D'
-                ok_to_move = check_move_down(
-                    start_from_coordinate,
-                    board_coordinates=yx_coordinates,
-                    board_values=yx_values,
-                )
-                if ok_to_move:
-                    # Update the board values after the movement
-                    yx_values = move_down(
-                        start_from_coordinate,
-                        board_coordinates=yx_coordinates,
-                        board_values=yx_values,
-                    )
-                    display_board(yx_values)
-                else:
-                    user_move = input(
-                        "Enter peg position followed by move (L, R, U, or D): "
-                    ).upper()
-                    start_from_coordinate = user_move[0] + user_move[1]
-                    direction = user_move[2].upper()
-
-            elif user_move.endswith(
-                "R"
-            ):  # This can also be written as direction == 'R'
-                ok_to_move = check_move_right(
-                    start_from_coordinate,
-                    board_coordinates=yx_coordinates,
-                    board_values=yx_values,
-                )
-                if ok_to_move:
-                    # Update the board values after the movement
-                    yx_values = move_right(
-                        start_from_coordinate,
-                        board_coordinates=yx_coordinates,
-                        board_values=yx_values,
-                    )
-                    display_board(yx_values)
-                else:
-                    user_move = input(
-                        "Enter peg position followed by move (L, R, U, or D): "
-                    ).upper()
-                    start_from_coordinate = user_move[0] + user_move[1]
-                    direction = user_move[2].upper()
-
-            elif user_move.endswith(
-                "L"
-            ):  # This can also be written as direction == 'L'
-                ok_to_move = check_move_left(
-                    start_from_coordinate,
-                    board_coordinates=yx_coordinates,
-                    board_values=yx_values,
+def solve(pegs=None, target=None, dead_positions=None, stats=None, geometry=ENGLISH):
+    """
+    This function searches (depth-first) a sequence of moves that ends with
+    a single peg on the target hole (by default the target of the board,
+    e.g. D4 on the English board; ANY_HOLE accepts any hole).
+    Positions known to fail are kept in a transposition table (dead_positions)
+    keyed on their canonical form, so that each of them and its symmetric
+    images are searched only once.
+    It returns the list of (start, direction) moves, or None if there is none.
+    """
+    if pegs is None:
+        pegs = create_bitboard(geometry)
+    if dead_positions is None:
+        dead_positions = set()
+    if stats is None:
+        stats = SolverStats()
+
+    target_mask = _target_mask(target, geometry)
+    symmetries = _target_symmetries(target_mask, geometry)
+    # The peg count must go down to one and the parity class of the
+    # position never changes, so a position of another class than all
+    # the target holes is pruned without any search
+    if not pegs:
+        return None
+    signature = geometry.parity_signature(pegs)
+    if not any(
+        geometry.parity_signature(1 << idx) == signature
+        for idx in range(geometry.size)
+        if target_mask >> idx & 1
+    ):
+        return None
+
+    moves = []
+    n_pegs = pegs.bit_count()
+    if _search(
+        pegs, n_pegs, target_mask, symmetries, dead_positions, moves, stats, geometry
+    ):
+        moves.reverse()
+        return moves
+    return None
+
+
+def _search(
+    pegs, n_pegs, target_mask, symmetries, dead_positions, moves, stats, geometry
+):
+    stats.nodes += 1
+    if n_pegs == 1:
+        return bool(pegs & target_mask)
+
+    key = canonical(pegs, symmetries, geometry)
+    if key in dead_positions:
+        stats.transpositions += 1
+        return False
+
+    # Try the moves hole by hole (rather than direction by direction),
+    # which finds a solution of the standard game with far fewer nodes
+    moves_by_direction = legal_moves(pegs, geometry)
+    starts = 0
+    for direction_starts in moves_by_direction.values():
+        starts |= direction_starts
+    while starts:
+        bit = starts & -starts
+        starts ^= bit
+        start = bit.bit_length() - 1
+        for direction, direction_starts in moves_by_direction.items():
+            if not direction_starts & bit:
+                continue
+            over, to = geometry.jumps[direction][start]
+            new_pegs = pegs ^ (bit | (1 << over) | (1 << to))
+            if _search(
+                new_pegs,
+                n_pegs - 1,
+                target_mask,
+                symmetries,
+                dead_positions,
+                moves,
+                stats,
+                geometry,
+            ):
+                moves.append((start, direction))
+                return True
+
+    dead_positions.add(key)
+    return False
+
+
+# Per worker process memo of parallel_search, kept across its tasks, by board:
+# canonical position -> number of solutions ("solutions" mode),
+# or the canonical positions already visited ("end_positions" mode)
+_worker_memo = {}
+
+# Default number of chunks of subtrees per worker of parallel_search
+TASKS_PER_WORKER = 6
+
+
+def _count_solutions(
+    pegs, n_pegs, target_mask, symmetries, memo, dead_log, stats, geometry
+):
+    """
+    This function counts the move sequences that lead from pegs to a single
+    peg on the target, memoizing the counts by canonical position.
+    """
+    stats.nodes += 1
+    if n_pegs == 1:
+        return 1 if pegs & target_mask else 0
+
+    key = canonical(pegs, symmetries, geometry)
+    total = memo.get(key)
+    if total is not None:
+        stats.transpositions += 1
+        return total
+
+    total = 0
+    for direction, starts in legal_moves(pegs, geometry).items():
+        while starts:
+            bit = starts & -starts
+            starts ^= bit
+            over, to = geometry.jumps[direction][bit.bit_length() - 1]
+            total += _count_solutions(
+                pegs ^ (bit | (1 << over) | (1 << to)),
+                n_pegs - 1,
+                target_mask,
+                symmetries,
+                memo,
+                dead_log,
+                stats,
+                geometry,
+            )
+    memo[key] = total
+    if total == 0:
+        dead_log.append(key)
+    return total
+
+
+def _collect_end_positions(pegs, visited, end_positions, stats, geometry):
+    """
+    This function collects the canonical forms of all the positions without
+    any legal move that can be reached from pegs.
+    """
+    key = canonical(pegs, None, geometry)
+    if key in visited:
+        stats.transpositions += 1
+        return None
+    visited.add(key)
+    stats.nodes += 1
+
+    moves = legal_moves(pegs, geometry)
+    has_moves = False
+    for direction, starts in moves.items():
+        while starts:
+            has_moves = True
+            bit = starts & -starts
+            starts ^= bit
+            over, to = geometry.jumps[direction][bit.bit_length() - 1]
+            _collect_end_positions(
+                pegs ^ (bit | (1 << over) | (1 << to)),
+                visited,
+                end_positions,
+                stats,
+                geometry,
+            )
+    if not has_moves:
+        end_positions.append(key)
+    return None
+
+
+def _search_subtrees(task):
+    """
+    This function is run by the worker processes of parallel_search.
+    It searches the subtrees rooted at the given positions (once the dead
+    positions shared with the task are added to its memo) and returns
+    the worker's pid, the results, the newly found dead positions,
+    the number of nodes and the time spent.
+    """
+    mode, positions, target_mask, symmetries, geometry, shared_dead = task
+    stats = SolverStats()
+    start_time = time.perf_counter()
+    dead_log = []
+    # The memo of a worker is only valid for one board and target
+    memo = _worker_memo.setdefault((geometry.name, target_mask), {})
+    visited = _worker_memo.setdefault((geometry.name, "visited"), set())
+    # The dead positions found by the other workers in the previous round
+    memo.update(dict.fromkeys(shared_dead, 0))
+    if mode == "solutions":
+        results = [
+            _count_solutions(
+                pegs,
+                pegs.bit_count(),
+                target_mask,
+                symmetries,
+                memo,
+                dead_log,
+                stats,
+                geometry,
+            )
+            for pegs in positions
+        ]
+    else:
+        results = []
+        for pegs in positions:
+            _collect_end_positions(pegs, visited, results, stats, geometry)
+    elapsed_sec = time.perf_counter() - start_time
+    return os.getpid(), results, dead_log, stats.nodes, elapsed_sec
+
+
+def _split_tree(pegs, depth, key_symmetries, geometry):
+    """
+    This function expands the game tree breadth-first down to the given depth.
+    Symmetric positions are merged, so it returns a dictionary
+    canonical position -> [position, number of paths to it], together
+    with the positions without moves found above that depth.
+    """
+    frontier = {canonical(pegs, key_symmetries, geometry): [pegs, 1]}
+    finished = {}
+    for _ in range(depth):
+        next_frontier = {}
+        for key, (position, paths) in frontier.items():
+            has_moves = False
+            for direction, starts in legal_moves(position, geometry).items():
+                while starts:
+                    has_moves = True
+                    bit = starts & -starts
+                    starts ^= bit
+                    over, to = geometry.jumps[direction][bit.bit_length() - 1]
+                    child = position ^ (bit | (1 << over) | (1 << to))
+                    child_key = canonical(child, key_symmetries, geometry)
+                    entry = next_frontier.get(child_key)
+                    if entry is None:
+                        next_frontier[child_key] = [child, paths]
+                    else:
+                        entry[1] += paths
+            if not has_moves:
+                entry = finished.setdefault(key, [position, 0])
+                entry[1] += paths
+        frontier = next_frontier
+    return frontier, finished
+
+
+def parallel_search(
+    pegs=None,
+    mode="solutions",
+    split_depth=6,
+    workers=None,
+    chunk_size=None,
+    target=None,
+    geometry=ENGLISH,
+):
+    """
+    This function enumerates the game tree of a position with a pool of
+    worker processes. The tree is split at split_depth into independent
+    subtrees (symmetric subtrees are merged) that are farmed out in chunks,
+    by default TASKS_PER_WORKER chunks per worker to balance their load.
+    The chunks are run in rounds of one chunk per worker. Each worker keeps
+    its memo across its chunks, and the dead positions found in a round are
+    merged and shared with the chunks of the next round, so that no worker
+    searches again a subtree that another one already found dead.
+
+    mode is either:
+        - "solutions"     : count the move sequences ending with a single
+                            peg on the target hole;
+        - "end_positions" : count the distinct (up to symmetry) positions
+                            without moves that can be reached.
+
+    It returns a dictionary with the results and the nodes per second
+    of each worker.
+    """
+    if pegs is None:
+        pegs = create_bitboard(geometry)
+    if mode not in ("solutions", "end_positions"):
+        raise ValueError("unknown search mode: {}".format(mode))
+
+    target_mask = _target_mask(target, geometry)
+    if mode == "solutions":
+        symmetries = _target_symmetries(target_mask, geometry)
+    else:
+        symmetries = list(range(len(geometry.symmetries)))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    start_time = time.perf_counter()
+    frontier, finished = _split_tree(pegs, split_depth, symmetries, geometry)
+    keys = list(frontier)
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(keys) // (workers * TASKS_PER_WORKER)))
+    chunks = [keys[i : i + chunk_size] for i in range(0, len(keys), chunk_size)]
+
+    solutions = 0
+    end_positions = set()
+    for key, (position, paths) in finished.items():
+        if position.bit_count() == 1 and position & target_mask:
+            solutions += paths
+        end_positions.add(canonical(position, None, geometry))
+
+    dead_positions = set()
+    worker_stats = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        new_dead = []
+        for first in range(0, len(chunks), workers):
+            round_chunks = chunks[first : first + workers]
+            tasks = [
+                (
+                    mode,
+                    [frontier[key][0] for key in chunk],
+                    target_mask,
+                    symmetries,
+                    geometry,
+                    new_dead,
                 )
-                if ok_to_move:
-                    # Update the board values after the movement
-                    yx_values = move_left(
-                        start_from_coordinate,
-                        board_coordinates=yx_coordinates,
-                        board_values=yx_values,
-                    )
-                    display_board(yx_values)
+                for chunk in round_chunks
+            ]
+            new_dead = []
+            for chunk, (pid, results, dead_log, nodes, elapsed_sec) in zip(
+                round_chunks, executor.map(_search_subtrees, tasks)
+            ):
+                if mode == "solutions":
+                    for key, count in zip(chunk, results):
+                        solutions += count * frontier[key][1]
                 else:
-                    user_move = input(
-                        "Enter peg position followed by move (L, R, U, or D): "
-                    ).upper()
-                    start_from_coordinate = user_move[0] + user_move[1]
-                    direction = user_move[2].upper()
+                    end_positions.update(results)
+                for key in dead_log:
+                    if key not in dead_positions:
+                        dead_positions.add(key)
+                        new_dead.append(key)
+                entry = worker_stats.setdefault(pid, {"nodes": 0, "busy_sec": 0.0})
+                entry["nodes"] += nodes
+                entry["busy_sec"] += elapsed_sec
+    elapsed_sec = time.perf_counter() - start_time
+
+    for entry in worker_stats.values():
+        entry["nodes_per_sec"] = (
+            entry["nodes"] / entry["busy_sec"] if entry["busy_sec"] else 0.0
+        )
+    report = {
+        "board": geometry.name,
+        "mode": mode,
+        "split_depth": split_depth,
+        "subtrees": len(frontier),
+        "nodes": sum(entry["nodes"] for entry in worker_stats.values()),
+        "elapsed_sec": elapsed_sec,
+        "workers": worker_stats,
+    }
+    if mode == "solutions":
+        report["solutions"] = solutions
+        report["dead_positions"] = len(dead_positions)
+    else:
+        report["end_positions"] = len(end_positions)
+        report["end_positions_by_pegs"] = dict(
+            sorted(Counter(key.bit_count() for key in end_positions).items())
+        )
+    return report
+
+
+def display_search_report(report):
+    """
+    This function displays the results of parallel_search.
+    """
+    print("Board: {}".format(report["board"]))
+    print("Mode: {}".format(report["mode"]))
+    print("--" * 10)
+    if report["mode"] == "solutions":
+        print("SOLUTIONS: {}".format(report["solutions"]))
+        print("DEAD POSITIONS: {}".format(report["dead_positions"]))
+    else:
+        print("END POSITIONS: {}".format(report["end_positions"]))
+        for n_pegs, count in report["end_positions_by_pegs"].items():
+            print("  WITH {} PEGS: {}".format(n_pegs, count))
+    print("SUBTREES: {}".format(report["subtrees"]))
+    print("NODES: {}".format(report["nodes"]))
+    print("TIME: {:.2f} s".format(report["elapsed_sec"]))
+    for pid, entry in report["workers"].items():
+        print(
+            "  WORKER {}: {} nodes, {:.0f} nodes/s".format(
+                pid, entry["nodes"], entry["nodes_per_sec"]
+            )
+        )
+    print("--" * 10)
 
-    print("No more moves. The number of remaining pegs is:", peg_counter(yx_values))
+
+# Database of the solvable positions of the English board, used for the hints
+HINTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "english.hints")
+_HINTS_MAGIC = b"PSHD"
+_HINTS_VERSION = 1
+# magic, version, holes of the board, target hole, number of positions
+_HINTS_HEADER = struct.Struct("<4sIQiI")
+_HINTS_KEY = struct.Struct("<Q")
+
+
+def _children(pegs, geometry):
+    """
+    This function yields the positions one move away from a position.
+    """
+    for direction, starts in legal_moves(pegs, geometry).items():
+        jumps = geometry.jumps[direction]
+        while starts:
+            bit = starts & -starts
+            starts ^= bit
+            over, to = jumps[bit.bit_length() - 1]
+            yield pegs ^ bit ^ (1 << over) ^ (1 << to)
+
+
+def solvable_positions(geometry=ENGLISH, verbatim=False):
+    """
+    This function finds all the positions (in canonical form) that can be
+    reached from the starting position and still end with a single peg
+    in the target hole.
+    The starting position must be the full board but the target hole, so
+    that the game is its own reverse: a position can reach the target if
+    and only if its complement can be reached from the start. The reachable
+    positions are thus only generated down to the middle of the game (half
+    the holes of the board), and the solvable ones are found with a backward
+    pass up to the start; those of the second half are their complements.
+    """
+    holes = geometry.legal_holes
+    if geometry.target == ANY_HOLE or geometry.start != holes ^ (1 << geometry.target):
+        raise ValueError(
+            "The board {} does not start with only its target hole empty".format(
+                geometry.name
+            )
+        )
+    n_holes = holes.bit_count()
+
+    def complement(pegs):
+        return canonical(holes ^ pegs, geometry=geometry)
+
+    # Reachable positions, by number of pegs
+    reachable = {n_holes - 1: {canonical(geometry.start, geometry=geometry)}}
+    n_pegs = n_holes - 1
+    while n_holes - (n_pegs - 1) < n_pegs:
+        reachable[n_pegs - 1] = {
+            canonical(child, geometry=geometry)
+            for pegs in reachable[n_pegs]
+            for child in _children(pegs, geometry)
+        }
+        n_pegs -= 1
+        if verbatim:
+            print("{} pegs: {} positions".format(n_pegs, len(reachable[n_pegs])))
+
+    # Middle of the game: a move must lead to the complement of a reachable position
+    middle = reachable[n_holes - (n_pegs - 1)]
+    solvable = {
+        n_pegs: {
+            pegs
+            for pegs in reachable.pop(n_pegs)
+            if any(complement(child) in middle for child in _children(pegs, geometry))
+        }
+    }
+    for n in range(n_pegs + 1, n_holes):
+        below = solvable[n - 1]
+        solvable[n] = {
+            pegs
+            for pegs in reachable.pop(n)
+            if any(
+                canonical(child, geometry=geometry) in below
+                for child in _children(pegs, geometry)
+            )
+        }
+    for n in range(n_pegs - 1, 0, -1):
+        solvable[n] = {complement(pegs) for pegs in solvable[n_holes - n]}
+    if verbatim:
+        print("Solvable positions: {}".format(sum(map(len, solvable.values()))))
+    return set().union(*solvable.values())
+
+
+def build_hint_database(file=HINTS_FILE, geometry=ENGLISH, verbatim=True):
+    """
+    This function builds the hint database of a board (see solvable_positions):
+    a header followed by the sorted 64-bit keys of the solvable positions.
+    It takes about half an hour for the English board, and is run only once.
+    """
+    keys = sorted(solvable_positions(geometry, verbatim))
+    header = _HINTS_HEADER.pack(
+        _HINTS_MAGIC, _HINTS_VERSION, geometry.legal_holes, geometry.target, len(keys)
+    )
+
+    # Write to a temporary file first, so that readers never see a half-written file
+    directory = os.path.dirname(os.path.abspath(file))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".hints")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(struct.pack("<{}Q".format(len(keys)), *keys))
+        os.replace(tmp_path, file)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(keys)
+
+
+class HintDatabase:
+    """
+    This class looks up positions in a hint database (see build_hint_database).
+    The file is memory-mapped, so each lookup is a binary search over the
+    sorted keys on disk, without loading them.
+    """
+
+    def __init__(self, file=HINTS_FILE, geometry=ENGLISH):
+        self.geometry = geometry
+        with open(file, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < _HINTS_HEADER.size:
+            self.close()
+            raise ValueError("The hint database {} is truncated".format(file))
+        magic, version, holes, target, count = _HINTS_HEADER.unpack_from(self._mm)
+        if magic != _HINTS_MAGIC or version != _HINTS_VERSION:
+            self.close()
+            raise ValueError("{} is not a hint database".format(file))
+        if (holes, target) != (geometry.legal_holes, geometry.target):
+            self.close()
+            raise ValueError("The hint database {} is for another board".format(file))
+        if len(self._mm) != _HINTS_HEADER.size + count * _HINTS_KEY.size:
+            self.close()
+            raise ValueError("The hint database {} is truncated".format(file))
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, idx):
+        # The idx-th key, so that the database is a sorted sequence for bisect
+        return _HINTS_KEY.unpack_from(
+            self._mm, _HINTS_HEADER.size + idx * _HINTS_KEY.size
+        )[0]
+
+    def __contains__(self, pegs):
+        key = canonical(pegs, geometry=self.geometry)
+        idx = bisect.bisect_left(self, key)
+        return idx < self._count and self[idx] == key
+
+    def close(self):
+        self._mm.close()
+
+    def hints(self, pegs):
+        """
+        This method returns the legal moves (start, direction)
+        that still lead to a single peg in the target hole.
+        """
+        geometry = self.geometry
+        moves = []
+        for direction, starts in legal_moves(pegs, geometry).items():
+            while starts:
+                bit = starts & -starts
+                starts ^= bit
+                start = bit.bit_length() - 1
+                if jump(pegs, start, direction, geometry) in self:
+                    moves.append((start, direction))
+        return moves
+
+
+def load_hint_database(file=HINTS_FILE, geometry=ENGLISH):
+    """
+    This function opens the hint database of a board.
+    It returns None if there is none, or if it cannot be used.
+    """
+    try:
+        return HintDatabase(file, geometry)
+    except (OSError, ValueError):  # missing, empty or invalid file
+        return None
+
+
+def display_hints(pegs, hint_database):
+
+    if hint_database is None:
+        print("There is no hint database for this board.")
+        print("Build the English one with: python peg_solitaire.py --build-hints")
+        return
+    geometry = hint_database.geometry
+    target = geometry.coordinates[geometry.target]
+    moves = hint_database.hints(pegs)
+    if moves:
+        print(
+            "Moves that can still end with a single peg in {}: {}".format(
+                target,
+                " ".join(format_move(*move, geometry=geometry) for move in moves),
+            )
+        )
+    else:
+        print("No move can end with a single peg in {} anymore.".format(target))
+
+
+def format_move(start, direction, geometry=ENGLISH):
+    """
+    This function formats a move as typed by the player (e.g. "D2R").
+    """
+    return geometry.coordinates[start] + direction
+
+
+class MoveError(ValueError):
+    pass
+
+
+# Order in which the directions of each direction set are listed to the player
+DIRECTION_ORDER = {
+    "orthogonal": ("L", "R", "U", "D"),
+    "triangular": ("L", "R", "UL", "UR", "DL", "DR"),
+}
+
+
+def move_prompt(geometry=ENGLISH):
+    order = DIRECTION_ORDER[geometry.direction_set]
+    return "Enter peg position followed by move ({}, or {}): ".format(
+        ", ".join(order[:-1]), order[-1]
+    )
+
+
+MOVE_PROMPT = move_prompt()
+
+
+def parse_move(user_move, geometry=ENGLISH):
+    """
+    This function parses a move typed by the player: a hole of the board
+    followed by a direction (e.g. D2D, or C3UL on the triangular board).
+    It returns the index of the starting hole and the direction, or raises
+    a MoveError explaining what is wrong with the move.
+    """
+    user_move = user_move.strip().upper()
+    row = user_move[:1]
+    digits = ""
+    for char in user_move[1:]:
+        if not char.isdigit():
+            break
+        digits += char
+    coordinate = row + digits
+    direction = user_move[len(coordinate) :]
+
+    # Check if input is out of board, invalid, or has a wrong direction
+    if not row.isalpha() or not digits or not direction:
+        raise MoveError("Something wrong with your input!")
+    if coordinate not in geometry.coordinate_index:
+        if coordinate in geometry.coordinates:
+            raise MoveError("Given peg position is out of board!")
+        raise MoveError("Something wrong with your input!")
+    if direction not in geometry.directions:
+        raise MoveError(
+            "Direction is not {}!".format(
+                " or ".join(DIRECTION_ORDER[geometry.direction_set])
+            )
+        )
+    return geometry.coordinate_index[coordinate], direction
+
+
+def ask_move(geometry=ENGLISH, commands=()):
+    """
+    This function asks the player for a move until it can be parsed
+    to a hole of the board followed by a direction (e.g. D2D).
+    It returns the index of the starting hole and the direction, or
+    (command, None) if the player typed one of the given commands.
+    """
+    prompt = move_prompt(geometry)
+    while True:
+        user_move = input(prompt)
+        if user_move.strip().upper() in commands:
+            return user_move.strip().upper(), None
+        try:
+            return parse_move(user_move, geometry)
+        except MoveError as e:
+            print(e)
+
+
+# Recorded games repeat the same few hundred moves: parse each of them once
+_parse_move_cached = functools.lru_cache(maxsize=4096)(parse_move)
+
+
+def play_moves(moves, pegs=None, geometry=ENGLISH):
+    """
+    This function validates and plays a list of moves as typed by the
+    player (e.g. ["D2D", "C4R"]), in one pass over the bitboard.
+    It returns the final position, or raises a MoveError telling which
+    move is wrong and why.
+    """
+    if pegs is None:
+        pegs = geometry.start
+    jumps = geometry.jumps
+    for number, user_move in enumerate(moves, 1):
+        try:
+            start, direction = _parse_move_cached(user_move, geometry)
+        except MoveError as e:
+            raise MoveError("Move {} ({}): {}".format(number, user_move, e)) from None
+        over_to = jumps[direction].get(start)
+        # jump_error is only called to tell why a move is invalid
+        if over_to is not None:
+            over, to = over_to
+            if pegs >> start & 1 and pegs >> over & 1 and not pegs >> to & 1:
+                pegs ^= (1 << start) | (1 << over) | (1 << to)
+                continue
+        raise MoveError(
+            "Move {} ({}): {}".format(
+                number, user_move, jump_error(pegs, start, direction, geometry)
+            )
+        )
+    return pegs
+
+
+def replay_games(stream, geometry=ENGLISH):
+    """
+    This function replays recorded games without any prompt: each non-empty
+    line of the stream is a game, given as its moves separated by spaces
+    (e.g. "D2D C4R ..."). Only the final board and the number of remaining
+    pegs of each game are displayed.
+    It returns the number of games with an invalid move.
+    """
+    failed = 0
+    for line_number, line in enumerate(stream, 1):
+        moves = line.split()
+        if not moves:
+            continue
+        try:
+            pegs = play_moves(moves, geometry=geometry)
+        except MoveError as e:
+            print("Game on line {}: {}".format(line_number, e))
+            failed += 1
+            continue
+        display_board(pegs, geometry)
+        print("The number of remaining pegs is:", peg_counter(pegs))
+    return failed
+
+
+def select_geometry():
+    """
+    This function asks the player for the board to play on:
+    one of GEOMETRIES, or a file with a custom board (see load_geometry).
+    """
+    names = ", ".join(name.capitalize() for name in GEOMETRIES)
+    while True:
+        answer = input(
+            "Choose a board ({}) or give a board file [English]: ".format(names)
+        ).strip()
+        if not answer:
+            return ENGLISH
+        if answer.lower() in GEOMETRIES:
+            return GEOMETRIES[answer.lower()]
+        if os.path.isfile(answer):
+            try:
+                return load_geometry(answer)
+            except (OSError, ValueError) as e:
+                print("Cannot load the board: {}".format(e))
+        else:
+            print("Unknown board!")
+
+
+def main(geometry=None):
+
+    if geometry is None:
+        geometry = select_geometry()
+    pegs = create_bitboard(geometry)
+    journal = MoveJournal(pegs, geometry, MoveCounts(pegs, geometry))
+    hint_database = load_hint_database() if geometry is ENGLISH else None
+    display_board(journal.pegs, geometry)
+    print("Type UNDO to take back a move, REDO to play it again, or HINT for help.")
+
+    while remaining_moves(
+        board_coordinates=geometry.coordinates,
+        board_values=journal.pegs,
+        move_counts=journal.move_counts,
+    ):
+        # Ask until the move (or command) is valid
+        while True:
+            start, direction = ask_move(geometry, commands=("UNDO", "REDO", "HINT"))
+            if start == "HINT":
+                display_hints(journal.pegs, hint_database)
+            elif start == "UNDO":
+                if journal.undo():
+                    break
+                print("There is no move to take back!")
+            elif start == "REDO":
+                if journal.redo():
+                    break
+                print("There is no move to play again!")
+            elif check_jump(journal.pegs, start, direction, geometry=geometry):
+                journal.play(start, direction)
+                break
+
+        display_board(journal.pegs, geometry)
+
+    print(
+        "No more moves. The number of remaining pegs is:", peg_counter(journal.pegs)
+    )
+    if hint_database is not None:
+        hint_database.close()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Play peg solitaire.")
+    parser.add_argument(
+        "--board",
+        choices=list(GEOMETRIES),
+        default=None,
+        help="board to play on (asked if not given)",
+    )
+    parser.add_argument(
+        "--moves",
+        type=argparse.FileType("r"),
+        default=None,
+        help="replay the games of this file (- for stdin), one per line, and exit",
+    )
+    parser.add_argument(
+        "--build-hints",
+        action="store_true",
+        help="build the hint database of the English board and exit",
+    )
+    args = parser.parse_args()
+    geometry = GEOMETRIES[args.board] if args.board else None
+    if args.build_hints:
+        build_hint_database()
+    elif args.moves is not None:
+        with args.moves:
+            failed = replay_games(args.moves, geometry or ENGLISH)
+        sys.exit(1 if failed else 0)
+    else:
+        main(geometry)
@@ -22,6 +22,23 @@ except ImportError:
     os.system("python3 -m pip install --upgrade termcolor")
     from termcolor import colored
 
+try:
+    # The terminal renderer shared by the games (pip install -e <repository root>)
+    from terminal import screen
+except ImportError:
+
+    class _PlainScreen:
+        """
+        Plain output, used when the terminal renderer is not installed.
+        """
+
+        @staticmethod
+        def clear() -> None:
+            os.system("cls" if os.name == "nt" else "clear")
+            return None
+
+    screen = _PlainScreen()  # type: ignore
+
 
 class Messages:
     @staticmethod
@@ -89,19 +106,10 @@ def clear_monitor(delay_sec: Optional[int] = None) -> None:
     ==========
         None.
     """
-    if delay_sec is None:
-        if os.name == "nt":  # For Windows
-            os.system("cls")
-        else:  # For Linux/MacOS (name == "posix")
-            os.system("clear")
-    else:
+    if delay_sec is not None:
         Messages.warning("Clearing the monitor...")
-        if os.name == "nt":
-            sleep(delay_sec)
-            os.system("cls")
-        else:
-            sleep(delay_sec)
-            os.system("clear")
+        sleep(delay_sec)
+    screen.clear()
     return None
 
 
@@ -0,0 +1,173 @@
+"""
+terminal.py
+
+A small terminal renderer shared by the games, to redraw their boards
+without spawning a shell to clear the screen (os.system("clear")).
+
+    - the screen is cleared with ANSI escape sequences;
+    - each frame is buffered and written with a single write;
+    - only the lines that changed since the previous frame are redrawn,
+      as long as the terminal cannot have scrolled since; otherwise the
+      frame is drawn in full.
+
+The games print their prompts and messages below the frame through the
+screen (Screen.print and Screen.input), which counts the rows they take,
+so that it knows whether the terminal scrolled without asking it.
+
+When the output is not a terminal (e.g. redirected to a file), the frames
+are written as plain lines, without escape sequences.
+
+@author: Savvas Chanlaridis
+@version: v2026-10-18
+"""
+
+import builtins
+import os
+import re
+import shutil
+import sys
+from time import sleep
+from typing import *
+
+CLEAR_SCREEN: str = "\x1b[2J\x1b[H"  # clear the whole screen and go home
+CLEAR_LINE: str = "\x1b[K"  # clear from the cursor to the end of the line
+CLEAR_BELOW: str = "\x1b[J"  # clear from the cursor to the end of the screen
+# Escape sequences take no room on the screen (e.g. the colors of termcolor)
+ESCAPE_SEQUENCE: "re.Pattern[str]" = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
+
+def move_to(row: int, column: int = 1) -> str:
+    """
+    Returns the escape sequence that moves the cursor (rows and columns start at 1).
+    """
+    return "\x1b[{};{}H".format(row, column)
+
+
+def screen_rows(text: str, columns: int) -> int:
+    """
+    Returns the number of rows that the text takes on a screen
+    of the given width, once its long lines are wrapped.
+    """
+    rows = 0
+    for line in text.split("\n"):
+        width = len(ESCAPE_SEQUENCE.sub("", line).expandtabs())
+        rows += max(1, -(-width // columns))
+    return rows
+
+
+class Screen:
+    """
+    Draws frames (lists of lines) at the top of the terminal.
+    The lines of the last frame are kept, so that the next frame only
+    rewrites the lines that differ. That is only done if the terminal
+    did not scroll since the last frame, i.e. if the frame and the rows
+    printed below it (by Screen.print and Screen.input) fit the terminal;
+    otherwise the screen is cleared and the frame is drawn in full.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, ansi: Optional[bool] = None):
+        self._stream: Optional[TextIO] = stream  # sys.stdout (at write time) by default
+        self._ansi: Optional[bool] = ansi  # if the stream is a terminal by default
+        self._lines: List[str] = []  # the lines of the frame on the screen
+        self._rows: int = 0  # the rows of the frame and of the text below it
+        if os.name == "nt":
+            # Enables the escape sequences in the Windows console (once)
+            os.system("")
+
+    @property
+    def stream(self) -> TextIO:
+        return self._stream if self._stream is not None else sys.stdout
+
+    @property
+    def ansi(self) -> bool:
+        if self._ansi is not None:
+            return self._ansi
+        isatty = getattr(self.stream, "isatty", None)
+        return bool(isatty and isatty())
+
+    def _write(self, text: str) -> None:
+        stream = self.stream
+        stream.write(text)
+        stream.flush()
+        return None
+
+    def clear(self, delay_sec: Optional[float] = None) -> None:
+        """
+        Clears the screen, after delay_sec seconds if given.
+        The next frame is then drawn in full.
+        """
+        if delay_sec is not None:
+            self.print("Clearing the monitor...")
+            sleep(delay_sec)
+        self._lines = []
+        self._rows = 0
+        if self.ansi:
+            self._write(CLEAR_SCREEN)
+        return None
+
+    def print(self, *values: object, sep: str = " ", end: str = "\n") -> None:
+        """
+        Prints below the frame, like the built-in print.
+        """
+        text = sep.join(str(value) for value in values) + end
+        self._below(text)
+        self._write(text)
+        return None
+
+    def input(self, prompt: str = "") -> str:
+        """
+        Asks for a line below the frame, like the built-in input.
+        """
+        answer = builtins.input(prompt)
+        # The answer is echoed after the prompt, followed by a new line
+        self._below(prompt + answer + "\n")
+        return answer
+
+    def _below(self, text: str) -> None:
+        """
+        Counts the rows of text printed below the frame: the text starts
+        on the row of the cursor, which is the start of a row after the
+        frame and after the answers of input.
+        """
+        if text:
+            columns = shutil.get_terminal_size().columns
+            self._rows += screen_rows(text, columns) - 1
+        return None
+
+    def draw(self, lines: Iterable[str]) -> None:
+        """
+        Draws a frame at the top of the screen with a single write and
+        leaves the cursor just below it. Only its lines that changed are
+        redrawn, unless the terminal may have scrolled since the last
+        frame or the frame does not fit it (see Screen).
+        """
+        lines = [line for text in lines for line in text.split("\n")]
+        if not self.ansi:
+            self._lines = lines
+            self._write("".join(line + "\n" for line in lines))
+            return None
+
+        size = shutil.get_terminal_size()
+        # Every line of the frame must take a single row to be redrawn alone
+        rows = screen_rows("\n".join(lines), size.columns)
+        previous: List[str] = self._lines
+        # The cursor is on row self._rows + 1, which must not have left the screen
+        if self._rows >= size.lines or rows != len(lines) or rows >= size.lines:
+            previous = []
+        self._lines = lines
+        self._rows = rows
+        if not previous:
+            self._write(CLEAR_SCREEN + "".join(line + "\n" for line in lines))
+            return None
+
+        parts: List[str] = []
+        for row, line in enumerate(lines):
+            if row >= len(previous) or previous[row] != line:
+                parts.append(move_to(row + 1) + line + CLEAR_LINE)
+        parts.append(move_to(len(lines) + 1) + CLEAR_BELOW)
+        self._write("".join(parts))
+        return None
+
+
+# The screen of the standard output, used by the games
+screen: Screen = Screen()
@@ -2,17 +2,65 @@
 tic_tac_toe.py
 
 A simple Python approach to play the classic tic-tac-toe game.
-It supports one game mode:
+It supports two game modes:
+    - Single mode  : one player against the computer
     - Double mode  : two players against each other
+
+The board is kept as one 9-bit mask per player, so that a move sets a bit
+and a win is found by testing the masks of the 8 lines.
+The computer plays perfectly: every legal position (5478 of them) is
+solved once and stored in a table file, which is loaded at import, so
+that a move of the computer is a single lookup in the table.
 @author: Savvas Chanlaridis
 @version: v2023-02-27
 """
 
 import os
-from typing import List, Tuple
+import struct
+import tempfile
+from typing import Dict, List, Tuple
 from dataclasses import dataclass
 
+try:
+    # The terminal renderer shared by the games (pip install -e <repository root>)
+    from terminal import screen
+except ImportError:
+    # Plain output, used when the terminal renderer is not installed
+    class _PlainScreen:
+        print = staticmethod(print)
+        input = staticmethod(input)
+
+        @staticmethod
+        def clear() -> None:
+            os.system("cls" if os.name == "nt" else "clear")
+            return None
+
+        @staticmethod
+        def draw(lines: List[str]) -> None:
+            print("\n".join(lines))
+            return None
+
+    screen = _PlainScreen()
+
 NICKNAME_SIZE_MAX: int = 5
+COMPUTER_NICKNAME: str = "CPU"
+
+# Cells are numbered row by row (cell = 3 * row + col); a position is
+# encoded as two 9-bit masks, the cells of 'x' and the cells of 'o'
+LINES: Tuple[int, ...] = (
+    0b000000111, 0b000111000, 0b111000000, # rows
+    0b001001001, 0b010010010, 0b100100100, # columns
+    0b100010001, 0b001010100,              # diagonals
+)
+FULL: int = 0b111111111
+
+# Table of the solved positions, built once (see build_table)
+TABLE_FILE: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tic_tac_toe.table")
+TABLE_MAGIC: bytes = b"TTT1"
+TABLE_SIZE: int = 5478 # legal positions, with 'x' playing first
+# Each entry: the position (x | o << 9) << 8 | best move << 4 | score + 8
+TABLE_ENTRY = struct.Struct("<I")
+NO_MOVE: int = 15 # best move of the positions where the game is over
 
 @dataclass 
 class Player:
@@ -22,6 +70,38 @@ class Player:
     score: int = 0
     row: int = -1 
     col: int = -1
+    computer: bool = False
+
+@dataclass
+class Board:
+    # One 9-bit mask per mark: bit n is set when the mark is at cell n
+    x: int = 0
+    o: int = 0
+
+    def mask(self, mark: str) -> int:
+        return self.x if (mark == 'x') else self.o
+
+    def play(self, mark: str, cell: int) -> None:
+        if (mark == 'x'):
+            self.x |= 1 << cell
+        else:
+            self.o |= 1 << cell
+        return None
+
+    def is_free(self, cell: int) -> bool:
+        return not (self.x | self.o) >> cell & 1
+
+    def mark_at(self, cell: int) -> str:
+        if (self.x >> cell & 1):
+            return 'x'
+        elif (self.o >> cell & 1):
+            return 'o'
+        return ' '
+
+    @property
+    def key(self) -> int:
+        # The key of the position in the table
+        return self.x | self.o << 9
     
 
 def main() -> None:
@@ -30,21 +110,25 @@ def main() -> None:
     answer: str = ''
     
     # Initialize
-    print("Player 1: ")
-    player1 = Player(get_nickname(NICKNAME_SIZE_MAX, "Player 1"))
+    if (get_mode() == 1):
+        if (ask_yes_no("Do you want to play first? [y/n] ")):
+            player1 = Player(get_nickname(NICKNAME_SIZE_MAX, "Player"))
+            player2 = Player(COMPUTER_NICKNAME, computer=True)
+        else:
+            player1 = Player(COMPUTER_NICKNAME, computer=True)
+            player2 = Player(get_nickname(NICKNAME_SIZE_MAX, "Player"))
+    else:
+        screen.print("Player 1: ")
+        player1 = Player(get_nickname(NICKNAME_SIZE_MAX, "Player 1"))
+        clear()
+        screen.print("Player 2: ")
+        player2 = Player(get_nickname(NICKNAME_SIZE_MAX, "Player 2"))
     player1.mark = 'x'
-    clear()
-    print("Player 2: ")
-    player2 = Player(get_nickname(NICKNAME_SIZE_MAX, "Player 2"))
     player2.mark = 'o'
     
     while(keep_playing):
         # (Re)-initialize board
-        board: List[List[str]] = [
-            [' ', ' ', ' '],
-            [' ', ' ', ' '],
-            [' ', ' ', ' ']
-        ]
+        board: Board = Board()
         moves: int = 0 # Keep track of moves played
         player1.status = player2.status = -1 # Reset status
         
@@ -53,10 +137,9 @@ def main() -> None:
                 clear()
                 display_board(board)
             
-            player1.row, player1.col = get_move(board, player1)
-            board[player1.row][player1.col] = player1.mark
+            player1.row, player1.col = next_move(board, player1)
+            board.play(player1.mark, 3 * player1.row + player1.col)
             moves += 1
-            clear()
             display_board(board)
                 
             if (moves >= 5): # needs minimum of 5 moves before someone can win
@@ -68,10 +151,9 @@ def main() -> None:
                     break
             
             if (moves == MAX_MOVES): break # last move belongs to player 1
-            player2.row, player2.col = get_move(board, player2)
-            board[player2.row][player2.col] = player2.mark
+            player2.row, player2.col = next_move(board, player2)
+            board.play(player2.mark, 3 * player2.row + player2.col)
             moves += 1
-            clear()
             display_board(board)
             
             if (moves >= 5): # needs minimum of 5 moves before someone can win
@@ -83,89 +165,94 @@ def main() -> None:
                     break
         
         if (player1.status == player2.status):
-            print("It's a draw!")
+            screen.print("It's a draw!")
         elif (player1.status > player2.status):
-            print("%s WINS!" % player1.nickname)
+            screen.print("%s WINS!" % player1.nickname)
         else:
-            print("%s WINS!" % player2.nickname)
+            screen.print("%s WINS!" % player2.nickname)
             
-        while True:
-            answer = input("Do you want to play again? [y/n] ")
-            if (answer.lower() == 'n'):
-                keep_playing = False
-                print("Final score:\n---------")
-                print("%s: %i pts" % (player1.nickname, player1.score))
-                print("%s: %i pts" % (player2.nickname, player2.score))
-                break
-            elif (answer.lower() == 'y'):
-                clear()
-                break
-            else:
-                print("ERROR: invalid answer!")
+        if (ask_yes_no("Do you want to play again? [y/n] ")):
+            clear()
+        else:
+            keep_playing = False
+            screen.print("Final score:\n---------")
+            screen.print("%s: %i pts" % (player1.nickname, player1.score))
+            screen.print("%s: %i pts" % (player2.nickname, player2.score))
             
     return None
+
+def get_mode() -> int:
+    while (True):
+        answer: str = screen.input("Number of players [1/2]: ")
+        if (answer in ('1', '2')):
+            clear()
+            return int(answer)
+        screen.print("ERROR: invalid answer!")
+
+def ask_yes_no(question: str) -> bool:
+    while (True):
+        answer: str = screen.input(question)
+        if (answer.lower() == 'n'):
+            return False
+        elif (answer.lower() == 'y'):
+            return True
+        else:
+            screen.print("ERROR: invalid answer!")
+
+def next_move(board: Board, player: Player) -> Tuple[int, int]:
+    if (player.computer):
+        return divmod(computer_move(board), 3)
+    return get_move(board, player)
     
-def get_move(board: List[List[str]], player: Player) -> Tuple[int, int]:
+def get_move(board: Board, player: Player) -> Tuple[int, int]:
     while (True):
-        s: str = input("%s, it's your turn! Please give coordinates (e.g. 12): " % player.nickname)
+        s: str = screen.input("%s, it's your turn! Please give coordinates (e.g. 12): " % player.nickname)
         
         if (len(s) > 2):
-            print("ERROR: too many arguments")
+            screen.print("ERROR: too many arguments")
             continue
         elif (len(s) < 2):
-            print("ERROR: too few arguments")
+            screen.print("ERROR: too few arguments")
             continue
 
         if not s.isdigit():
-            print("ERROR: coordinates must be two number in [0,2]!")
+            screen.print("ERROR: coordinates must be two number in [0,2]!")
             continue
         
         if (int(s[0]) < 0 or int(s[0]) > 2):
-            print("ERROR: %i is out of bounds!" % int(s[0]))
+            screen.print("ERROR: %i is out of bounds!" % int(s[0]))
             continue
         
         if (int(s[1]) < 0 or int(s[1]) > 2):
-            print("ERROR: %i is out of bounds!" % int(s[1]))
+            screen.print("ERROR: %i is out of bounds!" % int(s[1]))
             continue
             
-        if not board[int(s[0])][int(s[1])].isspace():
-            print("ERROR: position is already occupied!")
+        if not board.is_free(3 * int(s[0]) + int(s[1])):
+            screen.print("ERROR: position is already occupied!")
             continue
             
         return int(s[0]), int(s[1])
 
-def is_winner(board: List[List[str]], player: Player) -> bool:
-    # Check rows for winner
-    for i in range(3):
-        if (board[i][0] == board[i][1] == board[i][2] == player.mark):
-            return True
-            
-    # Check rows for winner
-    for j in range(3):
-        if (board[0][j] == board[1][j] == board[2][j] == player.mark):
-            return True
-    
-    # Check diagonals for winners
-    if (board[0][0] == board[1][1] == board[2][2] == player.mark):
-        return True
-    elif (board[2][0] == board[1][1] == board[0][2] == player.mark):
-        return True
-    
-    return False
+def is_winner(board: Board, player: Player) -> bool:
+    return bool(WINNING[board.mask(player.mark)])
 
-def display_board(board: List[List[str]]) -> None:
-    print("\t0\t1\t2\t\n")
-    print("0\t%s   |\t%s   |\t%s\t" % (board[0][0], board[0][1], board[0][2]))
-    print(" "*5 + "-"*23)
-    print("1\t%s   |\t%s   |\t%s\t" % (board[1][0], board[1][1], board[1][2]))
-    print(" "*5 + "-"*23)
-    print("2\t%s   |\t%s   |\t%s\t" % (board[2][0], board[2][1], board[2][2]))
+def display_board(board: Board) -> None:
+    marks: List[str] = [board.mark_at(cell) for cell in range(9)]
+    # Drawn at the top of the screen: only the lines that changed are redrawn
+    screen.draw([
+        "\t0\t1\t2\t\n",
+        "0\t%s   |\t%s   |\t%s\t" % tuple(marks[0:3]),
+        " "*5 + "-"*23,
+        "1\t%s   |\t%s   |\t%s\t" % tuple(marks[3:6]),
+        " "*5 + "-"*23,
+        "2\t%s   |\t%s   |\t%s\t" % tuple(marks[6:9]),
+    ])
     return None
     
 def get_nickname(size: int, default: str) -> str:
     while (True):
         try:
-            nickname = input("Enter a nickname up to %i characters long: " % size)
+            nickname = screen.input("Enter a nickname up to %i characters long: " % size)
             if (len(nickname) > size):
                 raise ValueError
             elif (len(nickname) == 0 or nickname.isspace()):
@@ -173,15 +260,98 @@ def get_nickname(size: int, default: str) -> str:
             else:
                 return nickname
         except ValueError:
-            print("Nickname cannot be longer than %i characters" % size)
+            screen.print("Nickname cannot be longer than %i characters" % size)
             
 def clear() -> None:
-    if os.name == "nt":  # For Windows
-        os.system("cls")
-    else:  # For Linux/MacOS (name == "posix")
-        os.system("clear")
+    screen.clear()
+    return None
+
+def has_line(mask: int) -> bool:
+    # The 8 winning lines, tested against the mask of a player
+    for line in LINES:
+        if (mask & line == line):
+            return True
+    return False
+
+# The 8 line tests of every mask, done once: WINNING[mask] is 1 if it has a line
+WINNING: bytes = bytes(has_line(mask) for mask in range(FULL + 1))
+
+def solve_positions() -> Dict[int, int]:
+    # Negamax over every legal position: the score is for the player to move,
+    # positive for a win (higher when it is quicker), 0 for a draw, negative for a loss
+    table: Dict[int, int] = {}
+
+    def solve(x: int, o: int) -> int:
+        key: int = x | o << 9
+        if (key in table):
+            return (table[key] & 0xF) - 8
+        x_to_move: bool = bin(x).count('1') == bin(o).count('1')
+        mover, opponent = (x, o) if x_to_move else (o, x)
+        empty: int = FULL & ~(x | o)
+        best_move: int = NO_MOVE
+        if (WINNING[opponent]):
+            best_score = -(1 + bin(empty).count('1')) # the opponent just won
+        elif (empty == 0):
+            best_score = 0
+        else:
+            best_score = -10
+            for cell in range(9):
+                if (empty >> cell & 1):
+                    bit: int = 1 << cell
+                    score: int = -(solve(x | bit, o) if x_to_move else solve(x, o | bit))
+                    if (score > best_score):
+                        best_score, best_move = score, cell
+        table[key] = best_move << 4 | best_score + 8
+        return best_score
+
+    solve(0, 0)
+    return table
+
+def build_table(file: str = TABLE_FILE) -> Dict[int, int]:
+    table: Dict[int, int] = solve_positions()
+    try:
+        save_table(table, file)
+    except OSError:
+        pass # e.g. read-only install: the table is only kept in memory
+    return table
+
+def save_table(table: Dict[int, int], file: str = TABLE_FILE) -> None:
+    data: bytes = TABLE_MAGIC + b"".join(
+        TABLE_ENTRY.pack(key << 8 | table[key]) for key in sorted(table)
+    )
+    # Write to a temporary file first, so that readers never see a half-written file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(file)), suffix=".table")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, file)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
     return None
 
+def load_table(file: str = TABLE_FILE) -> Dict[int, int]:
+    # The table is built the first time (it takes a fraction of a second)
+    try:
+        with open(file, "rb") as f:
+            data: bytes = f.read()
+    except OSError: # missing or unreadable: it is built again
+        data = b""
+    if (data[:len(TABLE_MAGIC)] != TABLE_MAGIC
+            or len(data) != len(TABLE_MAGIC) + TABLE_SIZE * TABLE_ENTRY.size):
+        return build_table(file)
+    return {
+        entry >> 8: entry & 0xFF
+        for (entry,) in TABLE_ENTRY.iter_unpack(data[len(TABLE_MAGIC):])
+    }
+
+# Position key -> best move << 4 | score + 8
+TABLE: Dict[int, int] = load_table()
+
+def computer_move(board: Board) -> int:
+    # The best move (cell) of the player to move
+    return TABLE[board.key] >> 4
+
 
 if (__name__ == "__main__"):
     main()
\ No newline at end of file